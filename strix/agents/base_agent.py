@@ -15,6 +15,7 @@ from jinja2 import (
 )
 
 from strix.llm import LLM, LLMConfig, LLMRequestFailedError
+from strix.llm.request_queue import DEFAULT_PRIORITY, INTERACTIVE_PRIORITY
 from strix.llm.utils import clean_content
 from strix.tools import process_tool_invocations
 
@@ -430,7 +431,11 @@ class BaseAgent(metaclass=AgentMeta):
         self.state.add_message("user", task)
 
     async def _process_iteration(self, tracer: Optional["Tracer"]) -> bool:
-        response = await self.llm.generate(self.state.get_conversation_history())
+        # The root agent is the one the user is waiting on, so it goes ahead of sub-agents
+        priority = INTERACTIVE_PRIORITY if self.state.parent_id is None else DEFAULT_PRIORITY
+        response = await self.llm.generate(
+            self.state.get_conversation_history(), priority=priority
+        )
 
         content_stripped = (response.content or "").strip()
 
@@ -6,8 +6,8 @@ to automatically stream updates to the web dashboard in real-time.
 
 import logging
 import os
+import queue
 import threading
-import time
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -31,6 +31,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+SYNC_INTERVAL_SECONDS = 1.0
+
 
 class WebDashboardIntegration:
     """Integrates the web dashboard with Strix components.
@@ -60,6 +62,9 @@ class WebDashboardIntegration:
         self._session_start: datetime | None = None
         self._duration_minutes: float = 60.0
         self._warning_minutes: float = 5.0
+        # Tracer callbacks run on agent threads; they hand entries to the sync thread
+        self._pending_feed: queue.SimpleQueue[dict[str, Any]] = queue.SimpleQueue()
+        self._wake = threading.Event()
     
     def start(self) -> str:
         """Start the web dashboard integration.
@@ -102,9 +107,11 @@ class WebDashboardIntegration:
     def stop(self) -> None:
         """Stop the web dashboard integration."""
         self._running = False
+        self._wake.set()
         
         if self._sync_thread:
             self._sync_thread.join(timeout=2.0)
+        self._drain_pending_feed()
         
         stop_web_dashboard()
         logger.info("Web dashboard integration stopped")
@@ -142,14 +149,25 @@ class WebDashboardIntegration:
     def _sync_loop(self) -> None:
         """Background loop to sync state periodically."""
         while self._running:
+            self._wake.clear()
             try:
+                self._drain_pending_feed()
                 self._sync_from_tracer()
                 self._sync_time()
                 self._sync_collaboration()
             except Exception as e:
                 logger.debug(f"Sync error: {e}")
             
-            time.sleep(1.0)
+            self._wake.wait(SYNC_INTERVAL_SECONDS)
+    
+    def _drain_pending_feed(self) -> None:
+        """Publish live feed entries queued by tracer callbacks."""
+        while True:
+            try:
+                entry = self._pending_feed.get_nowait()
+            except queue.Empty:
+                return
+            add_live_feed_entry(entry)
     
     def _sync_from_tracer(self) -> None:
         """Sync state from the tracer and update history."""
@@ -310,8 +328,8 @@ class WebDashboardIntegration:
                     claims=all_claims,
                     findings=findings_list,
                     work_queue=_work_queue,
-                    help_requests=_help_requests,
-                    messages=_messages[-50:],  # Last 50 messages
+                    help_requests=list(_help_requests),
+                    messages=list(_messages)[-50:],  # Last 50 messages
                     stats=_collaboration_stats,
                 )
         
@@ -327,13 +345,18 @@ class WebDashboardIntegration:
         content: str,
         severity: str,
     ) -> None:
-        """Callback when a vulnerability is found."""
-        add_live_feed_entry({
+        """Callback when a vulnerability is found.
+        
+        Runs on whichever thread reported the finding, so the entry is queued
+        and the sync thread is woken to publish it.
+        """
+        self._pending_feed.put({
             "type": "vulnerability",
             "vuln_id": vuln_id,
             "title": title,
             "severity": severity,
         })
+        self._wake.set()
 
 
 # Global integration instance
@@ -9,6 +9,8 @@ The dashboard is INFORMATION ONLY - it does NOT control the agent in any way.
 
 import asyncio
 import csv
+import functools
+import gzip
 import io
 import json
 import logging
@@ -16,26 +18,40 @@ import mimetypes
 import os
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from types import ModuleType
 from typing import Any, Callable
 from urllib.parse import parse_qs, urlparse
 
-from .dashboard import Dashboard, AgentStatus, ResourceUsage, VulnerabilityEntry
+from .dashboard import AgentStatus, Dashboard, ResourceUsage, VulnerabilityEntry
 from .history import get_historical_tracker
 from .time_tracker import TimeTracker
 
+
+_orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    _orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+# Entries kept in the bounded state logs
+MAX_TOOL_EXECUTIONS = 200
+MAX_CHAT_MESSAGES = 200
+MAX_LIVE_FEED_ENTRIES = 500
+
 # Global state for sharing between threads
 _web_dashboard_state: dict[str, Any] = {
     "scan_config": {},
     "agents": {},
-    "tool_executions": [],
-    "chat_messages": [],
+    "tool_executions": deque(maxlen=MAX_TOOL_EXECUTIONS),
+    "chat_messages": deque(maxlen=MAX_CHAT_MESSAGES),
     "vulnerabilities": [],
     "collaboration": {
         "claims": [],
@@ -79,45 +95,221 @@ _web_dashboard_state: dict[str, Any] = {
         "status": "idle",
         "details": {},
     },
-    "live_feed": [],  # CLI-like activity feed
+    "live_feed": deque(maxlen=MAX_LIVE_FEED_ENTRIES),  # CLI-like activity feed
     "last_updated": None,
 }
 
 _sse_clients: list[Any] = []
-_update_lock = threading.Lock()
+_update_lock = threading.RLock()  # Re-entered by add_tool_execution and add_chat_message
+# Notified on every state change; SSE streams wait on it instead of polling
+_state_changed = threading.Condition(_update_lock)
+# Versions restart with the process, so ETags carry a per-process prefix
+_ETAG_PREFIX = os.urandom(4).hex()
+
+# SSE frame envelopes, prebuilt so frames are assembled with one join
+_SSE_STATE_PREFIX = b"event: state\ndata: "
+_SSE_UPDATE_PREFIX = b"event: update\ndata: "
+_SSE_FRAME_END = b"\n\n"
+
+# JSON responses at least this large are gzip-compressed when the client accepts it
+GZIP_MIN_BYTES = 1024
+# Favors speed; state JSON compresses well even at low levels
+GZIP_LEVEL = 5
+# Static assets are compressed once per file version, so use the best ratio
+STATIC_GZIP_LEVEL = 9
+_STATIC_GZIP_TYPES = frozenset({
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+})
+# path -> (mtime_ns, gzip body) of served static assets
+_static_gzip_cache: dict[Path, tuple[int, bytes]] = {}
+_static_gzip_lock = threading.Lock()
+# MIME types of frontend build files the platform's mimetypes database may not know
+_FRONTEND_MIME_TYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".html": "text/html",
+}
+
+# Changes arriving within this many seconds of a sent update go out together
+SSE_COALESCE_SECONDS = 0.25
+# Seconds without changes before an SSE keepalive comment is sent
+SSE_KEEPALIVE_SECONDS = 15.0
+# Seconds a single SSE write may block before the client is dropped as too slow
+SSE_WRITE_TIMEOUT_SECONDS = 10.0
+
+
+class _StateEncodings:
+    """The dashboard state version and the encodings built from it.
+
+    ``version`` counts state changes and is only written under _update_lock.
+    Encodings are cached by name for the latest version they were built for;
+    ``lock`` is taken before _update_lock, so one thread builds an encoding
+    while the other readers of that version wait for it.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.lock = threading.Lock()
+        self._cache: dict[str, tuple[int, bytes]] = {}
+
+    def changed_since(self, version: int) -> bool:
+        """Whether the state changed after ``version``. Caller must hold _update_lock."""
+        return self.version != version
+
+    def cached(self, name: str, version: int) -> bytes | None:
+        """Get the ``name`` encoding of ``version`` if built. Caller must hold ``lock``."""
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def store(self, name: str, version: int, value: bytes) -> bytes:
+        """Cache the ``name`` encoding of ``version``. Caller must hold ``lock``."""
+        self._cache[name] = (version, value)
+        return value
+
+
+_encodings = _StateEncodings()
+
+
+@functools.lru_cache(maxsize=1)
+def _format_ms(now_ms: int) -> str:
+    return datetime.fromtimestamp(now_ms / 1000, UTC).isoformat()
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO format, formatted at most once per millisecond.
+
+    A single state change stamps both the entry and last_updated, so the
+    second call reuses the first call's string.
+    """
+    return _format_ms(time.time_ns() // 1_000_000)
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode an API payload as JSON bytes, stringifying unknown types."""
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        body: bytes = _orjson.dumps(obj, default=str, option=option)
+        return body
+    return json.dumps(obj, default=str, indent=2 if indent else None).encode()
 
 
 def get_dashboard_state() -> dict[str, Any]:
-    """Get the current dashboard state (thread-safe)."""
+    """Get the current dashboard state (thread-safe).
+
+    The bounded logs are returned as lists.
+    """
     with _update_lock:
-        return _web_dashboard_state.copy()
+        return {
+            key: list(value) if isinstance(value, deque) else value
+            for key, value in _web_dashboard_state.items()
+        }
+
+
+def _mark_updated() -> None:
+    """Record a state change and wake SSE streams. Caller must hold _update_lock."""
+    _web_dashboard_state["last_updated"] = _now_iso()
+    _encodings.version += 1
+    _state_changed.notify_all()
+
+
+def _own_copy(value: Any) -> Any:
+    """Shallow-copy a caller's list or dict so later changes to it do not leak into the state."""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def get_encoded_dashboard_state() -> tuple[int, bytes]:
+    """Get the state version and its JSON encoding, encoding each version once.
+
+    All SSE streams and /api/state requests for the same version share the
+    encoded bytes.
+    """
+    with _encodings.lock:
+        with _update_lock:
+            version = _encodings.version
+            body = _encodings.cached("state", version)
+            if body is not None:
+                return version, body
+            state = get_dashboard_state()
+        # Snapshots are never mutated, so they can be encoded outside the state lock
+        return version, _encodings.store("state", version, _dumps(state))
+
+
+def _get_sse_update_frame() -> tuple[int, bytes]:
+    """Get the state version and its SSE update frame, built once per version."""
+    version, body = get_encoded_dashboard_state()
+    with _encodings.lock:
+        frame = _encodings.cached("sse_update", version)
+        if frame is None:
+            frame = b"".join((_SSE_UPDATE_PREFIX, body, _SSE_FRAME_END))
+            _encodings.store("sse_update", version, frame)
+    return version, frame
+
+
+def _get_gzipped_state(version: int, body: bytes) -> bytes:
+    """Get the gzip encoding of an encoded state version, compressing it once."""
+    with _encodings.lock:
+        compressed = _encodings.cached("state.gz", version)
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            _encodings.store("state.gz", version, compressed)
+    return compressed
+
+
+def _get_encoded_live_feed() -> tuple[int, bytes]:
+    """Get the state version and the JSON of its last 100 feed entries."""
+    with _encodings.lock:
+        with _update_lock:
+            version = _encodings.version
+            body = _encodings.cached("live_feed", version)
+            if body is not None:
+                return version, body
+            feed = list(_web_dashboard_state["live_feed"])[-100:]
+        return version, _encodings.store("live_feed", version, _dumps(feed))
 
 
 def update_dashboard_state(updates: dict[str, Any]) -> None:
-    """Update dashboard state and notify SSE clients (thread-safe)."""
+    """Update dashboard state and notify SSE clients (thread-safe).
+
+    Nested dicts are replaced rather than updated in place, so a snapshot
+    from get_dashboard_state can be serialized without holding the lock.
+    """
     global _web_dashboard_state
     
     with _update_lock:
         for key, value in updates.items():
             if key in _web_dashboard_state:
-                if isinstance(_web_dashboard_state[key], dict) and isinstance(value, dict):
-                    _web_dashboard_state[key].update(value)
+                current = _web_dashboard_state[key]
+                if isinstance(current, dict) and isinstance(value, dict):
+                    _web_dashboard_state[key] = {**current, **value}
+                elif isinstance(current, deque):
+                    _web_dashboard_state[key] = deque(value, maxlen=current.maxlen)
                 else:
-                    _web_dashboard_state[key] = value
+                    _web_dashboard_state[key] = _own_copy(value)
         
-        _web_dashboard_state["last_updated"] = datetime.now(UTC).isoformat()
+        _mark_updated()
 
 
 def add_live_feed_entry(entry: dict[str, Any]) -> None:
     """Add an entry to the CLI-like live feed."""
     with _update_lock:
         # Add timestamp
-        entry["timestamp"] = datetime.now(UTC).isoformat()
+        entry["timestamp"] = _now_iso()
         
-        # Add to feed (keep last 500 entries)
+        # Add to feed (the deque drops the oldest entries)
         _web_dashboard_state["live_feed"].append(entry)
-        if len(_web_dashboard_state["live_feed"]) > 500:
-            _web_dashboard_state["live_feed"] = _web_dashboard_state["live_feed"][-500:]
+        _mark_updated()
 
 
 def add_thinking_entry(
@@ -185,10 +377,6 @@ def add_tool_execution(tool_data: dict[str, Any]) -> None:
     with _update_lock:
         _web_dashboard_state["tool_executions"].append(tool_data)
         
-        # Keep last 200 tool executions
-        if len(_web_dashboard_state["tool_executions"]) > 200:
-            _web_dashboard_state["tool_executions"] = _web_dashboard_state["tool_executions"][-200:]
-        
         # Also add to live feed with enhanced information
         status = tool_data.get("status", "running")
         duration = tool_data.get("duration_seconds")
@@ -224,10 +412,6 @@ def add_chat_message(message: dict[str, Any]) -> None:
     with _update_lock:
         _web_dashboard_state["chat_messages"].append(message)
         
-        # Keep last 200 messages
-        if len(_web_dashboard_state["chat_messages"]) > 200:
-            _web_dashboard_state["chat_messages"] = _web_dashboard_state["chat_messages"][-200:]
-        
         # Also add to live feed
         content_preview = message.get("content", "")[:100]
         if len(message.get("content", "")) > 100:
@@ -256,9 +440,68 @@ def _summarize_args(args: dict[str, Any]) -> str:
     return ""
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (a zero q-value refuses it)."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        key, _, value = params.partition("=")
+        if key.strip().lower() != "q":
+            return True
+        try:
+            return float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def _get_static_gzip(file_path: Path, body: bytes) -> bytes:
+    """Get the gzip encoding of a static asset, compressing each file version once.
+
+    A ``.gz`` sibling written by the frontend build is used when it is at
+    least as new as the asset.
+    """
+    mtime = file_path.stat().st_mtime_ns
+    with _static_gzip_lock:
+        cached = _static_gzip_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        sibling = file_path.with_name(file_path.name + ".gz")
+        try:
+            compressed = sibling.read_bytes() if sibling.stat().st_mtime_ns >= mtime else None
+        except OSError:
+            compressed = None
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL)
+        _static_gzip_cache[file_path] = (mtime, compressed)
+        return compressed
+
+
+def _guess_mime_type(file_path: Path) -> str:
+    """MIME type of a static file, with defaults for the frontend build's file types."""
+    mime_type, _ = mimetypes.guess_type(str(file_path))
+    if mime_type is not None:
+        return mime_type
+    return _FRONTEND_MIME_TYPES.get(file_path.suffix, "application/octet-stream")
+
+
+@functools.cache
+def _get_fallback_html() -> tuple[bytes, bytes]:
+    """The built-in dashboard page and its gzip encoding, built on first use."""
+    from .dashboard_html import get_dashboard_html
+
+    body = get_dashboard_html().encode()
+    return body, gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL)
+
+
 class DashboardHTTPHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the dashboard web server."""
     
+    # Keep-alive, so polling clients do not reconnect for every request
+    protocol_version = "HTTP/1.1"
+
     def log_message(self, format: str, *args: Any) -> None:
         """Override to use Python logging."""
         logger.debug(f"HTTP: {format % args}")
@@ -288,66 +531,132 @@ class DashboardHTTPHandler(BaseHTTPRequestHandler):
         else:
             self._send_404()
     
-    def _send_response_headers(self, content_type: str, status: int = 200) -> None:
-        """Send standard HTTP response headers."""
+    def _send_body(
+        self,
+        content_type: str,
+        body: bytes,
+        status: int = 200,
+        gzipped_body: bytes | None = None,
+        etag: str | None = None,
+    ) -> None:
+        """Send a complete response; the Content-Length lets the client reuse the connection.
+
+        Large JSON bodies are gzip-compressed for clients that accept it.
+        ``gzipped_body`` is an already compressed body to send instead.
+        """
+        if gzipped_body is not None:
+            body = gzipped_body
+        elif (
+            content_type == "application/json"
+            and len(body) >= GZIP_MIN_BYTES
+            and _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        ):
+            gzipped_body = body = gzip.compress(body, compresslevel=GZIP_LEVEL)
         self.send_response(status)
         self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped_body is not None:
+            self.send_header("Content-Encoding", "gzip")
+        if content_type in _STATIC_GZIP_TYPES:
+            self.send_header("Vary", "Accept-Encoding")
+        if etag is not None:
+            self.send_header("ETag", etag)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Cache-Control", "no-cache")
         self.end_headers()
+        self.wfile.write(body)
     
     def _serve_health(self) -> None:
         """Serve health check endpoint."""
-        self._send_response_headers("application/json")
-        self.wfile.write(json.dumps({"status": "healthy", "timestamp": datetime.now(UTC).isoformat()}).encode())
+        self._send_body("application/json", _dumps({"status": "healthy", "timestamp": _now_iso()}))
     
+    def _send_versioned_json(
+        self,
+        version: int,
+        body: bytes,
+        gzip_body: Callable[[], bytes] | None = None,
+    ) -> None:
+        """Send JSON derived from a state version, or 304 if the client has it.
+
+        ``gzip_body`` returns a cached gzip encoding of ``body``.
+        """
+        etag = f'"{_ETAG_PREFIX}-{version}"'
+        if_none_match = self.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        gzipped_body = None
+        if (
+            gzip_body is not None
+            and len(body) >= GZIP_MIN_BYTES
+            and _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        ):
+            gzipped_body = gzip_body()
+        self._send_body("application/json", body, gzipped_body=gzipped_body, etag=etag)
+
     def _serve_state_json(self) -> None:
         """Serve the current dashboard state as JSON."""
-        self._send_response_headers("application/json")
-        state = get_dashboard_state()
-        self.wfile.write(json.dumps(state, default=str).encode())
+        version, body = get_encoded_dashboard_state()
+        self._send_versioned_json(version, body, lambda: _get_gzipped_state(version, body))
     
     def _serve_live_feed(self) -> None:
         """Serve the live feed entries."""
-        self._send_response_headers("application/json")
-        with _update_lock:
-            feed = _web_dashboard_state.get("live_feed", [])[-100:]
-        self.wfile.write(json.dumps(feed, default=str).encode())
+        version, body = _get_encoded_live_feed()
+        self._send_versioned_json(version, body)
     
     def _serve_sse_stream(self) -> None:
-        """Serve Server-Sent Events stream for real-time updates."""
+        """Serve Server-Sent Events stream for real-time updates.
+
+        The stream sleeps until the state changes. Changes made while an
+        update is being sent, or within SSE_COALESCE_SECONDS after it, are
+        sent together as the next update.
+        """
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
         self.send_header("Cache-Control", "no-cache")
-        self.send_header("Connection", "keep-alive")
+        self.send_header("Connection", "close")
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        
-        # Send initial state
-        state = get_dashboard_state()
-        self.wfile.write(f"event: state\ndata: {json.dumps(state, default=str)}\n\n".encode())
-        self.wfile.flush()
-        
-        last_update = state.get("last_updated")
+        # The stream has no length and ends when the connection closes
+        self.close_connection = True
+        # A client that stops reading fills its socket buffer; give up on it
+        # instead of blocking this thread forever. Streams only ever send the
+        # latest state, so a slow client skips versions rather than queueing them.
+        self.connection.settimeout(SSE_WRITE_TIMEOUT_SECONDS)
         
         try:
+            # Send initial state
+            version, body = get_encoded_dashboard_state()
+            self.wfile.write(b"".join((_SSE_STATE_PREFIX, body, _SSE_FRAME_END)))
+            self.wfile.flush()
+
             while True:
-                time.sleep(1)  # Poll every second
-                
-                current_state = get_dashboard_state()
-                current_update = current_state.get("last_updated")
+                with _state_changed:
+                    changed = _state_changed.wait_for(
+                        functools.partial(_encodings.changed_since, version),
+                        timeout=SSE_KEEPALIVE_SECONDS,
+                    )
                 
-                if current_update != last_update:
-                    self.wfile.write(f"event: update\ndata: {json.dumps(current_state, default=str)}\n\n".encode())
+                if changed:
+                    version, frame = _get_sse_update_frame()
+                    self.wfile.write(frame)
                     self.wfile.flush()
-                    last_update = current_update
+                    time.sleep(SSE_COALESCE_SECONDS)
                 else:
                     # Send keepalive
-                    self.wfile.write(f": keepalive {datetime.now(UTC).isoformat()}\n\n".encode())
+                    self.wfile.write(f": keepalive {_now_iso()}\n\n".encode())
                     self.wfile.flush()
                     
         except (BrokenPipeError, ConnectionResetError):
             logger.debug("SSE client disconnected")
+        except TimeoutError:
+            logger.debug("Dropped SSE client that stopped reading")
     
     def _serve_static_file(self, path: str) -> None:
         """Serve static files from Next.js build output."""
@@ -377,37 +686,32 @@ class DashboardHTTPHandler(BaseHTTPRequestHandler):
                 self._serve_dashboard_html_fallback()
                 return
         
-        # Determine MIME type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type is None:
-            if file_path.suffix == ".js":
-                mime_type = "application/javascript"
-            elif file_path.suffix == ".css":
-                mime_type = "text/css"
-            elif file_path.suffix == ".json":
-                mime_type = "application/json"
-            elif file_path.suffix == ".html":
-                mime_type = "text/html"
-            else:
-                mime_type = "application/octet-stream"
+        mime_type = _guess_mime_type(file_path)
         
-        self._send_response_headers(mime_type)
         try:
-            with file_path.open("rb") as f:
-                self.wfile.write(f.read())
+            body = file_path.read_bytes()
+            gzipped_body = None
+            if (
+                mime_type in _STATIC_GZIP_TYPES
+                and len(body) >= GZIP_MIN_BYTES
+                and _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+            ):
+                gzipped_body = _get_static_gzip(file_path, body)
         except Exception as e:
             logger.error(f"Error serving static file {path}: {e}")
             self._send_404()
+            return
+        self._send_body(mime_type, body, gzipped_body=gzipped_body)
     
     def _serve_dashboard_html_fallback(self) -> None:
         """Fallback to old dashboard HTML if Next.js build doesn't exist."""
         try:
-            from .dashboard_html import get_dashboard_html
-            self._send_response_headers("text/html")
-            html = get_dashboard_html()
-            self.wfile.write(html.encode())
+            body, gzipped = _get_fallback_html()
         except ImportError:
             self._send_404()
+            return
+        accepts_gzip = _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        self._send_body("text/html", body, gzipped_body=gzipped if accepts_gzip else None)
     
     def _serve_history(self, query_params: dict[str, list[str]]) -> None:
         """Serve historical data endpoint."""
@@ -418,12 +722,10 @@ class DashboardHTTPHandler(BaseHTTPRequestHandler):
             tracker = get_historical_tracker()
             data = tracker.get_metrics(metric_name=metric, window_seconds=window)
             
-            self._send_response_headers("application/json")
-            self.wfile.write(json.dumps(data, default=str).encode())
+            self._send_body("application/json", _dumps(data))
         except Exception as e:
             logger.error(f"Error serving history: {e}")
-            self._send_response_headers("application/json", 500)
-            self.wfile.write(json.dumps({"error": str(e)}).encode())
+            self._send_body("application/json", _dumps({"error": str(e)}), 500)
     
     def _serve_export(self, query_params: dict[str, list[str]]) -> None:
         """Serve export endpoint for JSON/CSV export."""
@@ -432,11 +734,9 @@ class DashboardHTTPHandler(BaseHTTPRequestHandler):
             state = get_dashboard_state()
             
             if export_format == "json":
-                self._send_response_headers("application/json")
-                self.wfile.write(json.dumps(state, default=str, indent=2).encode())
+                self._send_body("application/json", _dumps(state, indent=True))
             elif export_format == "csv":
                 # Export vulnerabilities as CSV
-                self._send_response_headers("text/csv")
                 output = io.StringIO()
                 writer = csv.DictWriter(
                     output,
@@ -451,19 +751,21 @@ class DashboardHTTPHandler(BaseHTTPRequestHandler):
                         "timestamp": vuln.get("timestamp", ""),
                         "target": vuln.get("target", ""),
                     })
-                self.wfile.write(output.getvalue().encode())
+                self._send_body("text/csv", output.getvalue().encode())
             else:
-                self._send_response_headers("application/json", 400)
-                self.wfile.write(json.dumps({"error": "Invalid format"}).encode())
+                self._send_body("application/json", _dumps({"error": "Invalid format"}), 400)
         except Exception as e:
             logger.error(f"Error serving export: {e}")
-            self._send_response_headers("application/json", 500)
-            self.wfile.write(json.dumps({"error": str(e)}).encode())
+            self._send_body("application/json", _dumps({"error": str(e)}), 500)
     
     def _send_404(self) -> None:
         """Send a 404 response."""
-        self._send_response_headers("text/plain", 404)
-        self.wfile.write(b"Not Found")
+        self._send_body("text/plain", b"Not Found", 404)
+
+
+class _DashboardHTTPServer(ThreadingHTTPServer):
+    # Listen backlog; the socketserver default of 5 refuses bursts of browser connections
+    request_queue_size = 128
 
 
 class WebDashboardServer:
@@ -486,7 +788,7 @@ class WebDashboardServer:
         self.host = host
         self.port = port
         self.dashboard = dashboard
-        self.server: HTTPServer | None = None
+        self.server: _DashboardHTTPServer | None = None
         self.server_thread: threading.Thread | None = None
         self._running = False
         self._public_url: str | None = None
@@ -500,7 +802,8 @@ class WebDashboardServer:
         if self._running:
             return self.get_url()
         
-        self.server = HTTPServer((self.host, self.port), DashboardHTTPHandler)
+        # One thread per connection: open SSE streams must not block other clients
+        self.server = _DashboardHTTPServer((self.host, self.port), DashboardHTTPHandler)
         self._running = True
         
         self.server_thread = threading.Thread(target=self._run_server, daemon=True)
@@ -524,6 +827,7 @@ class WebDashboardServer:
         """Stop the web dashboard server."""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
             self._running = False
             logger.info("Web dashboard stopped")
     
@@ -635,7 +939,7 @@ class WebDashboardServer:
                 "tool_name": tool_name,
                 "status": status,
                 "details": details or {},
-                "updated_at": datetime.now(UTC).isoformat(),
+                "updated_at": _now_iso(),
             }
         })
     
@@ -666,8 +970,11 @@ class WebDashboardServer:
         
         if collab_updates:
             with _update_lock:
-                _web_dashboard_state["collaboration"].update(collab_updates)
-                _web_dashboard_state["last_updated"] = datetime.now(UTC).isoformat()
+                _web_dashboard_state["collaboration"] = {
+                    **_web_dashboard_state["collaboration"],
+                    **{key: _own_copy(value) for key, value in collab_updates.items()},
+                }
+                _mark_updated()
 
 
 # Global server instance
@@ -17,6 +17,7 @@ from rich.text import Text
 from strix.agents.StrixAgent import StrixAgent
 from strix.llm.config import LLMConfig
 from strix.telemetry.tracer import Tracer, set_global_tracer
+from strix.tools.agents_graph.agents_graph_actions import close_loop_clients, stop_all_agents
 
 from .utils import build_final_stats_text, build_live_stats_text, get_severity_color
 
@@ -305,6 +306,7 @@ async def run_cli(args: Any) -> None:  # noqa: PLR0915
                 web_dashboard_integration.stop()
             except Exception:
                 pass
+        stop_all_agents()
         tracer.cleanup()
 
     def signal_handler(_signum: int, _frame: Any) -> None:
@@ -425,6 +427,8 @@ async def run_cli(args: Any) -> None:  # noqa: PLR0915
             finally:
                 stop_updates.set()
                 update_thread.join(timeout=1)
+                # asyncio.run closes this loop next; release its pooled HTTP clients first
+                await close_loop_clients()
 
     except Exception as e:
         console.print(f"[bold red]Error during penetration test:[/] {e}")
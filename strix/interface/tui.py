@@ -34,6 +34,7 @@ from strix.agents.StrixAgent import StrixAgent
 from strix.interface.utils import build_live_stats_text
 from strix.llm.config import LLMConfig
 from strix.telemetry.tracer import Tracer, set_global_tracer
+from strix.tools.agents_graph.agents_graph_actions import close_loop_clients, stop_all_agents
 
 
 def escape_markup(text: str) -> str:
@@ -334,9 +335,11 @@ class StrixTUIApp(App):  # type: ignore[misc]
 
     def _setup_cleanup_handlers(self) -> None:
         def cleanup_on_exit() -> None:
+            stop_all_agents()
             self.tracer.cleanup()
 
         def signal_handler(_signum: int, _frame: Any) -> None:
+            stop_all_agents()
             self.tracer.cleanup()
             sys.exit(0)
 
@@ -834,8 +837,11 @@ class StrixTUIApp(App):  # type: ignore[misc]
                 except Exception:
                     logging.exception("Unexpected error during scan")
                 finally:
-                    loop.close()
-                    self._scan_completed.set()
+                    try:
+                        loop.run_until_complete(close_loop_clients())
+                    finally:
+                        loop.close()
+                        self._scan_completed.set()
 
             except Exception:
                 logging.exception("Error setting up scan thread")
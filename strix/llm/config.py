@@ -18,6 +18,7 @@ Example config.json:
 """
 
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -30,6 +31,13 @@ if TYPE_CHECKING:
 DEFAULT_MODEL = "gemini-2.5-pro"
 DEFAULT_TIMEOUT = 300
 
+# Legacy environment variables checked for the API base URL, highest priority first
+API_BASE_ENV_KEYS = ("LLM_API_BASE", "OPENAI_API_BASE", "LITELLM_BASE_URL", "OLLAMA_API_BASE")
+# The LLM and direct API clients also accept CLIPROXY_ENDPOINT, ahead of the legacy keys
+ENDPOINT_ENV_KEYS = ("CLIPROXY_ENDPOINT", *API_BASE_ENV_KEYS)
+# All endpoint keys but OLLAMA_API_BASE imply CLIProxyAPI OAuth mode when no API key is set
+CLIPROXY_ENV_KEYS = ENDPOINT_ENV_KEYS[:-1]
+
 
 def _get_strix_config() -> "StrixConfig | None":
     """Attempt to get StrixConfig, handling import errors gracefully."""
@@ -65,6 +73,7 @@ class LLMConfig:
     - STRIX_LLM: Model name
     - LLM_API_KEY: API key (not needed for CLIProxyAPI OAuth mode)
     - LLM_API_BASE: API base URL
+    - STRIX_LLM_STREAMING: Stream responses in direct API mode ("true"/"false")
     """
     
     def __init__(
@@ -78,22 +87,21 @@ class LLMConfig:
         cliproxy_enabled: bool | None = None,
         cliproxy_base_url: str | None = None,
         cliproxy_management_key: str | None = None,
+        *,
+        streaming_enabled: bool | None = None,
     ):
         # Try to load from StrixConfig first
         strix_config = _get_strix_config()
         
         if strix_config and strix_config.api_endpoint:
             # Use config.json settings
+            self._cliproxy_enabled = True
+            self._cliproxy_base_url = strix_config.api_endpoint
+            self._cliproxy_management_key = cliproxy_management_key or ""
             self.api_endpoint = strix_config.api_endpoint
             self.model_name = model_name or strix_config.model or DEFAULT_MODEL
             self.api_key = strix_config.api_key
             self.scan_mode = strix_config.scan_mode if strix_config.scan_mode else scan_mode
-            
-            # Set environment variables for litellm compatibility
-            if self.api_endpoint and not os.getenv("LLM_API_BASE"):
-                os.environ["LLM_API_BASE"] = self.api_endpoint
-            if self.api_key and not os.getenv("LLM_API_KEY"):
-                os.environ["LLM_API_KEY"] = self.api_key
         else:
             # Fall back to environment variables (legacy support)
             self._init_from_environment(
@@ -113,6 +121,9 @@ class LLMConfig:
         self.enable_prompt_caching = enable_prompt_caching
         self.prompt_modules = prompt_modules or []
         self.timeout = timeout or int(os.getenv("LLM_TIMEOUT", str(DEFAULT_TIMEOUT)))
+        # Stream direct API responses and stop reading once the tool calls are complete
+        self.streaming_enabled = streaming_enabled if streaming_enabled is not None else \
+            os.getenv("STRIX_LLM_STREAMING", "false").lower() == "true"
         
         # Store timeframe config for later access
         self._strix_config = strix_config
@@ -135,14 +146,14 @@ class LLMConfig:
         )
         
         # Get API endpoint from various sources
-        self.api_endpoint = (
-            self._cliproxy_base_url
-            or os.getenv("LLM_API_BASE")
-            or os.getenv("OPENAI_API_BASE")
-            or os.getenv("LITELLM_BASE_URL")
-            or os.getenv("OLLAMA_API_BASE")
-            or ""
-        )
+        self.api_endpoint = self._cliproxy_base_url
+        if not self.api_endpoint:
+            env = os.environ
+            for key in API_BASE_ENV_KEYS:
+                endpoint = env.get(key)
+                if endpoint:
+                    self.api_endpoint = endpoint
+                    break
         
         # Get model name
         if self._cliproxy_enabled and not model_name:
@@ -152,15 +163,37 @@ class LLMConfig:
         
         # Get API key
         self.api_key = os.getenv("LLM_API_KEY")
+    
+    def apply_to_environment(self) -> None:
+        """Export the endpoint and API key for clients that read the environment.
         
-        # Set API base for litellm if we have an endpoint
+        LiteLLM and the direct API client pick up LLM_API_BASE / LLM_API_KEY
+        from the process environment. Existing values are never overwritten.
+        """
         if self.api_endpoint and not os.getenv("LLM_API_BASE"):
             os.environ["LLM_API_BASE"] = self.api_endpoint
+        if self.api_key and not os.getenv("LLM_API_KEY"):
+            os.environ["LLM_API_KEY"] = self.api_key
     
     def get_api_base(self) -> str | None:
         """Get the API base URL."""
         return self.api_endpoint if self.api_endpoint else None
     
+    @property
+    def cliproxy_enabled(self) -> bool:
+        """Whether CLIProxyAPI mode was explicitly enabled (config.json or CLIPROXY_ENABLED)."""
+        return self._cliproxy_enabled
+    
+    @property
+    def cliproxy_base_url(self) -> str:
+        """CLIProxyAPI base URL, empty when not configured."""
+        return self._cliproxy_base_url
+    
+    @property
+    def cliproxy_management_key(self) -> str:
+        """CLIProxyAPI management key, empty when not configured."""
+        return self._cliproxy_management_key
+    
     def is_cliproxy_mode(self) -> bool:
         """Check if using CLIProxyAPI mode (via config.json or environment)."""
         return bool(self.api_endpoint)
@@ -177,8 +210,13 @@ class LLMConfig:
             return self._strix_config.get_time_efficiency_prompt()
         return ""
     
-    def to_dict(self) -> dict:
-        """Convert config to dictionary."""
+    @cached_property
+    def as_dict(self) -> dict:
+        """Config as a dictionary, built once.
+        
+        The returned dict is shared and must be treated as read-only; use
+        ``to_dict()`` for a copy that can be modified.
+        """
         result = {
             "model_name": self.model_name,
             "enable_prompt_caching": self.enable_prompt_caching,
@@ -192,6 +230,10 @@ class LLMConfig:
             result["timeframe"] = self._strix_config.timeframe.to_dict()
         
         return result
+    
+    def to_dict(self) -> dict:
+        """Convert config to dictionary."""
+        return dict(self.as_dict)
 
 
 def create_example_config() -> Path:
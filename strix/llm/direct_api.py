@@ -17,12 +17,21 @@ Usage:
 """
 
 import asyncio
+import json
 import logging
 import os
+import re
+import threading
 import time
+import weakref
 from dataclasses import dataclass
-from typing import Any
+from functools import cache, lru_cache
+from importlib import import_module
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Any, ClassVar
 
+import httpx
 import requests
 from tenacity import (
     retry,
@@ -31,11 +40,43 @@ from tenacity import (
     wait_exponential,
 )
 
+from strix.llm.config import ENDPOINT_ENV_KEYS
+
+
+# tiktoken ships with the litellm extra; token_counter estimates from length without it
+_tiktoken: ModuleType | None = import_module("tiktoken") if find_spec("tiktoken") else None
+
 
 logger = logging.getLogger(__name__)
 
+# Usage block reported when the endpoint omits token accounting
+_EMPTY_USAGE: dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+# HTTP/2 lets concurrent async requests share one connection; it needs the h2 package
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+_ASYNC_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# API paths requested on every client, resolved to full URLs once per client
+_KNOWN_PATHS = ("/chat/completions", "/models")
 
-@dataclass
+# Model families that accept cache_control breakpoints through CLIProxyAPI
+_PROMPT_CACHE_MODELS = frozenset({
+    "claude-3-5-sonnet",
+    "claude-3-5-haiku",
+    "claude-3-7-sonnet",
+    "claude-sonnet-4",
+    "claude-opus-4",
+    "claude-haiku-4",
+    "gemini-1.5-pro",
+    "gemini-2.5-pro",
+})
+_PROMPT_CACHE_MODEL_PREFIXES = tuple(_PROMPT_CACHE_MODELS)
+
+# Model name fragments that indicate image input support
+_VISION_RE = re.compile(r"vision|gpt-4-turbo|gpt-4o|claude-3|qwen-vl", re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class DirectAPIResponse:
     """Response from direct API call."""
     content: str
@@ -74,6 +115,19 @@ class DirectAPITimeoutError(DirectAPIError):
     pass
 
 
+# Transient failures retried with exponential backoff
+_retry_transient = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=2, min=1, max=30),
+    retry=retry_if_exception_type((
+        DirectAPIRateLimitError,
+        DirectAPIConnectionError,
+        DirectAPITimeoutError,
+    )),
+    reraise=True,
+)
+
+
 def _should_retry(exception: Exception) -> bool:
     """Determine if an exception should be retried."""
     if isinstance(exception, DirectAPIRateLimitError):
@@ -94,8 +148,67 @@ class DirectAPIClient:
     
     This client communicates directly with OpenAI-compatible API endpoints
     without using LiteLLM, providing a lighter footprint and more direct control.
+
+    Prefer ``DirectAPIClient.shared()`` (or ``get_direct_api_client()``) over
+    constructing clients directly so all components reuse one instance per
+    endpoint configuration.
     """
     
+    __slots__ = (
+        "_async_clients",
+        "_semaphores",
+        "_total_cost",
+        "_total_requests",
+        "_total_tokens",
+        "_urls",
+        "api_key",
+        "base_url",
+        "endpoint",
+        "max_concurrency",
+        "max_retries",
+        "model",
+        "timeout",
+    )
+
+    _instances: ClassVar[dict[tuple[Any, ...], "DirectAPIClient"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def shared(
+        cls,
+        endpoint: str | None = None,
+        model: str | None = None,
+        api_key: str | None = None,
+        **kwargs: Any,
+    ) -> "DirectAPIClient":
+        """Get the shared client for this configuration, creating it on first use.
+
+        Args:
+            endpoint: API endpoint URL (None resolves from the environment)
+            model: Model name (None resolves from the environment)
+            api_key: API key (None resolves from the environment)
+            **kwargs: Extra constructor arguments (timeout, max_retries, ...)
+
+        Returns:
+            The DirectAPIClient shared by every caller using the same arguments
+        """
+        key = (endpoint, model, api_key, tuple(sorted(kwargs.items())))
+        client = cls._instances.get(key)
+        if client is not None:
+            return client
+        with cls._instances_lock:
+            client = cls._instances.get(key)
+            if client is None:
+                client = cls(endpoint=endpoint, model=model, api_key=api_key, **kwargs)
+                cls._instances[key] = client
+        return client
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        """Drop all shared clients (e.g. after changing endpoint configuration)."""
+        with cls._instances_lock:
+            cls._instances.clear()
+
     def __init__(
         self,
         endpoint: str | None = None,
@@ -103,6 +216,7 @@ class DirectAPIClient:
         api_key: str | None = None,
         timeout: int = 300,
         max_retries: int = 5,
+        max_concurrency: int = 8,
     ):
         """Initialize the direct API client.
         
@@ -112,37 +226,49 @@ class DirectAPIClient:
             api_key: API key (optional for CLIProxyAPI OAuth mode)
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries
+            max_concurrency: Maximum in-flight async completions per event loop
         """
         self.endpoint = endpoint or self._get_endpoint()
         self.model = model or self._get_model()
         self.api_key = api_key or self._get_api_key()
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+
+        # Agents may run on separate event loops, so keep one semaphore per loop
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        # Pooled async HTTP clients are bound to the loop that opened their connections.
+        # Their connections reference the loop, so they must be closed explicitly with
+        # aclose_async_client() before the loop is closed.
+        self._async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
         
         # Remove trailing slash and /v1 suffix for base URL
         self.base_url = self.endpoint.rstrip("/")
         if not self.base_url.endswith("/v1"):
             self.base_url = f"{self.base_url}/v1"
+        self._urls = {path: f"{self.base_url}{path}" for path in _KNOWN_PATHS}
         
         # Statistics
         self._total_requests = 0
         self._total_tokens = 0
         self._total_cost = 0.0
         
-        logger.info(f"DirectAPIClient initialized: endpoint={self.base_url}, model={self.model}")
+        logger.info("DirectAPIClient initialized: endpoint=%s, model=%s", self.base_url, self.model)
     
     def _get_endpoint(self) -> str:
         """Get API endpoint from environment or config."""
-        endpoint = (
-            os.getenv("CLIPROXY_ENDPOINT")
-            or os.getenv("LLM_API_BASE")
-            or os.getenv("OPENAI_API_BASE")
+        env = os.environ
+        for key in ENDPOINT_ENV_KEYS:
+            endpoint = env.get(key)
+            if endpoint:
+                logger.debug("Using API endpoint from %s", key)
+                return endpoint
+        raise DirectAPIError(
+            "No API endpoint configured. "
+            "Set CLIPROXY_ENDPOINT or LLM_API_BASE environment variable."
         )
-        if not endpoint:
-            raise DirectAPIError(
-                "No API endpoint configured. Set CLIPROXY_ENDPOINT or LLM_API_BASE environment variable."
-            )
-        return endpoint
     
     def _get_model(self) -> str:
         """Get model name from environment or config."""
@@ -169,7 +295,7 @@ class DirectAPIClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
     
-    def _handle_response_error(self, response: requests.Response) -> None:
+    def _handle_response_error(self, response: requests.Response | httpx.Response) -> None:
         """Handle HTTP response errors."""
         if response.status_code == 200:
             return
@@ -205,16 +331,15 @@ class DirectAPIClient:
                 details=error_message
             )
     
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=1, max=30),
-        retry=retry_if_exception_type((
-            DirectAPIRateLimitError,
-            DirectAPIConnectionError,
-            DirectAPITimeoutError,
-        )),
-        reraise=True,
-    )
+    def _request_error(self, e: requests.exceptions.RequestException) -> DirectAPIError:
+        """Translate a requests exception into the matching DirectAPIError."""
+        if isinstance(e, requests.exceptions.Timeout):
+            return DirectAPITimeoutError(f"Request timed out after {self.timeout}s", details=str(e))
+        if isinstance(e, requests.exceptions.ConnectionError):
+            return DirectAPIConnectionError(f"Connection failed: {e}", details=str(e))
+        return DirectAPIError(f"Request failed: {e}", details=str(e))
+
+    @_retry_transient
     def _make_request(
         self,
         method: str,
@@ -231,7 +356,7 @@ class DirectAPIClient:
         Returns:
             Response JSON data
         """
-        url = f"{self.base_url}{path}"
+        url = self._urls.get(path) or f"{self.base_url}{path}"
         
         try:
             response = requests.request(
@@ -245,22 +370,102 @@ class DirectAPIClient:
             self._handle_response_error(response)
             return response.json()
             
-        except requests.exceptions.Timeout as e:
-            raise DirectAPITimeoutError(
-                f"Request timed out after {self.timeout}s",
-                details=str(e)
-            ) from e
-        except requests.exceptions.ConnectionError as e:
-            raise DirectAPIConnectionError(
-                f"Connection failed: {e}",
-                details=str(e)
-            ) from e
         except requests.exceptions.RequestException as e:
-            raise DirectAPIError(
-                f"Request failed: {e}",
-                details=str(e)
-            ) from e
+            raise self._request_error(e) from e
+
+    @_retry_transient
+    def _stream_request(
+        self,
+        json_data: dict[str, Any],
+        cutoff: str | None = None,
+        cutoff_count: int = 1,
+    ) -> dict[str, Any]:
+        """Stream a chat completion and assemble it into a completion payload.
+
+        Reading stops, and the connection is closed, as soon as ``cutoff`` has
+        appeared ``cutoff_count`` times in the generated text; the text is
+        trimmed right after that occurrence. Usage is estimated from the text
+        when the stream ends before the endpoint reports it.
+
+        Args:
+            json_data: /chat/completions body; ``stream`` is set here
+            cutoff: Text after which the rest of the generation is not needed
+            cutoff_count: Occurrences of ``cutoff`` to wait for
+
+        Returns:
+            Completion payload in the non-streaming response format
+        """
+        url = self._urls.get("/chat/completions") or f"{self.base_url}/chat/completions"
+        body = {**json_data, "stream": True, "stream_options": {"include_usage": True}}
+        text = ""
+        model = self.model
+        finish_reason = "unknown"
+        usage: dict[str, int] | None = None
+        seen = 0
+        scan_from = 0
+
+        try:
+            with requests.post(
+                url,
+                headers=self._get_headers(),
+                json=body,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                self._handle_response_error(response)
+                # SSE is UTF-8 by spec; requests would assume ISO-8859-1 without a charset
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode("utf-8")
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    model = chunk.get("model") or model
+                    usage = chunk.get("usage") or usage
+                    choices = chunk.get("choices")
+                    if not choices:
+                        continue
+                    choice = choices[0]
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    delta = (choice.get("delta") or {}).get("content")
+                    if not delta:
+                        continue
+                    text += delta
+                    if cutoff is None:
+                        continue
+                    # Rescan the tail of the previous text in case cutoff spans chunks
+                    while (found := text.find(cutoff, scan_from)) != -1:
+                        seen += 1
+                        scan_from = found + len(cutoff)
+                        if seen >= cutoff_count:
+                            break
+                    else:
+                        scan_from = max(scan_from, len(text) - len(cutoff) + 1)
+                        continue
+                    text = text[:scan_from]
+                    finish_reason = "stop"
+                    break
+        except requests.exceptions.RequestException as e:
+            raise self._request_error(e) from e
+        except json.JSONDecodeError as e:
+            raise DirectAPIError("Malformed stream chunk", details=str(e)) from e
+
+        if usage is None:
+            completion_tokens = token_counter(text)
+            usage = {
+                "prompt_tokens": 0,
+                "completion_tokens": completion_tokens,
+                "total_tokens": completion_tokens,
+            }
+        return {
+            "model": model,
+            "choices": [{"message": {"content": text}, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
     
+    @_retry_transient
     async def _make_request_async(
         self,
         method: str,
@@ -269,14 +474,122 @@ class DirectAPIClient:
     ) -> dict[str, Any]:
         """Make an async HTTP request to the API.
         
-        This wraps the synchronous request in an executor for async compatibility.
+        Uses the pooled httpx client of the running event loop, so requests
+        reuse keep-alive connections (multiplexed over HTTP/2 when available)
+        without occupying an executor thread.
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self._make_request(method, path, json_data)
-        )
+        url = self._urls.get(path) or f"{self.base_url}{path}"
+
+        try:
+            response = await self._get_async_client().request(
+                method,
+                url,
+                headers=self._get_headers(),
+                json=json_data,
+            )
+        except httpx.TimeoutException as e:
+            raise DirectAPITimeoutError(
+                f"Request timed out after {self.timeout}s", details=str(e)
+            ) from e
+        except httpx.TransportError as e:
+            raise DirectAPIConnectionError(f"Connection failed: {e}", details=str(e)) from e
+        except httpx.HTTPError as e:
+            raise DirectAPIError(f"Request failed: {e}", details=str(e)) from e
+
+        self._handle_response_error(response)
+        return response.json()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=_ASYNC_LIMITS,
+                timeout=self.timeout,
+            )
+            self._async_clients[loop] = client
+        return client
     
+    async def aclose_async_client(self) -> None:
+        """Close the running loop's pooled HTTP client, if one was opened.
+
+        The loop's semaphore is dropped too, since it may hold the loop once used.
+        """
+        loop = asyncio.get_running_loop()
+        self._semaphores.pop(loop, None)
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    @classmethod
+    async def aclose_shared_async_clients(cls) -> None:
+        """Close the running loop's pooled HTTP client on every shared instance."""
+        with cls._instances_lock:
+            instances = list(cls._instances.values())
+        for instance in instances:
+            await instance.aclose_async_client()
+
+    def _build_request_data(
+        self,
+        messages: list[dict[str, Any]],
+        model: str | None,
+        temperature: float | None,
+        max_tokens: int | None,
+        stop: list[str] | None,
+        extra: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Build a /chat/completions body, omitting unset optional fields."""
+        request_data = {
+            key: value
+            for key, value in (
+                ("model", model or self.model),
+                ("messages", messages),
+                ("temperature", temperature),
+                ("max_tokens", max_tokens),
+                ("stop", stop),
+            )
+            if value is not None
+        }
+        if extra:
+            request_data.update(extra)
+        return request_data
+
+    def _parse_completion(
+        self,
+        response: dict[str, Any],
+        copy_usage: bool = False,
+    ) -> DirectAPIResponse:
+        """Build a DirectAPIResponse from a chat completion payload.
+
+        Args:
+            response: Decoded JSON body of a /chat/completions response
+            copy_usage: Return a normalized copy of the usage block instead of
+                the dict from the response itself
+
+        Returns:
+            DirectAPIResponse with the first choice
+        """
+        try:
+            choice = response["choices"][0]
+            message = choice["message"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise DirectAPIError("No choices in response", details=str(e)) from e
+
+        usage = response.get("usage") or dict(_EMPTY_USAGE)
+        if copy_usage:
+            usage = {key: usage.get(key, 0) for key in _EMPTY_USAGE}
+        self._total_tokens += usage.get("total_tokens", 0)
+
+        return DirectAPIResponse(
+            content=message.get("content") or "",
+            model=response.get("model", self.model),
+            usage=usage,
+            finish_reason=choice.get("finish_reason", "unknown"),
+            raw_response=response,
+        )
+
     def list_models(self) -> list[dict[str, Any]]:
         """List available models.
         
@@ -313,50 +626,14 @@ class DirectAPIClient:
         Returns:
             DirectAPIResponse with the completion
         """
-        request_data: dict[str, Any] = {
-            "model": model or self.model,
-            "messages": messages,
-        }
-        
-        if temperature is not None:
-            request_data["temperature"] = temperature
-        if max_tokens is not None:
-            request_data["max_tokens"] = max_tokens
-        if stop is not None:
-            request_data["stop"] = stop
-        
-        # Add any additional parameters
-        request_data.update(kwargs)
+        request_data = self._build_request_data(
+            messages, model, temperature, max_tokens, stop, kwargs
+        )
         
         self._total_requests += 1
         
         response = self._make_request("POST", "/chat/completions", request_data)
-        
-        # Parse response
-        choices = response.get("choices", [])
-        if not choices:
-            raise DirectAPIError("No choices in response")
-        
-        choice = choices[0]
-        message = choice.get("message", {})
-        content = message.get("content", "")
-        finish_reason = choice.get("finish_reason", "unknown")
-        
-        # Parse usage
-        usage = response.get("usage", {})
-        self._total_tokens += usage.get("total_tokens", 0)
-        
-        return DirectAPIResponse(
-            content=content,
-            model=response.get("model", self.model),
-            usage={
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            },
-            finish_reason=finish_reason,
-            raw_response=response,
-        )
+        return self._parse_completion(response)
     
     async def chat_completion_async(
         self,
@@ -368,48 +645,78 @@ class DirectAPIClient:
         **kwargs: Any,
     ) -> DirectAPIResponse:
         """Make a chat completion request (async version)."""
-        request_data: dict[str, Any] = {
-            "model": model or self.model,
-            "messages": messages,
-        }
-        
-        if temperature is not None:
-            request_data["temperature"] = temperature
-        if max_tokens is not None:
-            request_data["max_tokens"] = max_tokens
-        if stop is not None:
-            request_data["stop"] = stop
-        
-        request_data.update(kwargs)
+        request_data = self._build_request_data(
+            messages, model, temperature, max_tokens, stop, kwargs
+        )
         
         self._total_requests += 1
         
-        response = await self._make_request_async("POST", "/chat/completions", request_data)
-        
-        choices = response.get("choices", [])
-        if not choices:
-            raise DirectAPIError("No choices in response")
-        
-        choice = choices[0]
-        message = choice.get("message", {})
-        content = message.get("content", "")
-        finish_reason = choice.get("finish_reason", "unknown")
-        
-        usage = response.get("usage", {})
-        self._total_tokens += usage.get("total_tokens", 0)
-        
-        return DirectAPIResponse(
-            content=content,
-            model=response.get("model", self.model),
-            usage={
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            },
-            finish_reason=finish_reason,
-            raw_response=response,
-        )
+        async with self._get_semaphore():
+            response = await self._make_request_async("POST", "/chat/completions", request_data)
+        return self._parse_completion(response)
     
+    async def chat_completion_stream_async(
+        self,
+        messages: list[dict[str, Any]],
+        model: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        cutoff: str | None = None,
+        cutoff_count: int = 1,
+        **kwargs: Any,
+    ) -> DirectAPIResponse:
+        """Make a streaming chat completion request.
+
+        Same result shape as ``chat_completion_async``, but the reply is read
+        as it is generated and the request ends early once ``cutoff`` has been
+        seen ``cutoff_count`` times (see ``_stream_request``).
+        """
+        request_data = self._build_request_data(
+            messages, model, temperature, max_tokens, stop, kwargs
+        )
+
+        self._total_requests += 1
+
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            response = await loop.run_in_executor(
+                None, lambda: self._stream_request(request_data, cutoff, cutoff_count)
+            )
+        return self._parse_completion(response)
+
+    async def chat_completion_batch_async(
+        self,
+        batch: list[list[dict[str, Any]]],
+        **kwargs: Any,
+    ) -> list[DirectAPIResponse]:
+        """Run several chat completions concurrently.
+
+        Requests are bounded by ``max_concurrency`` and results are returned in
+        the same order as ``batch``. The first failure is raised.
+
+        Args:
+            batch: One message list per completion
+            **kwargs: Parameters passed to every chat_completion_async call
+
+        Returns:
+            List of DirectAPIResponse, one per entry in batch
+        """
+        return list(
+            await asyncio.gather(
+                *(self.chat_completion_async(messages, **kwargs) for messages in batch)
+            )
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
     def get_stats(self) -> dict[str, Any]:
         """Get client statistics."""
         return {
@@ -421,16 +728,16 @@ class DirectAPIClient:
         }
 
 
-# Global client instance for convenience
-_global_client: DirectAPIClient | None = None
-
-
+@cache
 def get_direct_api_client() -> DirectAPIClient:
-    """Get or create the global DirectAPIClient instance."""
-    global _global_client
-    if _global_client is None:
-        _global_client = DirectAPIClient()
-    return _global_client
+    """Get or create the global DirectAPIClient instance.
+
+    The instance is created lazily on first call and is the same object as
+    ``DirectAPIClient.shared()``. Use ``get_direct_api_client.cache_clear()``
+    together with ``DirectAPIClient.clear_shared()`` to drop it (e.g. in tests
+    or after changing the endpoint environment variables).
+    """
+    return DirectAPIClient.shared()
 
 
 def is_direct_api_mode() -> bool:
@@ -438,12 +745,32 @@ def is_direct_api_mode() -> bool:
     return os.getenv("STRIX_DIRECT_API_MODE", "").lower() == "true"
 
 
+@cache
+def _get_encoder() -> Any | None:
+    """Load the cl100k_base BPE encoder once, or None if tiktoken is unavailable."""
+    if _tiktoken is None:
+        logger.debug("tiktoken unavailable, using character-based token estimate")
+        return None
+    try:
+        return _tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # noqa: BLE001
+        logger.debug("tiktoken unavailable, using character-based token estimate: %s", e)
+        return None
+
+
+@lru_cache(maxsize=2048)
 def token_counter(text: str) -> int:
-    """Estimate token count for text.
+    """Count tokens in text.
     
-    This is a simple estimation based on character count.
-    For more accurate counts, consider using a tokenizer.
+    Uses the tiktoken cl100k_base encoding when tiktoken is installed (it ships
+    with the litellm extra). Otherwise falls back to a character-based estimate.
     """
+    encoder = _get_encoder()
+    if encoder is not None:
+        try:
+            return len(encoder.encode(text, disallowed_special=()))
+        except Exception as e:  # noqa: BLE001
+            logger.debug("tiktoken encode failed, using character-based token estimate: %s", e)
     # Rough estimation: ~4 characters per token for English text
     return len(text) // 4
 
@@ -451,10 +778,11 @@ def token_counter(text: str) -> int:
 def supports_prompt_caching(model: str) -> bool:
     """Check if a model supports prompt caching.
     
-    Currently returns False for all models as we don't implement
-    caching in direct API mode.
+    Matches the model name (without any provider prefix) against known
+    Claude and Gemini families that honor ``cache_control`` blocks.
     """
-    return False
+    name = model.lower().rsplit("/", 1)[-1]
+    return name.startswith(_PROMPT_CACHE_MODEL_PREFIXES)
 
 
 def supports_vision(model: str) -> bool:
@@ -462,6 +790,4 @@ def supports_vision(model: str) -> bool:
     
     This is a simple check based on model name patterns.
     """
-    model_lower = model.lower()
-    vision_keywords = ["vision", "gpt-4-turbo", "gpt-4o", "claude-3", "qwen-vl"]
-    return any(kw in model_lower for kw in vision_keywords)
+    return _VISION_RE.search(model) is not None
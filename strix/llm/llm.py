@@ -1,10 +1,13 @@
 import logging
 import os
+import re
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from fnmatch import fnmatch
+from fnmatch import translate
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from jinja2 import (
     Environment,
@@ -12,10 +15,11 @@ from jinja2 import (
     select_autoescape,
 )
 
-from strix.llm.config import LLMConfig
+from strix import config as strix_config
+from strix.llm.config import CLIPROXY_ENV_KEYS, ENDPOINT_ENV_KEYS, LLMConfig
 from strix.llm.memory_compressor import MemoryCompressor
-from strix.llm.request_queue import get_global_queue
-from strix.llm.utils import _truncate_to_first_function, parse_tool_invocations
+from strix.llm.request_queue import DEFAULT_PRIORITY, get_global_queue
+from strix.llm.utils import MAX_ACTIONS_PER_CALL, _extract_tool_block
 from strix.prompts import load_prompt_modules
 from strix.tools import get_tools_prompt
 
@@ -49,76 +53,65 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-def _get_api_key() -> str | None:
-    """Get API key from config.json or environment.
-    
-    Priority:
+# LiteLLM exception types and their user-facing messages, in match priority order
+_LITELLM_ERROR_MAP: dict[type, str] = {}
+if _litellm_available:
+    for _error_name, _error_message in (
+        ("RateLimitError", "Rate limit exceeded"),
+        ("AuthenticationError", "Invalid API key"),
+        ("NotFoundError", "Model not found"),
+        ("ContextWindowExceededError", "Context too long"),
+        ("ServiceUnavailableError", "Service unavailable"),
+        ("Timeout", "Request timed out"),
+        ("APIError", "API error"),
+    ):
+        _error_type = getattr(litellm, _error_name, None)
+        if isinstance(_error_type, type):
+            _LITELLM_ERROR_MAP.setdefault(_error_type, _error_message)
+_LITELLM_ERROR_TYPES = tuple(_LITELLM_ERROR_MAP)
+
+
+def _load_credentials() -> tuple[str | None, str | None]:
+    """Get the API key and API base URL from config.json or environment.
+
+    API key priority:
     1. config.json api.api_key
-    2. LLM_API_KEY environment variable
-    3. Default placeholder for CLIProxyAPI OAuth mode (when endpoint is set)
-    
+    2. Placeholder for CLIProxyAPI OAuth mode when config.json sets api.endpoint
+    3. LLM_API_KEY environment variable
+    4. Placeholder for CLIProxyAPI OAuth mode when an endpoint variable is set
+
+    API base priority:
+    1. config.json api.endpoint (CLIProxyAPI endpoint)
+    2. CLIPROXY_ENDPOINT environment variable (recommended for CLIProxyAPI)
+    3. LLM_API_BASE / OPENAI_API_BASE / LITELLM_BASE_URL / OLLAMA_API_BASE
+
     CLIProxyAPI Mode:
     When using CLIProxyAPI, you only need to set the API_ENDPOINT - no API key required!
     CLIProxyAPI handles authentication through OAuth, so API keys are optional.
+    Example: http://localhost:8317/v1
     """
+    api_key: str | None = None
+    api_base: str | None = None
     try:
-        from strix.config import get_config
-        config = get_config()
-        if config.api_key:
-            return config.api_key
+        config = strix_config.get_config()
+    except Exception as e:  # noqa: BLE001
+        # config.json is optional; fall back to the environment
+        logger.debug("config.json credentials unavailable: %s", e)
+    else:
+        api_base = config.api_endpoint or None
         # If endpoint is set but no API key, use CLIProxyAPI OAuth mode
-        if config.api_endpoint:
-            return "cliproxy-oauth-mode"
-    except (ImportError, Exception):
-        pass
-    
-    # Fall back to environment variable
-    api_key = os.getenv("LLM_API_KEY")
-    if api_key:
-        return api_key
-    
-    # Check if API endpoint is set (CLIProxyAPI mode)
-    api_endpoint = (
-        os.getenv("CLIPROXY_ENDPOINT")
-        or os.getenv("LLM_API_BASE")
-        or os.getenv("OPENAI_API_BASE")
-        or os.getenv("LITELLM_BASE_URL")
-    )
-    if api_endpoint:
+        api_key = config.api_key or ("cliproxy-oauth-mode" if api_base else None)
+
+    env = os.environ
+    if not api_base:
+        api_base = next((env[key] for key in ENDPOINT_ENV_KEYS if env.get(key)), None)
+    if not api_key:
+        api_key = env.get("LLM_API_KEY") or None
+    if not api_key and any(env.get(key) for key in CLIPROXY_ENV_KEYS):
         # CLIProxyAPI OAuth mode - no API key needed
-        return "cliproxy-oauth-mode"
-    
-    return None
-
+        api_key = "cliproxy-oauth-mode"
 
-def _get_api_base() -> str | None:
-    """Get API base URL from config.json or environment.
-    
-    Priority:
-    1. config.json api.endpoint (CLIProxyAPI endpoint)
-    2. CLIPROXY_ENDPOINT environment variable (recommended for CLIProxyAPI)
-    3. LLM_API_BASE / OPENAI_API_BASE / LITELLM_BASE_URL environment variables
-    
-    CLIProxyAPI Mode:
-    Set CLIPROXY_ENDPOINT or api.endpoint in config.json to use CLIProxyAPI.
-    Example: http://localhost:8317/v1
-    """
-    try:
-        from strix.config import get_config
-        config = get_config()
-        if config.api_endpoint:
-            return config.api_endpoint
-    except (ImportError, Exception):
-        pass
-    
-    # Fall back to environment variables (CLIPROXY_ENDPOINT has priority)
-    return (
-        os.getenv("CLIPROXY_ENDPOINT")
-        or os.getenv("LLM_API_BASE")
-        or os.getenv("OPENAI_API_BASE")
-        or os.getenv("LITELLM_BASE_URL")
-        or os.getenv("OLLAMA_API_BASE")
-    )
+    return api_key, api_base
 
 
 # Lazy initialization - will be set on first use
@@ -131,12 +124,44 @@ def _ensure_credentials() -> tuple[str | None, str | None]:
     """Ensure credentials are initialized and return them."""
     global _LLM_API_KEY, _LLM_API_BASE, _CREDENTIALS_INITIALIZED
     if not _CREDENTIALS_INITIALIZED:
-        _LLM_API_KEY = _get_api_key()
-        _LLM_API_BASE = _get_api_base()
+        _LLM_API_KEY, _LLM_API_BASE = _load_credentials()
         _CREDENTIALS_INITIALIZED = True
     return _LLM_API_KEY, _LLM_API_BASE
 
 
+@cache
+def _get_jinja_env(agent_name: str) -> Environment:
+    """Get the prompt template environment for an agent, built once per process."""
+    prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
+    prompts_dir = Path(__file__).parent.parent / "prompts"
+
+    return Environment(
+        loader=FileSystemLoader([prompt_dir, prompts_dir]),
+        autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
+    )
+
+
+@lru_cache(maxsize=128)
+def _build_system_prompt(agent_name: str, scan_mode: str, modules_key: tuple[str, ...]) -> str:
+    """Render the system prompt for an agent, once per (agent, scan mode, modules)."""
+    jinja_env = _get_jinja_env(agent_name)
+
+    modules_to_load = [*modules_key, f"scan_modes/{scan_mode}"]
+    prompt_module_content = load_prompt_modules(modules_to_load, jinja_env)
+
+    def get_module(name: str) -> str:
+        return prompt_module_content.get(name, "")
+
+    # The environment is shared between instances, so pass the helper as a
+    # render variable instead of a global
+    return jinja_env.get_template("system_prompt.jinja").render(
+        get_module=get_module,
+        get_tools_prompt=get_tools_prompt,
+        loaded_module_names=list(prompt_module_content.keys()),
+        **prompt_module_content,
+    )
+
+
 class LLMRequestFailedError(Exception):
     def __init__(self, message: str, details: str | None = None):
         super().__init__(message)
@@ -169,6 +194,7 @@ REASONING_EFFORT_PATTERNS: list[str] = [
 ]
 
 
+@lru_cache(maxsize=256)
 def normalize_model_name(model: str) -> str:
     raw = (model or "").strip().lower()
     if "/" in raw:
@@ -182,17 +208,43 @@ def normalize_model_name(model: str) -> str:
     return name
 
 
-def model_matches(model: str, patterns: list[str]) -> bool:
-    raw = (model or "").strip().lower()
-    name = normalize_model_name(model)
-    for pat in patterns:
-        pat_l = pat.lower()
-        if "/" in pat_l:
-            if fnmatch(raw, pat_l):
-                return True
-        elif fnmatch(name, pat_l):
-            return True
-    return False
+class ModelPatterns(NamedTuple):
+    """Glob patterns compiled into one regex per match target.
+
+    Patterns containing "/" match the full model string; all others match the
+    normalized model name.
+    """
+
+    raw: re.Pattern[str] | None
+    name: re.Pattern[str] | None
+
+
+def compile_model_patterns(patterns: list[str]) -> ModelPatterns:
+    def _join(globs: list[str]) -> re.Pattern[str] | None:
+        if not globs:
+            return None
+        return re.compile("|".join(translate(glob) for glob in globs))
+
+    lowered = [pat.lower() for pat in patterns]
+    return ModelPatterns(
+        raw=_join([pat for pat in lowered if "/" in pat]),
+        name=_join([pat for pat in lowered if "/" not in pat]),
+    )
+
+
+_STOP_WORDS_FALSE_RE = compile_model_patterns(SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+_REASONING_EFFORT_RE = compile_model_patterns(REASONING_EFFORT_PATTERNS)
+
+
+def model_matches(model: str, patterns: ModelPatterns) -> bool:
+    if patterns.raw is not None and patterns.raw.match((model or "").strip().lower()):
+        return True
+    return patterns.name is not None and patterns.name.match(normalize_model_name(model)) is not None
+
+
+_IMAGE_REMOVED_TEXT = (
+    "[Screenshot removed - model does not support vision. Use view_source or execute_js instead.]"
+)
 
 
 class StepRole(str, Enum):
@@ -201,7 +253,7 @@ class StepRole(str, Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     content: str
     tool_invocations: list[dict[str, Any]] | None = None
@@ -210,7 +262,7 @@ class LLMResponse:
     role: StepRole = StepRole.AGENT
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestStats:
     input_tokens: int = 0
     output_tokens: int = 0
@@ -232,6 +284,28 @@ class RequestStats:
         }
 
 
+def _dict_usage(usage: dict[str, Any]) -> tuple[int, int, int, int]:
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), 0, 0
+
+
+def _object_usage(usage: Any) -> tuple[int, int, int, int]:
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    return (
+        getattr(usage, "prompt_tokens", 0),
+        getattr(usage, "completion_tokens", 0),
+        getattr(prompt_details, "cached_tokens", 0) or 0,
+        getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    )
+
+
+def _select_usage_extractor(usage: Any) -> Callable[[Any], tuple[int, int, int, int]]:
+    """Pick the usage reader for a provider's response shape.
+
+    Returns (input, output, cached, cache creation) token counts.
+    """
+    return _dict_usage if isinstance(usage, dict) else _object_usage
+
+
 class LLM:
     def __init__(
         self, config: LLMConfig, agent_name: str | None = None, agent_id: str | None = None
@@ -241,10 +315,13 @@ class LLM:
         self.agent_id = agent_id
         self._total_stats = RequestStats()
         self._last_request_stats = RequestStats()
-        
+
+        # LiteLLM and the direct client resolve credentials from the environment
+        self.config.apply_to_environment()
+
         # Check if we should use direct API mode
         self._use_direct_api = is_direct_api_mode() or not _litellm_available
-        
+
         if self._use_direct_api:
             logger.info("Using Direct API mode (no LiteLLM)")
             self._direct_client = get_direct_api_client()
@@ -252,36 +329,17 @@ class LLM:
             logger.info("Using LiteLLM mode")
             self._direct_client = None
 
-        self.memory_compressor = MemoryCompressor(
-            model_name=self.config.model_name,
-            timeout=self.config.timeout,
-        )
+        self._resolve_model_capabilities()
+        self._usage_extractor: Callable[[Any], tuple[int, int, int, int]] | None = None
 
         if agent_name:
-            prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
-            prompts_dir = Path(__file__).parent.parent / "prompts"
-
-            loader = FileSystemLoader([prompt_dir, prompts_dir])
-            self.jinja_env = Environment(
-                loader=loader,
-                autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
-            )
+            self.jinja_env = _get_jinja_env(agent_name)
 
             try:
-                modules_to_load = list(self.config.prompt_modules or [])
-                modules_to_load.append(f"scan_modes/{self.config.scan_mode}")
-
-                prompt_module_content = load_prompt_modules(modules_to_load, self.jinja_env)
-
-                def get_module(name: str) -> str:
-                    return prompt_module_content.get(name, "")
-
-                self.jinja_env.globals["get_module"] = get_module
-
-                self.system_prompt = self.jinja_env.get_template("system_prompt.jinja").render(
-                    get_tools_prompt=get_tools_prompt,
-                    loaded_module_names=list(prompt_module_content.keys()),
-                    **prompt_module_content,
+                self.system_prompt = _build_system_prompt(
+                    agent_name,
+                    self.config.scan_mode,
+                    tuple(self.config.prompt_modules or ()),
                 )
             except (FileNotFoundError, OSError, ValueError) as e:
                 logger.warning(f"Failed to load system prompt for {agent_name}: {e}")
@@ -289,13 +347,70 @@ class LLM:
         else:
             self.system_prompt = "You are a helpful AI assistant."
 
+        self._refresh_prefix_messages()
+
+    @cached_property
+    def memory_compressor(self) -> MemoryCompressor:
+        """Created on first compression; many agents finish before needing one."""
+        return MemoryCompressor(
+            model_name=self.config.model_name,
+            timeout=self.config.timeout,
+        )
+
+    def _resolve_model_capabilities(self) -> None:
+        """Evaluate the per-model checks once; the model does not change after init."""
+        model_name = self.config.model_name
+        self._anthropic_model = bool(model_name) and any(
+            provider in model_name.lower() for provider in ["anthropic/", "claude"]
+        )
+        self._include_stop = not model_name or not model_matches(model_name, _STOP_WORDS_FALSE_RE)
+        self._stop_param = ["</function>"] if self._include_stop else None
+        self._include_reasoning = bool(model_name) and model_matches(
+            model_name, _REASONING_EFFORT_RE
+        )
+
+        self._supports_vision = False
+        self._supports_prompt_caching = False
+        self._caching_active = False
+        if not model_name:
+            return
+        try:
+            if self._use_direct_api:
+                self._supports_vision = direct_supports_vision(model_name)
+                self._supports_prompt_caching = direct_supports_prompt_caching(model_name)
+            elif _litellm_available:
+                self._supports_vision = bool(supports_vision(model=model_name))
+                self._supports_prompt_caching = bool(supports_prompt_caching(model_name))
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not resolve capabilities for model %s", model_name)
+
+        # Direct mode tags the system prompt for any caching model; LiteLLM only for Anthropic
+        self._caching_active = bool(
+            self.config.enable_prompt_caching
+            and self._supports_prompt_caching
+            and (self._use_direct_api or self._anthropic_model)
+        )
+
     def set_agent_identity(self, agent_name: str | None, agent_id: str | None) -> None:
         if agent_name:
             self.agent_name = agent_name
         if agent_id:
             self.agent_id = agent_id
+        self._refresh_prefix_messages()
+
+    def _refresh_prefix_messages(self) -> None:
+        """Rebuild the system and identity messages sent ahead of the history."""
+        self._identity_message = self._make_identity_message()
+        self._prefix_messages: list[dict[str, Any]] = [
+            {"role": "system", "content": self.system_prompt}
+        ]
+        if self._identity_message:
+            self._prefix_messages.append(self._identity_message)
 
     def _build_identity_message(self) -> dict[str, Any] | None:
+        return self._identity_message
+
+    def _make_identity_message(self) -> dict[str, Any] | None:
         if not (self.agent_name and str(self.agent_name).strip()):
             return None
         identity_name = self.agent_name
@@ -321,15 +436,16 @@ class LLM:
             return [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
         if isinstance(content, list) and content:
             last_item = content[-1]
-            if isinstance(last_item, dict) and last_item.get("type") == "text":
-                return content[:-1] + [{**last_item, "cache_control": {"type": "ephemeral"}}]
+            if (
+                isinstance(last_item, dict)
+                and last_item.get("type") == "text"
+                and "cache_control" not in last_item
+            ):
+                return [*content[:-1], last_item | {"cache_control": {"type": "ephemeral"}}]
         return content
 
     def _is_anthropic_model(self) -> bool:
-        if not self.config.model_name:
-            return False
-        model_lower = self.config.model_name.lower()
-        return any(provider in model_lower for provider in ["anthropic/", "claude"])
+        return self._anthropic_model
 
     def _calculate_cache_interval(self, total_messages: int) -> int:
         if total_messages <= 1:
@@ -345,124 +461,111 @@ class LLM:
         return interval
 
     def _prepare_cached_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        if self._use_direct_api:
-            # Direct API mode doesn't support prompt caching
-            return messages
-            
-        if (
-            not self.config.enable_prompt_caching
-            or not supports_prompt_caching(self.config.model_name)
-            or not messages
-        ):
-            return messages
-
-        if not self._is_anthropic_model():
+        if not self._caching_active or not messages:
             return messages
 
-        cached_messages = list(messages)
-
-        if cached_messages and cached_messages[0].get("role") == "system":
-            system_message = cached_messages[0].copy()
-            system_message["content"] = self._add_cache_control_to_content(
-                system_message["content"]
-            )
-            cached_messages[0] = system_message
+        if self._use_direct_api:
+            return self._prepare_direct_cached_messages(messages)
 
-        total_messages = len(cached_messages)
+        total_messages = len(messages)
+        cache_indices: list[int] = []
+        if messages[0].get("role") == "system":
+            cache_indices.append(0)
         if total_messages > 1:
             interval = self._calculate_cache_interval(total_messages)
+            cache_indices.extend(range(interval, total_messages, interval)[:3])
 
-            cached_count = 0
-            for i in range(interval, total_messages, interval):
-                if cached_count >= 3:
-                    break
+        if not cache_indices:
+            return messages
 
-                if i < len(cached_messages):
-                    message = cached_messages[i].copy()
-                    message["content"] = self._add_cache_control_to_content(message["content"])
-                    cached_messages[i] = message
-                    cached_count += 1
+        # Copy-on-write: only the list and the tagged messages are copied
+        cached_messages = messages.copy()
+        for i in cache_indices:
+            content = cached_messages[i]["content"]
+            tagged = self._add_cache_control_to_content(content)
+            if tagged is not content:
+                cached_messages[i] = {**cached_messages[i], "content": tagged}
 
         return cached_messages
 
-    async def generate(  # noqa: PLR0912, PLR0915
+    def _prepare_direct_cached_messages(
+        self, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Mark the system prompt as a cache breakpoint for direct API mode."""
+        if not self._caching_active or not messages or messages[0].get("role") != "system":
+            return messages
+
+        content = messages[0]["content"]
+        tagged = self._add_cache_control_to_content(content)
+        if tagged is content:
+            return messages
+        return [{**messages[0], "content": tagged}, *messages[1:]]
+
+    def _build_messages(self, conversation_history: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # compress_history returns the same list when nothing was compressed
+        compressed_history = self.memory_compressor.compress_history(conversation_history)
+        if compressed_history is not conversation_history:
+            conversation_history[:] = compressed_history
+
+        return [*self._prefix_messages, *compressed_history]
+
+    def _extract_content(self, response: Any) -> tuple[str, list[dict[str, Any]] | None]:
+        content = ""
+        if self._use_direct_api:
+            content = response.content if hasattr(response, 'content') else ""
+        elif (
+            response.choices
+            and hasattr(response.choices[0], "message")
+            and response.choices[0].message
+        ):
+            content = getattr(response.choices[0].message, "content", "") or ""
+
+        # Multi-action support: up to 7 function calls, trimmed after the last one
+        return _extract_tool_block(content)
+
+    def _request_failed(self, e: Exception) -> LLMRequestFailedError:
+        if isinstance(e, DirectAPIError):
+            return LLMRequestFailedError(f"Direct API request failed: {e.message}", e.details)
+        if _litellm_available and not self._use_direct_api:
+            message = _LITELLM_ERROR_MAP.get(type(e))
+            if message is None and isinstance(e, _LITELLM_ERROR_TYPES):
+                message = next(msg for t, msg in _LITELLM_ERROR_MAP.items() if isinstance(e, t))
+            if message is not None:
+                return LLMRequestFailedError(f"LLM request failed: {message}", str(e))
+        return LLMRequestFailedError(f"LLM request failed: {type(e).__name__}", str(e))
+
+    async def generate(
         self,
         conversation_history: list[dict[str, Any]],
         scan_id: str | None = None,
         step_number: int = 1,
+        priority: int = DEFAULT_PRIORITY,
     ) -> LLMResponse:
-        messages = [{"role": "system", "content": self.system_prompt}]
-
-        identity_message = self._build_identity_message()
-        if identity_message:
-            messages.append(identity_message)
-
-        compressed_history = list(self.memory_compressor.compress_history(conversation_history))
-
-        conversation_history.clear()
-        conversation_history.extend(compressed_history)
-        messages.extend(compressed_history)
-
-        cached_messages = self._prepare_cached_messages(messages)
+        messages = self._build_messages(conversation_history)
+        cached_messages = (
+            self._prepare_cached_messages(messages) if self._caching_active else messages
+        )
 
         try:
             if self._use_direct_api:
                 response = await self._make_direct_request(cached_messages)
             else:
-                response = await self._make_request(cached_messages)
-                
-            self._update_usage_stats(response)
-
-            content = ""
-            if self._use_direct_api:
-                content = response.content if hasattr(response, 'content') else ""
-            elif (
-                response.choices
-                and hasattr(response.choices[0], "message")
-                and response.choices[0].message
-            ):
-                content = getattr(response.choices[0].message, "content", "") or ""
-
-            content = _truncate_to_first_function(content)
+                response = await self._make_request(cached_messages, priority)
 
-            # Multi-action support: find all function calls (up to 7)
-            # Ensure content ends properly if truncated
-            if "</function>" in content:
-                # Find the last complete function tag
-                last_func_end = content.rfind("</function>")
-                if last_func_end != -1:
-                    content = content[:last_func_end + len("</function>")]
+            self._update_usage_stats(response)
 
-            tool_invocations = parse_tool_invocations(content)
+            content, tool_invocations = self._extract_content(response)
 
             return LLMResponse(
                 scan_id=scan_id,
                 step_number=step_number,
                 role=StepRole.AGENT,
                 content=content,
-                tool_invocations=tool_invocations if tool_invocations else None,
+                tool_invocations=tool_invocations,
             )
 
-        except DirectAPIError as e:
-            raise LLMRequestFailedError(f"Direct API request failed: {e.message}", e.details) from e
         except Exception as e:
-            if _litellm_available and not self._use_direct_api:
-                # Handle LiteLLM exceptions
-                if hasattr(litellm, 'RateLimitError') and isinstance(e, litellm.RateLimitError):
-                    raise LLMRequestFailedError("LLM request failed: Rate limit exceeded", str(e)) from e
-                elif hasattr(litellm, 'AuthenticationError') and isinstance(e, litellm.AuthenticationError):
-                    raise LLMRequestFailedError("LLM request failed: Invalid API key", str(e)) from e
-                elif hasattr(litellm, 'NotFoundError') and isinstance(e, litellm.NotFoundError):
-                    raise LLMRequestFailedError("LLM request failed: Model not found", str(e)) from e
-                elif hasattr(litellm, 'ContextWindowExceededError') and isinstance(e, litellm.ContextWindowExceededError):
-                    raise LLMRequestFailedError("LLM request failed: Context too long", str(e)) from e
-                elif hasattr(litellm, 'ServiceUnavailableError') and isinstance(e, litellm.ServiceUnavailableError):
-                    raise LLMRequestFailedError("LLM request failed: Service unavailable", str(e)) from e
-                elif hasattr(litellm, 'Timeout') and isinstance(e, litellm.Timeout):
-                    raise LLMRequestFailedError("LLM request failed: Request timed out", str(e)) from e
-                elif hasattr(litellm, 'APIError') and isinstance(e, litellm.APIError):
-                    raise LLMRequestFailedError("LLM request failed: API error", str(e)) from e
-            raise LLMRequestFailedError(f"LLM request failed: {type(e).__name__}", str(e)) from e
+            raise self._request_failed(e) from e
 
     @property
     def usage_stats(self) -> dict[str, dict[str, int | float]]:
@@ -472,75 +575,57 @@ class LLM:
         }
 
     def get_cache_config(self) -> dict[str, bool]:
-        if self._use_direct_api:
-            return {
-                "enabled": False,
-                "supported": False,
-            }
         return {
             "enabled": self.config.enable_prompt_caching,
-            "supported": supports_prompt_caching(self.config.model_name) if _litellm_available else False,
+            "supported": self._supports_prompt_caching,
         }
 
     def _should_include_stop_param(self) -> bool:
-        if not self.config.model_name:
-            return True
-
-        return not model_matches(self.config.model_name, SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+        return self._include_stop
 
     def _should_include_reasoning_effort(self) -> bool:
-        if not self.config.model_name:
-            return False
-
-        return model_matches(self.config.model_name, REASONING_EFFORT_PATTERNS)
+        return self._include_reasoning
 
     def _model_supports_vision(self) -> bool:
-        if not self.config.model_name:
-            return False
-        try:
-            if self._use_direct_api:
-                return direct_supports_vision(self.config.model_name)
-            return bool(supports_vision(model=self.config.model_name)) if _litellm_available else False
-        except Exception:  # noqa: BLE001
-            return False
+        return self._supports_vision
 
     def _filter_images_from_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not any(isinstance(msg.get("content"), list) for msg in messages):
+            return messages
+
         filtered_messages = []
         for msg in messages:
             content = msg.get("content")
-            updated_msg = msg
-            if isinstance(content, list):
-                filtered_content = []
-                for item in content:
-                    if isinstance(item, dict):
-                        if item.get("type") == "image_url":
-                            filtered_content.append(
-                                {
-                                    "type": "text",
-                                    "text": "[Screenshot removed - model does not support "
-                                    "vision. Use view_source or execute_js instead.]",
-                                }
-                            )
-                        else:
-                            filtered_content.append(item)
-                    else:
-                        filtered_content.append(item)
-                if filtered_content:
-                    text_parts = [
-                        item.get("text", "") if isinstance(item, dict) else str(item)
-                        for item in filtered_content
-                    ]
-                    all_text = all(
-                        isinstance(item, dict) and item.get("type") == "text"
-                        for item in filtered_content
-                    )
-                    if all_text:
-                        updated_msg = {**msg, "content": "\n".join(text_parts)}
-                    else:
-                        updated_msg = {**msg, "content": filtered_content}
+            if not isinstance(content, list):
+                filtered_messages.append(msg)
+                continue
+
+            has_image = False
+            all_text = True
+            filtered_content: list[Any] = []
+            text_parts: list[str] = []
+            for item in content:
+                if isinstance(item, dict):
+                    item_type = item.get("type")
+                    if item_type == "image_url":
+                        has_image = True
+                        item = {"type": "text", "text": _IMAGE_REMOVED_TEXT}  # noqa: PLW2901
+                    elif item_type != "text":
+                        all_text = False
+                    text_parts.append(item.get("text", ""))
                 else:
-                    updated_msg = {**msg, "content": ""}
-            filtered_messages.append(updated_msg)
+                    all_text = False
+                    text_parts.append(str(item))
+                filtered_content.append(item)
+
+            if not filtered_content:
+                filtered_messages.append({**msg, "content": ""})
+            elif all_text:
+                filtered_messages.append({**msg, "content": "\n".join(text_parts)})
+            elif not has_image:
+                filtered_messages.append(msg)
+            else:
+                filtered_messages.append({**msg, "content": filtered_content})
         return filtered_messages
 
     async def _make_direct_request(
@@ -550,101 +635,100 @@ class LLM:
         """Make a request using the direct API client."""
         if not self._model_supports_vision():
             messages = self._filter_images_from_messages(messages)
-        
-        stop_param = ["</function>"] if self._should_include_stop_param() else None
-        
-        response = await self._direct_client.chat_completion_async(
-            messages=messages,
-            model=self.config.model_name,
-            stop=stop_param,
-        )
-        
+
+        if self.config.streaming_enabled:
+            # Stop reading once the last tool call _extract_tool_block keeps has closed
+            response = await self._direct_client.chat_completion_stream_async(
+                messages=messages,
+                model=self.config.model_name,
+                stop=self._stop_param,
+                cutoff="</function>",
+                cutoff_count=MAX_ACTIONS_PER_CALL,
+            )
+        else:
+            response = await self._direct_client.chat_completion_async(
+                messages=messages,
+                model=self.config.model_name,
+                stop=self._stop_param,
+            )
+
         self._total_stats.requests += 1
         self._last_request_stats = RequestStats(requests=1)
-        
+
         return response
 
     async def _make_request(
         self,
         messages: list[dict[str, Any]],
+        priority: int = DEFAULT_PRIORITY,
     ) -> Any:  # Returns ModelResponse when litellm is available
-        """Make a request using LiteLLM."""
+        """Make a request using LiteLLM; lower ``priority`` values get queue slots first."""
         if not _litellm_available:
             raise LLMRequestFailedError(
                 "LiteLLM is not available. Use direct API mode instead.",
                 "Install litellm or set STRIX_DIRECT_API_MODE=true"
             )
-            
+
+        queue = get_global_queue()
+        response = await queue.make_request(self._build_completion_args(messages), priority)
+
+        self._total_stats.requests += 1
+        self._last_request_stats = RequestStats(requests=1)
+
+        return response
+
+    def _build_completion_args(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
         if not self._model_supports_vision():
             messages = self._filter_images_from_messages(messages)
 
+        return {**self._completion_args_template, "messages": messages}
+
+    @cached_property
+    def _completion_args_template(self) -> dict[str, Any]:
+        """Every LiteLLM completion argument except messages; fixed per instance."""
         completion_args: dict[str, Any] = {
             "model": self.config.model_name,
-            "messages": messages,
             "timeout": self.config.timeout,
         }
 
         # Get credentials (lazily initialized from config.json or environment)
         api_key, api_base = _ensure_credentials()
-        
+
         if api_key:
             completion_args["api_key"] = api_key
         if api_base:
             completion_args["api_base"] = api_base
 
-        if self._should_include_stop_param():
-            completion_args["stop"] = ["</function>"]
+        if self._stop_param:
+            completion_args["stop"] = self._stop_param
 
         if self._should_include_reasoning_effort():
             completion_args["reasoning_effort"] = "high"
 
-        queue = get_global_queue()
-        response = await queue.make_request(completion_args)
-
-        self._total_stats.requests += 1
-        self._last_request_stats = RequestStats(requests=1)
+        # The response cache only keeps deterministic requests unless it caches everything
+        cache = get_global_queue().response_cache
+        if cache is not None and not cache.cache_all:
+            completion_args["temperature"] = 0
 
-        return response
+        return completion_args
 
     def _update_usage_stats(self, response: Any) -> None:
         try:
+            usage = getattr(response, "usage", None)
+            if usage:
+                if self._usage_extractor is None:
+                    self._usage_extractor = _select_usage_extractor(usage)
+                input_tokens, output_tokens, cached_tokens, cache_creation_tokens = (
+                    self._usage_extractor(usage)
+                )
+            else:
+                input_tokens = output_tokens = cached_tokens = cache_creation_tokens = 0
+
             if self._use_direct_api:
-                # Handle DirectAPIResponse
-                if hasattr(response, 'usage'):
-                    usage = response.usage
-                    input_tokens = usage.get("prompt_tokens", 0)
-                    output_tokens = usage.get("completion_tokens", 0)
-                else:
-                    input_tokens = 0
-                    output_tokens = 0
-                cached_tokens = 0
-                cache_creation_tokens = 0
                 cost = 0.0  # Direct API doesn't track cost
             else:
-                # Handle LiteLLM ModelResponse
-                if hasattr(response, "usage") and response.usage:
-                    input_tokens = getattr(response.usage, "prompt_tokens", 0)
-                    output_tokens = getattr(response.usage, "completion_tokens", 0)
-
-                    cached_tokens = 0
-                    cache_creation_tokens = 0
-
-                    if hasattr(response.usage, "prompt_tokens_details"):
-                        prompt_details = response.usage.prompt_tokens_details
-                        if hasattr(prompt_details, "cached_tokens"):
-                            cached_tokens = prompt_details.cached_tokens or 0
-
-                    if hasattr(response.usage, "cache_creation_input_tokens"):
-                        cache_creation_tokens = response.usage.cache_creation_input_tokens or 0
-
-                else:
-                    input_tokens = 0
-                    output_tokens = 0
-                    cached_tokens = 0
-                    cache_creation_tokens = 0
-
                 try:
-                    cost = completion_cost(response) or 0.0 if _litellm_available else 0.0
+                    cost = (completion_cost(response) or 0.0) if _litellm_available else 0.0
                 except Exception as e:  # noqa: BLE001
                     logger.warning(f"Failed to calculate cost: {e}")
                     cost = 0.0
@@ -668,6 +752,7 @@ class LLM:
             if not self._use_direct_api and cache_creation_tokens > 0:
                 logger.info(f"Cache creation: {cache_creation_tokens} tokens written to cache")
 
-            logger.info(f"Usage stats: {self.usage_stats}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Usage stats: %s", self.usage_stats)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Failed to update usage stats: {e}")
@@ -1,5 +1,6 @@
 import logging
 import os
+import re
 from typing import Any
 
 from strix.llm.direct_api import (
@@ -57,6 +58,25 @@ Provide a technically precise summary that preserves all operational security co
 keeping the summary concise and to the point."""
 
 
+# Independent chunks summarized together in one request
+MAX_SUMMARY_BATCH = 8
+MAX_SUMMARY_BATCH_TOKENS = 40_000
+
+BATCH_SUMMARY_PROMPT_TEMPLATE = (
+    SUMMARY_PROMPT_TEMPLATE.split("CONVERSATION SEGMENT TO SUMMARIZE:")[0]
+    + """There are {count} independent conversation segments below, each starting with a
+<<<QUERY n>>> line. Summarize each segment separately following the guidelines above.
+
+Output exactly {count} summaries, in order. Start each summary with a line containing only
+<<<SUMMARY n>>>, where n is the number of the segment it summarizes. Output nothing else.
+
+CONVERSATION SEGMENTS TO SUMMARIZE:
+{segments}"""
+)
+
+_SUMMARY_MARKER_RE = re.compile(r"^<<<SUMMARY (\d+)>>>[ \t]*$", re.MULTILINE)
+
+
 def _count_tokens(text: str, model: str) -> int:
     """Count tokens in text."""
     try:
@@ -100,6 +120,45 @@ def _extract_message_text(msg: dict[str, Any]) -> str:
     return str(content)
 
 
+def _format_conversation(messages: list[dict[str, Any]]) -> str:
+    formatted = []
+    for msg in messages:
+        role = msg.get("role", "unknown")
+        text = _extract_message_text(msg)
+        formatted.append(f"{role}: {text}")
+    return "\n".join(formatted)
+
+
+def _summary_message(messages: list[dict[str, Any]], summary: str) -> dict[str, Any]:
+    summary_msg = "<context_summary message_count='{count}'>{text}</context_summary>"
+    return {
+        "role": "assistant",
+        "content": summary_msg.format(count=len(messages), text=summary),
+    }
+
+
+def _complete(prompt: str, model: str, timeout: int) -> str:
+    """Run a single-prompt completion using either direct API or LiteLLM."""
+    if is_direct_api_mode() or not _litellm_available:
+        # Use direct API
+        client = get_direct_api_client()
+        response = client.chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+        )
+        return response.content or ""
+
+    # Use LiteLLM
+    completion_args = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "timeout": timeout,
+    }
+
+    response = litellm.completion(**completion_args)
+    return response.choices[0].message.content or ""
+
+
 def _summarize_messages(
     messages: list[dict[str, Any]],
     model: str,
@@ -113,47 +172,64 @@ def _summarize_messages(
             "content": empty_summary.format(text="No messages to summarize"),
         }
 
-    formatted = []
-    for msg in messages:
-        role = msg.get("role", "unknown")
-        text = _extract_message_text(msg)
-        formatted.append(f"{role}: {text}")
-
-    conversation = "\n".join(formatted)
-    prompt = SUMMARY_PROMPT_TEMPLATE.format(conversation=conversation)
+    prompt = SUMMARY_PROMPT_TEMPLATE.format(conversation=_format_conversation(messages))
 
     try:
-        if is_direct_api_mode() or not _litellm_available:
-            # Use direct API
-            client = get_direct_api_client()
-            response = client.chat_completion(
-                messages=[{"role": "user", "content": prompt}],
-                model=model,
-            )
-            summary = response.content or ""
-        else:
-            # Use LiteLLM
-            completion_args = {
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "timeout": timeout,
-            }
-
-            response = litellm.completion(**completion_args)
-            summary = response.choices[0].message.content or ""
-            
+        summary = _complete(prompt, model, timeout)
         if not summary.strip():
             return messages[0]
-        summary_msg = "<context_summary message_count='{count}'>{text}</context_summary>"
-        return {
-            "role": "assistant",
-            "content": summary_msg.format(count=len(messages), text=summary),
-        }
+        return _summary_message(messages, summary)
     except Exception:
         logger.exception("Failed to summarize messages")
         return messages[0]
 
 
+def _split_batch_summaries(text: str, count: int) -> list[str] | None:
+    """Split a batched summary response by its markers, or None if any is missing."""
+    summaries: dict[int, str] = {}
+    matches = list(_SUMMARY_MARKER_RE.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        summaries[int(match.group(1))] = text[match.end() : end].strip()
+
+    result = [summaries.get(i, "") for i in range(1, count + 1)]
+    if not all(result):
+        return None
+    return result
+
+
+def _summarize_message_batch(
+    chunks: list[list[dict[str, Any]]],
+    model: str,
+    timeout: int = 600,
+) -> list[dict[str, Any]]:
+    """Summarize several independent chunks with one LLM call.
+
+    The chunks share one copy of the summarization instructions. If the
+    response cannot be split back into one summary per chunk, each chunk is
+    summarized on its own instead.
+    """
+    if len(chunks) == 1:
+        return [_summarize_messages(chunks[0], model, timeout)]
+
+    segments = "\n\n".join(
+        f"<<<QUERY {i}>>>\n{_format_conversation(chunk)}" for i, chunk in enumerate(chunks, 1)
+    )
+    prompt = BATCH_SUMMARY_PROMPT_TEMPLATE.format(count=len(chunks), segments=segments)
+
+    try:
+        summaries = _split_batch_summaries(_complete(prompt, model, timeout), len(chunks))
+    except Exception:
+        logger.exception("Failed to summarize message batch")
+        summaries = None
+
+    if summaries is None:
+        return [_summarize_messages(chunk, model, timeout) for chunk in chunks]
+    return [
+        _summary_message(chunk, summary) for chunk, summary in zip(chunks, summaries, strict=True)
+    ]
+
+
 def _handle_images(messages: list[dict[str, Any]], max_images: int) -> None:
     image_count = 0
     for msg in reversed(messages):
@@ -172,6 +248,28 @@ def _handle_images(messages: list[dict[str, Any]], max_images: int) -> None:
                         image_count += 1
 
 
+def _batch_chunks(
+    chunks: list[list[dict[str, Any]]],
+    model: str,
+) -> list[list[list[dict[str, Any]]]]:
+    """Group chunks for batched summarization, bounded by count and token size."""
+    batches: list[list[list[dict[str, Any]]]] = []
+    batch: list[list[dict[str, Any]]] = []
+    batch_tokens = 0
+    for chunk in chunks:
+        chunk_tokens = sum(_get_message_tokens(msg, model) for msg in chunk)
+        batch_full = len(batch) >= MAX_SUMMARY_BATCH
+        if batch and (batch_full or batch_tokens + chunk_tokens > MAX_SUMMARY_BATCH_TOKENS):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(chunk)
+        batch_tokens += chunk_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class MemoryCompressor:
     def __init__(
         self,
@@ -204,6 +302,8 @@ class MemoryCompressor:
         - Critical security context in summaries
         - Recent images for visual context
         - Technical details and findings
+
+        Returns ``messages`` itself when no summarization was needed.
         """
         if not messages:
             return messages
@@ -231,12 +331,14 @@ class MemoryCompressor:
         if total_tokens <= MAX_TOTAL_TOKENS * 0.9:
             return messages
 
-        compressed = []
+        compressed: list[dict[str, Any]] = []
         chunk_size = 10
-        for i in range(0, len(old_msgs), chunk_size):
-            chunk = old_msgs[i : i + chunk_size]
-            summary = _summarize_messages(chunk, model_name, self.timeout)
-            if summary:
-                compressed.append(summary)
+        chunks = [old_msgs[i : i + chunk_size] for i in range(0, len(old_msgs), chunk_size)]
+        for batch in _batch_chunks(chunks, model_name):
+            compressed.extend(
+                summary
+                for summary in _summarize_message_batch(batch, model_name, self.timeout)
+                if summary
+            )
 
         return system_msgs + compressed + recent_msgs
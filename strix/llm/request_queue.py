@@ -1,16 +1,35 @@
 import asyncio
+import contextlib
+import hashlib
+import heapq
+import itertools
+import json
 import logging
 import os
+import random
+import re
 import threading
 import time
-from collections import deque
-from typing import Any
-
-from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, NamedTuple
 
 from strix.llm.direct_api import is_direct_api_mode
 
 
+__all__ = [
+    "DEFAULT_PRIORITY",
+    "INTERACTIVE_PRIORITY",
+    "LLMRequestQueue",
+    "LoopSafeSemaphore",
+    "RateLimiter",
+    "ResponseCache",
+    "get_global_queue",
+    "should_retry_exception",
+]
+
+
 logger = logging.getLogger(__name__)
 
 # Conditional import of litellm
@@ -25,10 +44,11 @@ except ImportError:
 
 
 class RateLimiter:
-    """Sliding window rate limiter for LLM requests.
+    """Token bucket rate limiter for LLM requests.
     
-    Implements a sliding window algorithm to enforce a maximum number of
-    requests per minute while allowing burst traffic when possible.
+    The bucket holds up to ``max_requests`` tokens and refills continuously at
+    ``max_requests`` per minute, so bursts up to the per-minute limit are
+    allowed while the sustained rate stays within it. Every call is O(1).
     """
     
     def __init__(self, max_requests_per_minute: int = 60):
@@ -40,9 +60,49 @@ class RateLimiter:
         """
         self.max_requests = max_requests_per_minute
         self.window_size = 60.0  # 60 seconds
-        self.request_timestamps: deque[float] = deque()
+        self.rate = max_requests_per_minute / self.window_size  # tokens per second
+        self.tokens = float(max_requests_per_minute)
+        self.last_refill = time.monotonic()
+        self.full_refill_at = 0.0  # Provider-announced quota reset, 0 when unknown
         self._lock = threading.Lock()
     
+    def _refill(self) -> float:
+        """Top up the bucket and return the available tokens. Call with the lock held."""
+        now = time.monotonic()
+        full_refill_at = self.full_refill_at
+        if full_refill_at and now >= full_refill_at:
+            tokens = float(self.max_requests)
+            self.full_refill_at = 0.0
+        else:
+            tokens = min(self.max_requests, self.tokens + (now - self.last_refill) * self.rate)
+        self.tokens = tokens
+        self.last_refill = now
+        return tokens
+
+    def _available_tokens(self) -> float:
+        with self._lock:
+            return self._refill()
+
+    def update_from_provider(self, remaining: float | None, reset_seconds: float | None) -> None:
+        """Align the bucket with the quota reported in provider rate limit headers.
+
+        Never grants more tokens than the local limit allows; the provider's
+        reset time, when given, refills the bucket completely.
+        """
+        with self._lock:
+            self._refill()
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+            if reset_seconds is not None:
+                self.full_refill_at = self.last_refill + reset_seconds
+
+    def on_rate_limited(self) -> None:
+        """Drain the bucket after a 429 so requests resume at the sustained rate."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+            self.full_refill_at = 0.0
+
     def acquire(self) -> float:
         """Acquire permission to make a request.
         
@@ -51,69 +111,251 @@ class RateLimiter:
             Returns 0 if the request can be made immediately.
         """
         with self._lock:
-            now = time.time()
-            window_start = now - self.window_size
-            
-            # Remove timestamps outside the window
-            while self.request_timestamps and self.request_timestamps[0] < window_start:
-                self.request_timestamps.popleft()
-            
-            # Check if we're at the limit
-            if len(self.request_timestamps) >= self.max_requests:
-                # Calculate wait time until the oldest request exits the window
-                oldest = self.request_timestamps[0]
-                wait_time = (oldest + self.window_size) - now + 0.1  # Add small buffer
-                return max(0.0, wait_time)
-            
-            # Record this request
-            self.request_timestamps.append(now)
-            return 0.0
+            tokens = self._refill()
+            if tokens >= 1:
+                self.tokens = tokens - 1
+                return 0.0
+            return (1 - tokens) / self.rate
     
     def get_current_rate(self) -> float:
         """Get the current request rate (requests per minute)."""
-        with self._lock:
-            now = time.time()
-            window_start = now - self.window_size
-            
-            # Count requests in the window
-            count = sum(1 for ts in self.request_timestamps if ts >= window_start)
-            return count
+        return self.max_requests - self._available_tokens()
     
     def get_remaining_capacity(self) -> int:
         """Get remaining request capacity in the current window."""
+        return int(self._available_tokens())
+
+
+class _ModelShard(NamedTuple):
+    """Rate limit and concurrency budget of one model."""
+
+    rate_limiter: "RateLimiter"
+    semaphore: "LoopSafeSemaphore"
+
+
+# Lower values are served first when requests queue for a concurrency slot
+INTERACTIVE_PRIORITY = 1
+DEFAULT_PRIORITY = 5
+
+
+class _Waiter:
+    __slots__ = ("future", "granted", "loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, future: "asyncio.Future[None]"):
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LoopSafeSemaphore:
+    """Async semaphore that can be shared by several event loops.
+
+    Sub-agents run their own event loops in separate threads, so an
+    asyncio.Semaphore (bound to a single loop) cannot enforce a process-wide
+    limit. Waiters park on a future of their own loop and are woken through
+    ``call_soon_threadsafe`` when a slot is released: no thread blocks and
+    nothing polls. Slots are handed to the waiter with the lowest priority
+    value first, in FIFO order among equal priorities.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: list[tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    async def acquire(self, priority: int = DEFAULT_PRIORITY) -> None:
+        loop = asyncio.get_running_loop()
         with self._lock:
-            now = time.time()
-            window_start = now - self.window_size
-            
-            # Count requests in the window
-            count = sum(1 for ts in self.request_timestamps if ts >= window_start)
-            return max(0, self.max_requests - count)
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = _Waiter(loop, loop.create_future())
+            entry = (priority, next(self._sequence), waiter)
+            heapq.heappush(self._waiters, entry)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            if granted:
+                # The slot was handed over while we were being cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                try:
+                    waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                except RuntimeError:
+                    continue  # The waiter's loop is closed
+                waiter.granted = True
+                return
+            self._value += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+# Rate limit headers, as returned by OpenAI-compatible providers; LiteLLM also
+# passes them through with an "llm_provider-" prefix
+_REMAINING_REQUESTS_HEADERS = (
+    "x-ratelimit-remaining-requests",
+    "llm_provider-x-ratelimit-remaining-requests",
+)
+_RESET_REQUESTS_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "llm_provider-x-ratelimit-reset-requests",
+)
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset_seconds(value: str) -> float | None:
+    """Parse a reset header: plain seconds or a duration such as "6m0s" or "20ms"."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _rate_limit_headers(response: Any) -> tuple[float | None, float | None]:
+    """Return (remaining requests, seconds until reset) from a LiteLLM response."""
+    hidden_params = getattr(response, "_hidden_params", None) or {}
+    headers = hidden_params.get("additional_headers") or {}
+    if not headers:
+        return None, None
+
+    remaining = reset = None
+    for name in _REMAINING_REQUESTS_HEADERS:
+        if headers.get(name) is not None:
+            with contextlib.suppress(TypeError, ValueError):
+                remaining = float(headers[name])
+            break
+    for name in _RESET_REQUESTS_HEADERS:
+        if headers.get(name) is not None:
+            reset = _parse_reset_seconds(str(headers[name]))
+            break
+    return remaining, reset
+
+
+def _status_code(exception: Exception) -> int | None:
+    status_code = getattr(exception, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exception, "response", None), "status_code", None)
+    return status_code
+
+
+_DEFAULT_RESPONSE_CACHE_DIR = Path.home() / ".cache" / "strix" / "llm_responses"
+
+MAX_ATTEMPTS = 5  # Increased from 3 to 5 attempts
+
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff before retry ``attempt + 1``: 2s, 4s, 8s, 16s (max 30s) plus up to 25% jitter.
+
+    The jitter keeps agents that failed together from retrying in lockstep.
+    """
+    return min(30.0, 2.0 * 2.0**attempt) * (1 + random.random() * 0.25)  # noqa: S311
+
+
+# litellm._should_retry decisions by HTTP status code
+_RETRY_BY_STATUS: dict[int, bool] = {}
 
 
 def should_retry_exception(exception: Exception) -> bool:
     """Determine if an exception should be retried."""
+    status_code = _status_code(exception)
+
     if not _litellm_available:
         # For direct API mode, always check error type
-        return hasattr(exception, 'status_code') and exception.status_code >= 500
-    
-    status_code = None
+        return status_code is not None and status_code >= 500
+
+    if status_code is None:
+        return True
+    should_retry = _RETRY_BY_STATUS.get(status_code)
+    if should_retry is None:
+        should_retry = _RETRY_BY_STATUS[status_code] = bool(litellm._should_retry(status_code))
+    return should_retry
+
+
+class ResponseCache:
+    """On-disk cache of LiteLLM responses keyed by a SHA-256 of the request.
+
+    Only deterministic requests (``temperature == 0``) are cached unless
+    ``cache_all`` is set; LLM sends ``temperature=0`` while the cache is on.
+    Entries are JSON files written atomically.
+    """
+
+    def __init__(self, directory: Path, cache_all: bool = False):
+        self.directory = directory
+        self.cache_all = cache_all
+
+    def key(self, completion_args: dict[str, Any]) -> str | None:
+        """Return the cache key for a request, or None if it must not be cached."""
+        if not self.cache_all and completion_args.get("temperature") != 0:
+            return None
+        payload = json.dumps(completion_args, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return ModelResponse(**data)
+
+    def put(self, key: str, response: Any) -> None:
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(response.model_dump_json(), encoding="utf-8")
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug("Could not cache LLM response: %s", e)
+            tmp_path.unlink(missing_ok=True)
+
 
-    if hasattr(exception, "status_code"):
-        status_code = exception.status_code
-    elif hasattr(exception, "response") and hasattr(exception.response, "status_code"):
-        status_code = exception.response.status_code
+def _load_env_defaults() -> dict[str, Any]:
+    """Read the queue limits, with environment variable overrides, once at import."""
+    return {
+        "max_concurrent": int(os.getenv("LLM_RATE_LIMIT_CONCURRENT") or 3),
+        "delay": float(os.getenv("LLM_RATE_LIMIT_DELAY") or 0.1),
+        "max_rpm": int(os.getenv("LLM_MAX_REQUESTS_PER_MINUTE") or 120),
+    }
 
-    if status_code is not None:
-        return bool(litellm._should_retry(status_code))
-    return True
+
+_ENV_DEFAULTS = _load_env_defaults()
 
 
 class LLMRequestQueue:
     """Request queue with rate limiting and concurrency control.
     
     This queue manages LLM API requests to:
-    1. Limit concurrent requests (default: 3 for better parallelism)
-    2. Enforce a rate limit (default: 120 requests/minute with CLIProxyAPI)
+    1. Limit concurrent requests per model (default: 3 for better parallelism)
+    2. Enforce a per-model rate limit (default: 120 requests/minute with CLIProxyAPI)
     3. Add minimal delay between requests (default: 0.1s for fast responses)
     
     OPTIMIZATIONS:
@@ -125,31 +367,39 @@ class LLMRequestQueue:
     
     def __init__(
         self,
-        max_concurrent: int = 3,  # Increased from 1 to 3 for parallel agents
-        delay_between_requests: float = 0.1,  # Reduced from 0.5s to 0.1s
-        max_requests_per_minute: int = 120,  # Increased from 60 (CLIProxyAPI load balances)
+        # Defaults: 3 concurrent (up from 1), 0.1s delay (down from 0.5s) and
+        # 120 RPM (up from 60, CLIProxyAPI load balances), unless overridden by
+        # LLM_RATE_LIMIT_CONCURRENT, LLM_RATE_LIMIT_DELAY and LLM_MAX_REQUESTS_PER_MINUTE
+        max_concurrent: int = _ENV_DEFAULTS["max_concurrent"],
+        delay_between_requests: float = _ENV_DEFAULTS["delay"],
+        max_requests_per_minute: int = _ENV_DEFAULTS["max_rpm"],
     ):
-        # Allow environment variable overrides
-        rate_limit_delay = os.getenv("LLM_RATE_LIMIT_DELAY")
-        if rate_limit_delay:
-            delay_between_requests = float(rate_limit_delay)
-
-        rate_limit_concurrent = os.getenv("LLM_RATE_LIMIT_CONCURRENT")
-        if rate_limit_concurrent:
-            max_concurrent = int(rate_limit_concurrent)
-        
-        rate_limit_max_rpm = os.getenv("LLM_MAX_REQUESTS_PER_MINUTE")
-        if rate_limit_max_rpm:
-            max_requests_per_minute = int(rate_limit_max_rpm)
-
         self.max_concurrent = max_concurrent
         self.delay_between_requests = delay_between_requests
-        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.max_requests_per_minute = max_requests_per_minute
+
+        # Optional response cache for repeated identical requests
+        self._response_cache: ResponseCache | None = None
+        if os.getenv("STRIX_LLM_CACHE_ENABLED", "false").lower() == "true":
+            self._response_cache = ResponseCache(
+                Path(os.getenv("STRIX_LLM_CACHE") or _DEFAULT_RESPONSE_CACHE_DIR),
+                cache_all=os.getenv("STRIX_LLM_CACHE_ALL", "false").lower() == "true",
+            )
+
         self._last_request_time = 0.0
         self._lock = threading.Lock()
         
-        # Rate limiter - increased limit since CLIProxyAPI load balances across accounts
-        self._rate_limiter = RateLimiter(max_requests_per_minute)
+        # Dedicated threads for blocking LiteLLM calls, shared by all agent loops,
+        # so bursts of retries do not starve the loops' default executors
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(32, max_concurrent * 4),
+            thread_name_prefix="strix-llm",
+        )
+
+        # Rate limiter and semaphore per model, so a slow model does not hold up
+        # requests for another; semaphores are shared by every agent thread's loop
+        self._shards: dict[str, _ModelShard] = {}
+        self._shards_lock = threading.Lock()
         
         # Request statistics
         self._total_requests = 0
@@ -160,15 +410,24 @@ class LLMRequestQueue:
             f"delay={delay_between_requests}s, max_rpm={max_requests_per_minute}"
         )
 
-    async def make_request(self, completion_args: dict[str, Any]) -> Any:
+    async def make_request(
+        self,
+        completion_args: dict[str, Any],
+        priority: int = DEFAULT_PRIORITY,
+    ) -> Any:
         """Make an LLM request with rate limiting and concurrency control.
         
         This method:
         1. Waits for rate limiter approval (max 60 req/min)
-        2. Acquires the concurrency semaphore
+        2. Acquires the concurrency semaphore; when requests are queued for
+           it, lower ``priority`` values go first (INTERACTIVE_PRIORITY for
+           calls a user is waiting on)
         3. Applies minimal delay between requests
         4. Makes the actual request with retry logic
         
+        With STRIX_LLM_CACHE_ENABLED=true, cacheable requests seen before are
+        answered from the response cache without any of the above.
+
         Returns ModelResponse when using LiteLLM, or dict for direct API.
         """
         if not _litellm_available:
@@ -176,82 +435,152 @@ class LLMRequestQueue:
                 "LiteLLM is not available. Use direct API mode by setting "
                 "STRIX_DIRECT_API_MODE=true"
             )
-            
+
+        cache = self._response_cache
+        cache_key = cache.key(completion_args) if cache else None
+        if cache and cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        shard = self._get_shard(completion_args.get("model", ""))
+        await self._wait_for_rate_limit(shard.rate_limiter)
+        await shard.semaphore.acquire(priority)
         try:
-            # Check rate limiter first
-            rate_wait = self._rate_limiter.acquire()
-            if rate_wait > 0:
-                logger.info(f"Rate limit reached, waiting {rate_wait:.1f}s...")
-                await asyncio.sleep(rate_wait)
-                # Re-acquire after waiting
-                self._rate_limiter.acquire()
-            
-            # Acquire semaphore for concurrency control
-            while not self._semaphore.acquire(timeout=0.2):
-                await asyncio.sleep(0.1)
-
-            # Apply minimal delay between requests
-            with self._lock:
-                now = time.time()
-                time_since_last = now - self._last_request_time
-                sleep_needed = max(0, self.delay_between_requests - time_since_last)
-                self._last_request_time = now + sleep_needed
-
-            if sleep_needed > 0:
-                self._total_wait_time += sleep_needed
-                await asyncio.sleep(sleep_needed)
-            
-            self._total_requests += 1
-            
-            # Log request stats periodically
-            if self._total_requests % 10 == 0:
-                current_rate = self._rate_limiter.get_current_rate()
-                capacity = self._rate_limiter.get_remaining_capacity()
-                logger.info(
-                    f"Request stats: total={self._total_requests}, "
-                    f"current_rate={current_rate}/min, remaining_capacity={capacity}"
-                )
-
-            return await self._reliable_request(completion_args)
+            await self._apply_request_delay()
+            self._record_request(shard.rate_limiter)
+            response = await self._reliable_request(completion_args)
         finally:
-            self._semaphore.release()
-    
+            shard.semaphore.release()
+
+        if cache and cache_key:
+            cache.put(cache_key, response)
+        return response
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """The on-disk response cache, or None unless STRIX_LLM_CACHE_ENABLED=true."""
+        return self._response_cache
+
+    def _get_shard(self, model: str) -> _ModelShard:
+        shard = self._shards.get(model)
+        if shard is None:
+            with self._shards_lock:
+                shard = self._shards.get(model)
+                if shard is None:
+                    shard = _ModelShard(
+                        RateLimiter(self._model_rpm(model)),
+                        LoopSafeSemaphore(self.max_concurrent),
+                    )
+                    self._shards[model] = shard
+        return shard
+
+    def _model_rpm(self, model: str) -> int:
+        """Per-model limit from LLM_RATE_LIMIT_<MODEL>_RPM, e.g. LLM_RATE_LIMIT_OPENAI_GPT_5_RPM."""
+        env_name = re.sub(r"[^A-Z0-9]+", "_", model.upper()).strip("_")
+        model_rpm = os.getenv(f"LLM_RATE_LIMIT_{env_name}_RPM") if env_name else None
+        return int(model_rpm) if model_rpm else self.max_requests_per_minute
+
+    async def _wait_for_rate_limit(self, rate_limiter: RateLimiter) -> None:
+        rate_wait = rate_limiter.acquire()
+        if rate_wait > 0:
+            logger.info("Rate limit reached, waiting %.1fs...", rate_wait)
+            await asyncio.sleep(rate_wait)
+            # Re-acquire after waiting
+            rate_limiter.acquire()
+
+    async def _apply_request_delay(self) -> None:
+        # Reserve the next free start slot so concurrent callers stay spaced out
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last_request_time + self.delay_between_requests)
+            self._last_request_time = slot
+        sleep_needed = slot - now
+
+        if sleep_needed > 0:
+            self._total_wait_time += sleep_needed
+            await asyncio.sleep(sleep_needed)
+
+    def _record_request(self, rate_limiter: RateLimiter) -> None:
+        self._total_requests += 1
+
+        # Log request stats periodically
+        if self._total_requests % 10 == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Request stats: total=%d, current_rate=%s/min, remaining_capacity=%d",
+                self._total_requests,
+                rate_limiter.get_current_rate(),
+                rate_limiter.get_remaining_capacity(),
+            )
+
     def get_stats(self) -> dict[str, Any]:
         """Get queue statistics."""
+        models = {
+            model: {
+                "current_rate": shard.rate_limiter.get_current_rate(),
+                "remaining_capacity": shard.rate_limiter.get_remaining_capacity(),
+            }
+            for model, shard in list(self._shards.items())
+        }
         return {
             "total_requests": self._total_requests,
             "total_wait_time": round(self._total_wait_time, 2),
-            "current_rate": self._rate_limiter.get_current_rate(),
-            "remaining_capacity": self._rate_limiter.get_remaining_capacity(),
+            "current_rate": sum(m["current_rate"] for m in models.values()),
+            "remaining_capacity": sum(m["remaining_capacity"] for m in models.values()),
+            "models": models,
         }
 
-    @retry(  # type: ignore[misc]
-        stop=stop_after_attempt(5),  # Increased from 3 to 5 attempts
-        wait=wait_exponential(multiplier=2, min=1, max=30),  # Faster retries: 1s, 2s, 4s, 8s, 16s
-        retry=retry_if_exception(should_retry_exception),
-        reraise=True,
-    )
     async def _reliable_request(self, completion_args: dict[str, Any]) -> Any:
         """Make a reliable request with retries."""
         if not _litellm_available:
             raise RuntimeError("LiteLLM not available")
-            
-        response = completion(**completion_args, stream=False)
-        if isinstance(response, ModelResponse):
-            return response
-        self._raise_unexpected_response()
-        raise RuntimeError("Unreachable code")
 
-    def _raise_unexpected_response(self) -> None:
-        raise RuntimeError("Unexpected response type")
+        for attempt in range(MAX_ATTEMPTS - 1):
+            try:
+                return await self._request_once(completion_args)
+            except Exception as e:
+                if not should_retry_exception(e):
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
+        return await self._request_once(completion_args)
+
+    async def _request_once(self, completion_args: dict[str, Any]) -> Any:
+        rate_limiter = self._get_shard(completion_args.get("model", "")).rate_limiter
+
+        # completion() blocks for the whole provider round trip; keep it off the loop
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(
+                self._executor, partial(completion, **completion_args, stream=False)
+            )
+        except Exception as e:
+            if _status_code(e) == 429:
+                rate_limiter.on_rate_limited()
+            raise
+
+        remaining, reset_seconds = _rate_limit_headers(response)
+        if remaining is not None or reset_seconds is not None:
+            rate_limiter.update_from_provider(remaining, reset_seconds)
+
+        # completion() always returns a ModelResponse when stream=False
+        return response
 
 
 _global_queue: LLMRequestQueue | None = None
+_global_queue_lock = threading.Lock()
 
 
 def get_global_queue() -> LLMRequestQueue:
-    """Get or create the global request queue."""
+    """Get or create the global request queue.
+
+    Agents in different threads may ask for it at the same time; the lock
+    makes sure they all share one queue (and its rate limit state).
+    """
     global _global_queue  # noqa: PLW0603
-    if _global_queue is None:
-        _global_queue = LLMRequestQueue()
-    return _global_queue
+    queue = _global_queue
+    if queue is None:
+        with _global_queue_lock:
+            if _global_queue is None:
+                _global_queue = LLMRequestQueue()
+            queue = _global_queue
+    return queue
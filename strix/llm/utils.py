@@ -3,6 +3,14 @@ import re
 from typing import Any
 
 
+_FUNCTION_OPEN = "<function="
+_FUNCTION_CLOSE = "</function>"
+_PARAMETER_OPEN = "<parameter="
+_PARAMETER_CLOSE = "</parameter>"
+
+MAX_ACTIONS_PER_CALL = 7
+
+
 def _truncate_to_first_function(content: str) -> str:
     """Legacy function - kept for compatibility but now allows multiple functions.
     
@@ -17,8 +25,6 @@ def _truncate_to_first_function(content: str) -> str:
     function_starts = [match.start() for match in re.finditer(r"<function=", content)]
     
     # Allow up to 7 function calls for multi-action efficiency
-    MAX_ACTIONS_PER_CALL = 7
-    
     if len(function_starts) > MAX_ACTIONS_PER_CALL:
         # Find the end of the 7th function call
         pattern = r"<function=([^>]+)>.*?</function>"
@@ -68,6 +74,66 @@ def _fix_stopword(content: str) -> str:
     return content
 
 
+def _scan_blocks(
+    content: str, open_tag: str, close_tag: str, limit: int | None = None
+) -> tuple[list[tuple[str, str]], int]:
+    """Find ``<tag=name>body</tag>`` blocks, returning them and the end of the last one."""
+    blocks: list[tuple[str, str]] = []
+    end = -1
+    pos = 0
+    while limit is None or len(blocks) < limit:
+        start = content.find(open_tag, pos)
+        if start == -1:
+            break
+        name_start = start + len(open_tag)
+        name_end = content.find(">", name_start)
+        if name_end == -1:
+            break
+        if name_end == name_start:
+            pos = start + 1
+            continue
+        close = content.find(close_tag, name_end + 1)
+        if close == -1:
+            break
+        blocks.append((content[name_start:name_end], content[name_end + 1 : close]))
+        end = close + len(close_tag)
+        pos = end
+    return blocks, end
+
+
+def _extract_tool_block(content: str) -> tuple[str, list[dict[str, Any]] | None]:
+    """Trim a response after its tool calls and parse them in one scan.
+
+    Same result as ``_truncate_to_first_function``, cutting at the last
+    ``</function>`` and ``parse_tool_invocations``, without the repeated
+    regex passes over the response.
+    """
+    if not content:
+        return content, None
+
+    open_count = content.count(_FUNCTION_OPEN)
+    limit = MAX_ACTIONS_PER_CALL if open_count > MAX_ACTIONS_PER_CALL else None
+    blocks, end = _scan_blocks(content, _FUNCTION_OPEN, _FUNCTION_CLOSE, limit)
+
+    if limit is not None and len(blocks) == limit:
+        content = content[:end]
+    else:
+        last_close = content.rfind(_FUNCTION_CLOSE)
+        if last_close != -1:
+            content = content[: last_close + len(_FUNCTION_CLOSE)]
+        elif open_count == 1:
+            blocks, _ = _scan_blocks(_fix_stopword(content), _FUNCTION_OPEN, _FUNCTION_CLOSE)
+
+    tool_invocations = []
+    for fn_name, fn_body in blocks:
+        body = fn_body.removeprefix("\n")
+        params, _ = _scan_blocks(body, _PARAMETER_OPEN, _PARAMETER_CLOSE)
+        args = {name: html.unescape(value.strip()) for name, value in params}
+        tool_invocations.append({"toolName": fn_name, "args": args})
+
+    return content, tool_invocations or None
+
+
 def format_tool_call(tool_name: str, args: dict[str, Any]) -> str:
     xml_parts = [f"<function={tool_name}>"]
 
@@ -18,6 +18,10 @@ NETWORKING (v2.1):
 Environment Variables:
 - STRIX_TOOL_EXECUTION_TIMEOUT: Timeout per tool execution (default: 60s)
 - STRIX_TOOL_POOL_SIZE: Number of concurrent tool workers (default: 10)
+- STRIX_MICRO_BATCH_MS: Window for grouping concurrent calls to the same sync
+  tool into one thread pool job (default: 0, disabled)
+- STRIX_BATCH_PARALLEL_THRESHOLD: Batches with at most this many thread pool
+  calls run them one after another in a single job (default: 0, disabled)
 - STRIX_SANDBOX_MODE: Must be "true" for this server to run
 """
 
@@ -25,17 +29,41 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import copy
+import hmac
+import inspect
+import json
 import logging
 import os
 import signal
 import sys
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, NamedTuple, TypedDict
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel, ValidationError
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter, ValidationError
+
+from strix.tools.argument_parser import ArgumentConversionError, build_argument_converter
+from strix.tools.registry import get_tool_by_name, get_tool_names, is_idempotent
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+    from types import ModuleType
+
+
+_orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # Part of the sandbox extra, optional elsewhere
+    _orjson = None
 
 
 SANDBOX_MODE = os.getenv("STRIX_SANDBOX_MODE", "false").lower() == "true"
@@ -43,6 +71,16 @@ SANDBOX_MODE = os.getenv("STRIX_SANDBOX_MODE", "false").lower() == "true"
 TOOL_EXECUTION_TIMEOUT = float(os.getenv("STRIX_TOOL_EXECUTION_TIMEOUT", "60"))
 # Number of concurrent tool workers (default: 10 for high parallelism)
 TOOL_POOL_SIZE = int(os.getenv("STRIX_TOOL_POOL_SIZE", "10"))
+# Batches with at most this many thread pool calls run them in one job (0 disables)
+BATCH_PARALLEL_THRESHOLD = int(os.getenv("STRIX_BATCH_PARALLEL_THRESHOLD", "0"))
+# Milliseconds to collect concurrent calls to the same sync tool (0 disables)
+MICRO_BATCH_MS = float(os.getenv("STRIX_MICRO_BATCH_MS", "0"))
+# Seconds between background network connectivity checks reported by /health
+NETWORK_CHECK_INTERVAL = 30.0
+# Seconds allowed for each DNS lookup or connection in the network check
+NETWORK_CHECK_TIMEOUT = 1.0
+# Seconds a successful DNS lookup in the network check is reused
+DNS_CACHE_TTL = 300.0
 
 if not SANDBOX_MODE:
     raise RuntimeError("Tool server should only run in sandbox mode (STRIX_SANDBOX_MODE=true)")
@@ -55,27 +93,22 @@ parser.add_argument("--port", type=int, required=True, help="Port to bind to")
 args = parser.parse_args()
 EXPECTED_TOKEN = args.token
 
-app = FastAPI(title="Strix Tool Server", version="2.0.0")
-security = HTTPBearer()
-security_dependency = Depends(security)
+_EXPECTED_TOKEN_BYTES = EXPECTED_TOKEN.encode()
 
-# Global thread pool for concurrent tool execution
-_tool_executor: ThreadPoolExecutor | None = None
-_registered_agents: set[str] = set()
+# Insertion-ordered set of agent IDs
+_registered_agents: dict[str, None] = {}
 
 # Pre-import tool modules for faster execution
 _tools_initialized = False
 
 
 def _initialize_tools() -> None:
-    """Pre-import tool modules for faster execution."""
+    """Check and log the tools registered when strix.tools was imported."""
     global _tools_initialized
     if _tools_initialized:
         return
     
     try:
-        # Import tool registry to ensure all tools are loaded
-        from strix.tools.registry import get_tool_names
         tool_count = len(get_tool_names())
         logging.getLogger(__name__).info(f"Initialized {tool_count} tools in tool server")
         _tools_initialized = True
@@ -83,137 +116,429 @@ def _initialize_tools() -> None:
         logging.getLogger(__name__).warning(f"Failed to pre-initialize tools: {e}")
 
 
-def get_executor() -> ThreadPoolExecutor:
-    """Get or create the thread pool executor."""
-    global _tool_executor
-    if _tool_executor is None:
-        _tool_executor = ThreadPoolExecutor(
-            max_workers=TOOL_POOL_SIZE,
-            thread_name_prefix="strix-tool-"
-        )
-        logging.getLogger(__name__).info(
-            f"Created tool executor with {TOOL_POOL_SIZE} workers"
-        )
-    return _tool_executor
+def _warm_tool_cache() -> None:
+    """Build the cached entry of every registered tool before serving requests."""
+    for tool_name in get_tool_names():
+        try:
+            _get_tool_entry(tool_name)
+        except ArgumentConversionError as e:
+            logging.getLogger(__name__).warning(f"Failed to prepare tool {tool_name}: {e}")
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials) -> str:
-    """Verify the authentication token."""
-    if not credentials or credentials.scheme != "Bearer":
+def verify_token(request: Request) -> None:
+    """Verify the Bearer token of a request in constant time."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication scheme. Bearer token required.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if credentials.credentials != EXPECTED_TOKEN:
+    if not hmac.compare_digest(token.encode(), _EXPECTED_TOKEN_BYTES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return credentials.credentials
 
+auth_dependency = Depends(verify_token)
+
+
+def _start_worker_threads(executor: ThreadPoolExecutor, count: int) -> None:
+    """Start every pool thread now instead of one per submission under load.
+
+    Each warm-up job blocks until all ``count`` of them run, which forces the
+    executor to create ``count`` threads.
+    """
+    barrier = threading.Barrier(count)
+    wait([executor.submit(barrier.wait, 5) for _ in range(count)])
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Load tools and the worker pool before the server accepts requests."""
+    _initialize_tools()
+    _warm_tool_cache()
+    # Thread pool for concurrent tool execution, read by the endpoints
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=TOOL_POOL_SIZE,
+        thread_name_prefix="strix-tool-"
+    )
+    _start_worker_threads(app.state.executor, TOOL_POOL_SIZE)
+    app.state.batch_parallel_threshold = BATCH_PARALLEL_THRESHOLD
+    app.state.micro_batcher = (
+        _MicroBatcher(asyncio.get_running_loop(), app.state.executor, MICRO_BATCH_MS / 1000)
+        if MICRO_BATCH_MS > 0
+        else None
+    )
+    logging.getLogger(__name__).info(f"Created tool executor with {TOOL_POOL_SIZE} workers")
+    network_task = asyncio.create_task(_refresh_network_status())
+    yield
+    network_task.cancel()
+    cleanup()
+
+
+app = FastAPI(title="Strix Tool Server", version="2.0.0", lifespan=lifespan)
 
-class ToolExecutionRequest(BaseModel):
-    """Request model for tool execution."""
+
+# Request bodies are TypedDicts: pydantic-core validates them straight into
+# plain dicts, skipping the model instance a BaseModel would build per request.
+class ToolExecutionRequest(TypedDict):
+    """Request body for tool execution."""
     agent_id: str
     tool_name: str
     kwargs: dict[str, Any]
 
 
-class ToolExecutionResponse(BaseModel):
-    """Response model for tool execution."""
-    result: Any | None = None
-    error: str | None = None
-
-
-class BatchToolExecutionRequest(BaseModel):
-    """Request model for batch tool execution (multiple tools at once)."""
+class BatchToolExecutionRequest(TypedDict):
+    """Request body for batch tool execution (multiple tools at once)."""
     agent_id: str
     tools: list[dict[str, Any]]  # Each item has tool_name and kwargs
 
 
-class BatchToolExecutionResponse(BaseModel):
-    """Response model for batch tool execution."""
-    results: list[ToolExecutionResponse]
+_tool_request_adapter = TypeAdapter(ToolExecutionRequest)
+_batch_request_adapter = TypeAdapter(BatchToolExecutionRequest)
+
+
+class ToolJSONResponse(JSONResponse):
+    """JSON response for tool results, serialized with orjson when it is installed.
+
+    The tool endpoints return this directly, so FastAPI skips its
+    jsonable_encoder pass; values the serializer does not know fall back to it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if _orjson is not None:
+            body: bytes = _orjson.dumps(
+                content,
+                default=jsonable_encoder,
+                option=_orjson.OPT_NON_STR_KEYS | _orjson.OPT_SERIALIZE_NUMPY,
+            )
+            return body
+        return json.dumps(
+            content, default=jsonable_encoder, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def _parse_body[RequestT](adapter: TypeAdapter[RequestT], body: bytes) -> RequestT:
+    """Validate a JSON request body in one pass, without decoding it to Python first.
 
+    Errors are reported like FastAPI's own body validation (422, ``loc`` starting
+    with ``"body"``), so clients see the same responses as with a Pydantic model.
+    """
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("body", *error["loc"])
+        raise RequestValidationError(errors, body=body) from e
+
+
+async def _tool_request(request: Request) -> ToolExecutionRequest:
+    return _parse_body(_tool_request_adapter, await request.body())
+
+
+async def _batch_request(request: Request) -> BatchToolExecutionRequest:
+    return _parse_body(_batch_request_adapter, await request.body())
+
+
+tool_request_dependency = Depends(_tool_request)
+batch_request_dependency = Depends(_batch_request)
+
+
+class _ToolEntry(NamedTuple):
+    """A registered tool with its argument converter, built once per tool."""
+    func: Callable[..., Any]
+    convert: Callable[[dict[str, Any]], dict[str, Any]]
+    is_async: bool
+    idempotent: bool
+
+
+_tool_entries: dict[str, _ToolEntry] = {}
+
+
+def _get_tool_entry(tool_name: str) -> _ToolEntry | None:
+    """Look up a tool, caching it together with its argument converter."""
+    entry = _tool_entries.get(tool_name)
+    if entry is None:
+        tool_func = get_tool_by_name(tool_name)
+        if not tool_func:
+            return None
+        entry = _ToolEntry(
+            tool_func,
+            build_argument_converter(tool_func),
+            inspect.iscoroutinefunction(tool_func),
+            is_idempotent(tool_name),
+        )
+        _tool_entries[tool_name] = entry
+    return entry
+
+
+# Converted arguments shared by the calls of one batch, keyed by tool and raw arguments.
+# Value types are part of the key, since 1, 1.0 and True are equal and hash alike.
+_Conversions = dict[tuple[str, frozenset[tuple[str, type, Any]]], dict[str, Any]]
+
+
+def _convert_kwargs(
+    entry: _ToolEntry,
+    tool_name: str,
+    kwargs: dict[str, Any],
+    conversions: _Conversions | None,
+) -> dict[str, Any]:
+    """Convert a call's arguments, reusing the result of an identical call in the batch."""
+    if conversions is None:
+        return entry.convert(kwargs)
+    try:
+        key = (tool_name, frozenset((name, type(value), value) for name, value in kwargs.items()))
+    except TypeError:  # Unhashable argument values
+        return entry.convert(kwargs)
+    converted = conversions.get(key)
+    if converted is None:
+        converted = conversions[key] = entry.convert(kwargs)
+    # Tools may modify list and dict arguments, so every call gets its own copies
+    return {
+        name: copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+        for name, value in converted.items()
+    }
 
-def _execute_tool_sync(tool_name: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+
+def _execute_tool_sync(
+    tool_name: str,
+    kwargs: dict[str, Any],
+    conversions: _Conversions | None = None,
+) -> dict[str, Any]:
     """Synchronously execute a tool (runs in thread pool).
     
     This function is designed to be run in a thread pool executor for
     concurrent execution of multiple tools.
     """
     try:
-        from strix.tools.argument_parser import ArgumentConversionError, convert_arguments
-        from strix.tools.registry import get_tool_by_name
-
-        tool_func = get_tool_by_name(tool_name)
-        if not tool_func:
+        entry = _get_tool_entry(tool_name)
+        if entry is None:
             return {"error": f"Tool '{tool_name}' not found"}
 
-        converted_kwargs = convert_arguments(tool_func, kwargs)
-        result = tool_func(**converted_kwargs)
+        result = entry.func(**_convert_kwargs(entry, tool_name, kwargs, conversions))
 
         return {"result": result}
 
-    except (ArgumentConversionError, ValidationError) as e:
-        return {"error": f"Invalid arguments: {e}"}
     except Exception as e:
         # Catch all exceptions to prevent thread crashes
-        return {"error": f"Tool execution error: {type(e).__name__}: {str(e)}"}
+        return _tool_error(e)
+
+
+async def _execute_tool_async(
+    entry: _ToolEntry,
+    tool_name: str,
+    kwargs: dict[str, Any],
+    conversions: _Conversions | None = None,
+) -> dict[str, Any]:
+    """Execute a coroutine tool directly on the event loop."""
+    try:
+        converted = _convert_kwargs(entry, tool_name, kwargs, conversions)
+        return {"result": await entry.func(**converted)}
+    except Exception as e:  # noqa: BLE001
+        # Like _execute_tool_sync, any tool failure becomes an error response
+        return _tool_error(e)
+
+
+def _tool_error(e: Exception) -> dict[str, Any]:
+    if isinstance(e, (ArgumentConversionError, ValidationError)):
+        return {"error": f"Invalid arguments: {e}"}
+    return {"error": f"Tool execution error: {type(e).__name__}: {str(e)}"}
+
+
+def _start_tool(
+    loop: asyncio.AbstractEventLoop,
+    executor: ThreadPoolExecutor,
+    tool_name: str,
+    kwargs: dict[str, Any],
+    conversions: _Conversions | None = None,
+) -> Awaitable[dict[str, Any]]:
+    """Start a tool: coroutine tools run on the loop, the rest in the thread pool."""
+    try:
+        entry = _get_tool_entry(tool_name)
+    except ArgumentConversionError:
+        entry = None  # _execute_tool_sync reports the error
+    if entry is not None and entry.is_async:
+        return asyncio.ensure_future(_execute_tool_async(entry, tool_name, kwargs, conversions))
+    micro_batcher: _MicroBatcher | None = app.state.micro_batcher
+    if micro_batcher is not None:
+        return micro_batcher.submit(tool_name, kwargs)
+    return loop.run_in_executor(executor, _execute_tool_sync, tool_name, kwargs, conversions)
+
+
+class _MicroBatcher:
+    """Collects concurrent calls to the same sync tool during a short window.
+
+    When the window closes, each tool's calls run one after another in a single
+    thread pool job, so a burst of quick calls costs one pool handoff instead of
+    one per call.
+    """
 
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+        window: float,
+    ) -> None:
+        self._loop = loop
+        self._executor = executor
+        self._window = window
+        # Calls waiting for the current window to close, grouped by tool
+        self._pending: dict[str, list[tuple[dict[str, Any], asyncio.Future[dict[str, Any]]]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def submit(self, tool_name: str, kwargs: dict[str, Any]) -> asyncio.Future[dict[str, Any]]:
+        """Queue a call to run with the other calls to that tool in this window."""
+        future: asyncio.Future[dict[str, Any]] = self._loop.create_future()
+        self._pending.setdefault(tool_name, []).append((kwargs, future))
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Submit one thread pool job per tool for the calls queued in this window."""
+        self._flush_handle = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        for tool_name, calls in pending:
+            futures = [future for _, future in calls]
+            try:
+                job = self._loop.run_in_executor(
+                    self._executor, _run_sync_calls, tool_name, [kwargs for kwargs, _ in calls]
+                )
+            except RuntimeError as e:  # Executor already shut down
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            job.add_done_callback(partial(_resolve_pending_calls, futures))
+
+
+def _run_sync_calls(tool_name: str, calls: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [_execute_tool_sync(tool_name, kwargs) for kwargs in calls]
+
+
+def _resolve_pending_calls(
+    futures: list[asyncio.Future[dict[str, Any]]],
+    job: asyncio.Future[list[dict[str, Any]]],
+) -> None:
+    error = None if job.cancelled() else job.exception()
+    for i, future in enumerate(futures):
+        if future.done():
+            continue
+        if job.cancelled():
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(job.result()[i])
+
+
+def _uses_thread_pool(tool_name: str) -> bool:
+    """Whether _start_tool would run this tool in the shared thread pool."""
+    try:
+        entry = _get_tool_entry(tool_name)
+    except ArgumentConversionError:
+        return True
+    if entry is None:
+        return True
+    return not entry.is_async
+
+
+def _start_batch(
+    loop: asyncio.AbstractEventLoop,
+    executor: ThreadPoolExecutor,
+    calls: list[tuple[str, dict[str, Any]]],
+    conversions: _Conversions | None = None,
+    parallel_threshold: int = 0,
+) -> list[Awaitable[dict[str, Any]]]:
+    """Start the calls of a batch, running few thread pool calls as one serial job.
+
+    With at most ``parallel_threshold`` thread pool calls, a single pool job
+    runs them in order; other calls start as usual.
+    """
+    serial = [i for i, (tool_name, _) in enumerate(calls) if _uses_thread_pool(tool_name)]
+    if not 0 < len(serial) <= parallel_threshold:
+        return [
+            _start_tool(loop, executor, tool_name, kwargs, conversions)
+            for tool_name, kwargs in calls
+        ]
 
-@app.post("/execute", response_model=ToolExecutionResponse)
+    started: list[Awaitable[dict[str, Any]]] = []
+    futures: list[asyncio.Future[dict[str, Any]]] = []
+    serial_set = set(serial)
+    for i, (tool_name, kwargs) in enumerate(calls):
+        if i in serial_set:
+            future: asyncio.Future[dict[str, Any]] = loop.create_future()
+            futures.append(future)
+            started.append(future)
+        else:
+            started.append(_start_tool(loop, executor, tool_name, kwargs, conversions))
+    job = loop.run_in_executor(
+        executor, _run_sync_batch, [calls[i] for i in serial], conversions
+    )
+    job.add_done_callback(partial(_resolve_pending_calls, futures))
+    return started
+
+
+def _run_sync_batch(
+    calls: list[tuple[str, dict[str, Any]]],
+    conversions: _Conversions | None = None,
+) -> list[dict[str, Any]]:
+    return [_execute_tool_sync(tool_name, kwargs, conversions) for tool_name, kwargs in calls]
+
+
+def _dedup_key(tool_name: str, kwargs: dict[str, Any]) -> tuple[str, str] | None:
+    """Key identical calls to an idempotent tool, or None if the call must run itself."""
+    try:
+        entry = _get_tool_entry(tool_name)
+    except ArgumentConversionError:
+        return None
+    if entry is None or not entry.idempotent:
+        return None
+    return tool_name, json.dumps(kwargs, sort_keys=True, default=str)
+
+
+@app.post("/execute", response_model=None)
 async def execute_tool(
-    request: ToolExecutionRequest,
-    credentials: HTTPAuthorizationCredentials = security_dependency
-) -> ToolExecutionResponse:
+    _auth: None = auth_dependency,
+    request: ToolExecutionRequest = tool_request_dependency,
+) -> ToolJSONResponse:
     """Execute a single tool.
     
     This endpoint supports concurrent execution - multiple requests can be
-    processed simultaneously through the thread pool.
+    processed simultaneously through the thread pool. Coroutine tools are
+    awaited on the event loop instead of taking a pool thread.
+
+    Returns {"result": ...} on success or {"error": "..."} on failure.
     """
-    verify_token(credentials)
-    
-    # Ensure tools are initialized
-    _initialize_tools()
-    
-    executor = get_executor()
-    loop = asyncio.get_event_loop()
+    executor = app.state.executor
+    loop = asyncio.get_running_loop()
 
     try:
-        # Execute tool in thread pool with timeout
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                executor,
-                _execute_tool_sync,
-                request.tool_name,
-                request.kwargs
-            ),
-            timeout=TOOL_EXECUTION_TIMEOUT
-        )
-
-        if "error" in response:
-            return ToolExecutionResponse(error=response["error"])
-        return ToolExecutionResponse(result=response.get("result"))
-
-    except asyncio.TimeoutError:
-        return ToolExecutionResponse(
-            error=f"Tool execution timed out after {TOOL_EXECUTION_TIMEOUT}s. "
-                  f"The tool '{request.tool_name}' may be hanging or taking too long."
-        )
+        # Execute tool with timeout
+        async with asyncio.timeout(TOOL_EXECUTION_TIMEOUT):
+            result = await _start_tool(loop, executor, request["tool_name"], request["kwargs"])
+        return ToolJSONResponse(result)
+
+    except TimeoutError:
+        return ToolJSONResponse({
+            "error": f"Tool execution timed out after {TOOL_EXECUTION_TIMEOUT}s. "
+                     f"The tool '{request['tool_name']}' may be hanging or taking too long."
+        })
     except Exception as e:
-        return ToolExecutionResponse(error=f"Execution error: {type(e).__name__}: {str(e)}")
+        return ToolJSONResponse({"error": f"Execution error: {type(e).__name__}: {str(e)}"})
 
 
-@app.post("/execute_batch", response_model=BatchToolExecutionResponse)
+@app.post("/execute_batch", response_model=None)
 async def execute_tools_batch(
-    request: BatchToolExecutionRequest,
-    credentials: HTTPAuthorizationCredentials = security_dependency
-) -> BatchToolExecutionResponse:
+    _auth: None = auth_dependency,
+    request: BatchToolExecutionRequest = batch_request_dependency,
+) -> ToolJSONResponse:
     """Execute multiple tools concurrently.
     
     This endpoint enables true parallel execution of multiple tools,
@@ -228,133 +553,163 @@ async def execute_tools_batch(
             {"tool_name": "screenshot", "kwargs": {}}
         ]
     }
+
+    Returns {"results": [...]} with one /execute-style response per tool.
     """
-    verify_token(credentials)
-    
-    # Ensure tools are initialized
-    _initialize_tools()
-    
-    if not request.tools:
-        return BatchToolExecutionResponse(results=[])
+    if not request["tools"]:
+        return ToolJSONResponse({"results": []})
     
-    executor = get_executor()
-    loop = asyncio.get_event_loop()
+    executor = app.state.executor
+    loop = asyncio.get_running_loop()
     
-    # Create tasks for all tools
-    tasks = []
-    for tool_spec in request.tools:
+    # Collect the calls to start; identical idempotent calls share one task
+    calls: list[tuple[str, dict[str, Any]]] = []
+    call_index: list[int] = []
+    seen: dict[tuple[str, str], int] = {}
+    for tool_spec in request["tools"]:
         tool_name = tool_spec.get("tool_name", "")
         kwargs = tool_spec.get("kwargs", {})
         
-        task = loop.run_in_executor(
-            executor,
-            _execute_tool_sync,
-            tool_name,
-            kwargs
-        )
-        tasks.append(task)
+        key = _dedup_key(tool_name, kwargs)
+        if key is not None and key in seen:
+            call_index.append(seen[key])
+            continue
+        if key is not None:
+            seen[key] = len(calls)
+        call_index.append(len(calls))
+        calls.append((tool_name, kwargs))
+
+    # Repeated calls with the same arguments convert them only once per batch
+    conversions: _Conversions | None = {} if len(calls) > 1 else None
+    started = _start_batch(loop, executor, calls, conversions, app.state.batch_parallel_threshold)
+    tasks = [started[i] for i in call_index]
     
     # Execute all tools concurrently with overall timeout
     overall_timeout = TOOL_EXECUTION_TIMEOUT * 2  # Allow more time for batches
     
     try:
-        results = await asyncio.wait_for(
-            asyncio.gather(*tasks, return_exceptions=True),
-            timeout=overall_timeout
-        )
+        async with asyncio.timeout(overall_timeout):
+            results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Convert results to response format
-        responses = []
+        responses: list[dict[str, Any] | None] = [None] * len(results)
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                responses.append(ToolExecutionResponse(
-                    error=f"Tool execution error: {type(result).__name__}: {str(result)}"
-                ))
+                responses[i] = {
+                    "error": f"Tool execution error: {type(result).__name__}: {str(result)}"
+                }
             elif isinstance(result, dict):
-                if "error" in result:
-                    responses.append(ToolExecutionResponse(error=result["error"]))
-                else:
-                    responses.append(ToolExecutionResponse(result=result.get("result")))
+                responses[i] = result
             else:
-                responses.append(ToolExecutionResponse(error="Unexpected result type"))
+                responses[i] = {"error": "Unexpected result type"}
         
-        return BatchToolExecutionResponse(results=responses)
+        return ToolJSONResponse({"results": responses})
         
-    except asyncio.TimeoutError:
-        return BatchToolExecutionResponse(results=[
-            ToolExecutionResponse(error=f"Batch execution timed out after {overall_timeout}s")
-        ])
+    except TimeoutError:
+        return ToolJSONResponse(
+            {"results": [{"error": f"Batch execution timed out after {overall_timeout}s"}]}
+        )
 
 
 @app.post("/register_agent")
 async def register_agent(
     agent_id: str,
-    credentials: HTTPAuthorizationCredentials = security_dependency
+    _auth: None = auth_dependency,
 ) -> dict[str, str]:
     """Register an agent with the tool server.
     
     This is now a lightweight operation since we don't create per-agent
     worker processes anymore.
     """
-    verify_token(credentials)
-    
     # Initialize tools on first agent registration
     _initialize_tools()
     
-    _registered_agents.add(agent_id)
+    _registered_agents[agent_id] = None
     return {"status": "registered", "agent_id": agent_id}
 
 
-def _check_network_connectivity() -> dict[str, Any]:
+async def _resolve_host(host: str) -> None:
+    """Resolve a hostname, reusing a successful lookup for DNS_CACHE_TTL seconds."""
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    if _dns_cache.get(host, 0.0) > now:
+        return
+    async with asyncio.timeout(NETWORK_CHECK_TIMEOUT):
+        await loop.getaddrinfo(host, None)
+    _dns_cache[host] = now + DNS_CACHE_TTL
+
+
+async def _check_network_connectivity() -> dict[str, Any]:
     """Check network connectivity from inside the sandbox container."""
-    import socket
-    import subprocess
-    
-    network_status = {
-        "dns_resolution": False,
-        "external_connectivity": False,
-        "localhost_accessible": True,  # Assume true if we're running
-        "issues": [],
-    }
+    issues: list[str] = []
     
     # Check DNS resolution
+    dns_resolution = False
     try:
-        socket.gethostbyname("google.com")
-        network_status["dns_resolution"] = True
-    except socket.gaierror as e:
-        network_status["issues"].append(f"DNS resolution failed: {e}")
+        await _resolve_host("google.com")
+        dns_resolution = True
+    except TimeoutError:
+        issues.append("DNS resolution failed: timed out")
+    except OSError as e:
+        issues.append(f"DNS resolution failed: {e}")
     
     # Check external connectivity
+    external_connectivity = False
     try:
         # Try to connect to a known public IP
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5)
-        result = sock.connect_ex(("8.8.8.8", 53))  # Google DNS
-        if result == 0:
-            network_status["external_connectivity"] = True
-        sock.close()
-    except (socket.error, OSError) as e:
-        network_status["issues"].append(f"External connectivity failed: {e}")
+        async with asyncio.timeout(NETWORK_CHECK_TIMEOUT):
+            _, writer = await asyncio.open_connection("8.8.8.8", 53)  # Google DNS
+        writer.close()
+        external_connectivity = True
+    except TimeoutError:
+        issues.append("External connectivity failed: timed out")
+    except OSError as e:
+        issues.append(f"External connectivity failed: {e}")
     
     # Check if we can resolve the host gateway (for reaching host services)
     try:
-        socket.gethostbyname("host.docker.internal")
-        network_status["host_gateway_available"] = True
-    except socket.gaierror:
-        network_status["host_gateway_available"] = False
+        await _resolve_host("host.docker.internal")
+        host_gateway_available = True
+    except OSError:
+        host_gateway_available = False
         # Not an error in host network mode
     
-    return network_status
+    return {
+        "checked": True,
+        "dns_resolution": dns_resolution,
+        "external_connectivity": external_connectivity,
+        "localhost_accessible": True,  # Assume true if we're running
+        "issues": issues,
+        "host_gateway_available": host_gateway_available,
+    }
+
+
+# Hostname -> loop time until which its last successful lookup is reused
+_dns_cache: dict[str, float] = {}
+
+# Latest network diagnostics, refreshed in the background so /health never blocks
+_network_status: dict[str, Any] = {"checked": False}
+
+
+async def _refresh_network_status() -> None:
+    """Re-run the network connectivity check every NETWORK_CHECK_INTERVAL seconds."""
+    global _network_status
+    while True:
+        try:
+            _network_status = await _check_network_connectivity()
+        except Exception as e:  # noqa: BLE001
+            # The check keeps running whatever goes wrong in one round
+            logging.getLogger(__name__).warning(f"Network connectivity check failed: {e}")
+        await asyncio.sleep(NETWORK_CHECK_INTERVAL)
 
 
 @app.get("/health")
 async def health_check() -> dict[str, Any]:
-    """Health check endpoint with network diagnostics."""
-    executor = get_executor()
-    
-    # Check network connectivity
-    network_status = _check_network_connectivity()
+    """Health check endpoint with network diagnostics.
     
+    The network status is the result of the latest background check, at most
+    NETWORK_CHECK_INTERVAL seconds old.
+    """
     return {
         "status": "healthy",
         "version": "2.1.0",  # Updated version with network diagnostics
@@ -364,35 +719,32 @@ async def health_check() -> dict[str, Any]:
         "pool_size": TOOL_POOL_SIZE,
         "tool_timeout": TOOL_EXECUTION_TIMEOUT,
         "registered_agents": len(_registered_agents),
-        "agents": list(_registered_agents),
         "tools_initialized": _tools_initialized,
-        "network": network_status,
+        "network": _network_status,
     }
 
 
 @app.get("/stats")
 async def get_stats(
-    credentials: HTTPAuthorizationCredentials = security_dependency
+    _auth: None = auth_dependency,
 ) -> dict[str, Any]:
-    """Get execution statistics."""
-    verify_token(credentials)
-    
+    """Get execution statistics, including the registered agent IDs."""
     return {
         "pool_size": TOOL_POOL_SIZE,
         "tool_timeout": TOOL_EXECUTION_TIMEOUT,
         "registered_agents": len(_registered_agents),
+        "agents": list(_registered_agents),
         "tools_initialized": _tools_initialized,
     }
 
 
 def cleanup() -> None:
     """Cleanup resources on shutdown."""
-    global _tool_executor
-    
-    if _tool_executor is not None:
+    executor: ThreadPoolExecutor | None = getattr(app.state, "executor", None)
+    if executor is not None:
         logging.getLogger(__name__).info("Shutting down tool executor...")
-        _tool_executor.shutdown(wait=True, cancel_futures=True)
-        _tool_executor = None
+        executor.shutdown(wait=True, cancel_futures=True)
+        app.state.executor = None
     
     logging.getLogger(__name__).info("Tool server cleanup complete")
 
@@ -421,6 +773,8 @@ if __name__ == "__main__":
         logging.getLogger(__name__).info(
             f"Pool size: {TOOL_POOL_SIZE}, Timeout: {TOOL_EXECUTION_TIMEOUT}s"
         )
-        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+        # uvicorn picks uvloop and httptools automatically when they are installed;
+        # per-request access logs are skipped since every caller is the Strix host
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info", access_log=False)
     finally:
         cleanup()
@@ -32,6 +32,8 @@ class Tracer:
 
         self.agents: dict[str, dict[str, Any]] = {}
         self.tool_executions: dict[int, dict[str, Any]] = {}
+        # Execution IDs per agent, including agents logged after their first tool call
+        self._tool_ids_by_agent: dict[str, list[int]] = {}
         self.chat_messages: list[dict[str, Any]] = []
 
         self.vulnerability_reports: list[dict[str, Any]] = []
@@ -177,6 +179,7 @@ class Tracer:
         }
 
         self.tool_executions[execution_id] = execution_data
+        self._tool_ids_by_agent.setdefault(agent_id, []).append(execution_id)
 
         if agent_id in self.agents:
             self.agents[agent_id]["tool_executions"].append(execution_id)
@@ -332,9 +335,8 @@ class Tracer:
 
     def get_agent_tools(self, agent_id: str) -> list[dict[str, Any]]:
         return [
-            exec_data
-            for exec_data in self.tool_executions.values()
-            if exec_data.get("agent_id") == agent_id
+            self.tool_executions[execution_id]
+            for execution_id in self._tool_ids_by_agent.get(agent_id, ())
         ]
 
     def get_real_tool_count(self) -> int:
@@ -26,47 +26,49 @@ HAS_PERPLEXITY_API = bool(os.getenv("PERPLEXITY_API_KEY"))
 
 DISABLE_BROWSER = os.getenv("STRIX_DISABLE_BROWSER", "false").lower() == "true"
 
+# Tool modules are imported for their @register_tool side effects. Importing the
+# modules themselves avoids copying every public name into this namespace.
 if not SANDBOX_MODE:
-    from .agents_graph import *  # noqa: F403
+    from . import agents_graph  # noqa: F401
 
     if not DISABLE_BROWSER:
-        from .browser import *  # noqa: F403
-    from .file_edit import *  # noqa: F403
-    from .finish import *  # noqa: F403
-    from .notes import *  # noqa: F403
-    from .proxy import *  # noqa: F403
-    from .python import *  # noqa: F403
-    from .reporting import *  # noqa: F403
-    from .terminal import *  # noqa: F403
-    from .thinking import *  # noqa: F403
-    from .todo import *  # noqa: F403
-    
+        from . import browser
+    from . import file_edit
+    from . import finish  # noqa: F401
+    from . import notes  # noqa: F401
+    from . import proxy
+    from . import python
+    from . import reporting  # noqa: F401
+    from . import terminal
+    from . import thinking  # noqa: F401
+    from . import todo  # noqa: F401
+
     # New enhanced modules
-    from .root_terminal import *  # noqa: F403
-    from .custom_agents import *  # noqa: F403
-    from .knowledge import *  # noqa: F403
-    from .orchestration import *  # noqa: F403
-    
+    from . import root_terminal
+    from . import custom_agents  # noqa: F401
+    from . import knowledge  # noqa: F401
+    from . import orchestration  # noqa: F401
+
     # CVE/Exploit Database Integration
-    from .cve_database import *  # noqa: F403
-    
+    from . import cve_database  # noqa: F401
+
     # Multi-Agent Collaboration Protocol
-    from .collaboration import *  # noqa: F403
-    
+    from . import collaboration  # noqa: F401
+
     # StrixDB - Permanent GitHub Knowledge Repository
-    from .strixdb import *  # noqa: F403
+    from . import strixdb  # noqa: F401
 
     # Web Search - Multiple providers with automatic fallback
     # Always available (DuckDuckGo as free fallback, premium providers if API keys set)
-    from .web_search import *  # noqa: F403
+    from . import web_search  # noqa: F401
 else:
     if not DISABLE_BROWSER:
-        from .browser import *  # noqa: F403
-    from .file_edit import *  # noqa: F403
-    from .proxy import *  # noqa: F403
-    from .python import *  # noqa: F403
-    from .terminal import *  # noqa: F403
-    from .root_terminal import *  # noqa: F403
+        from . import browser  # noqa: F401
+    from . import file_edit  # noqa: F401
+    from . import proxy  # noqa: F401
+    from . import python  # noqa: F401
+    from . import terminal  # noqa: F401
+    from . import root_terminal  # noqa: F401
 
 __all__ = [
     "ImplementedInClientSideOnlyError",
@@ -1,10 +1,15 @@
+import logging
 import threading
 from datetime import UTC, datetime
 from typing import Any, Literal
 
+from strix.llm.direct_api import DirectAPIClient
+from strix.tools.executor import aclose_sandbox_client
 from strix.tools.registry import register_tool
 
 
+logger = logging.getLogger(__name__)
+
 _agent_graph: dict[str, Any] = {
     "nodes": {},
     "edges": [],
@@ -21,6 +26,12 @@ _agent_instances: dict[str, Any] = {}
 _agent_states: dict[str, Any] = {}
 
 
+async def close_loop_clients() -> None:
+    """Close the pooled HTTP clients opened on the running loop; call before closing it."""
+    await aclose_sandbox_client()
+    await DirectAPIClient.aclose_shared_async_clients()
+
+
 def _run_agent_in_thread(
     agent: Any, state: Any, inherited_messages: list[dict[str, Any]]
 ) -> dict[str, Any]:
@@ -80,15 +91,21 @@ def _run_agent_in_thread(
         try:
             result = loop.run_until_complete(agent.agent_loop(state.task))
         finally:
-            loop.close()
+            try:
+                loop.run_until_complete(close_loop_clients())
+            finally:
+                loop.close()
 
     except Exception as e:
+        # Nothing joins agent threads, so record the failure here instead of
+        # letting it escape to the thread excepthook
+        logger.exception("Agent %s failed", state.agent_id)
         _agent_graph["nodes"][state.agent_id]["status"] = "error"
         _agent_graph["nodes"][state.agent_id]["finished_at"] = datetime.now(UTC).isoformat()
         _agent_graph["nodes"][state.agent_id]["result"] = {"error": str(e)}
         _running_agents.pop(state.agent_id, None)
         _agent_instances.pop(state.agent_id, None)
-        raise
+        return {"error": str(e)}
     else:
         if state.stop_requested:
             _agent_graph["nodes"][state.agent_id]["status"] = "stopped"
@@ -263,8 +280,9 @@ def create_agent(
             daemon=True,
             name=f"Agent-{name}-{state.agent_id}",
         )
-        thread.start()
+        # Register before starting so a fast agent's cleanup cannot run first
         _running_agents[state.agent_id] = thread
+        thread.start()
 
     except Exception as e:  # noqa: BLE001
         return {"success": False, "error": f"Failed to create agent: {e}", "agent_id": None}
@@ -530,6 +548,14 @@ def stop_agent(agent_id: str) -> dict[str, Any]:
         }
 
 
+def stop_all_agents() -> list[str]:
+    """Request a stop for every running sub-agent and return their IDs."""
+    agent_ids = list(_running_agents)
+    for agent_id in agent_ids:
+        stop_agent(agent_id)
+    return agent_ids
+
+
 def send_user_message_to_agent(agent_id: str, message: str) -> dict[str, Any]:
     try:
         if agent_id not in _agent_graph["nodes"]:
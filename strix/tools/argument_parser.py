@@ -3,6 +3,7 @@ import inspect
 import json
 import types
 from collections.abc import Callable
+from functools import partial
 from typing import Any, Union, get_args, get_origin
 
 
@@ -12,39 +13,60 @@ class ArgumentConversionError(Exception):
         super().__init__(message)
 
 
-def convert_arguments(func: Callable[..., Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+def build_argument_converter(
+    func: Callable[..., Any],
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Return a converter for ``func``'s arguments with its signature resolved once.
+
+    Calling the converter is equivalent to ``convert_arguments(func, kwargs)``.
+    Parameters with plain types get their string conversion picked up front;
+    the rest go through ``convert_string_to_type`` on each call.
+    """
     try:
-        sig = inspect.signature(func)
-        converted = {}
+        annotations = {
+            name: param.annotation
+            for name, param in inspect.signature(func).parameters.items()
+            if param.annotation is not inspect.Parameter.empty
+        }
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ArgumentConversionError(f"Failed to process function arguments: {e}") from e
+    converters = {name: _string_converter(param_type) for name, param_type in annotations.items()}
 
+    def convert(kwargs: dict[str, Any]) -> dict[str, Any]:
+        converted = {}
         for param_name, value in kwargs.items():
-            if param_name not in sig.parameters:
-                converted[param_name] = value
-                continue
-
-            param = sig.parameters[param_name]
-            param_type = param.annotation
-
-            if param_type == inspect.Parameter.empty or value is None:
-                converted[param_name] = value
-                continue
-
-            if not isinstance(value, str):
+            if param_name not in converters or not isinstance(value, str):
                 converted[param_name] = value
                 continue
 
             try:
-                converted[param_name] = convert_string_to_type(value, param_type)
+                converted[param_name] = converters[param_name](value)
             except (ValueError, TypeError, json.JSONDecodeError) as e:
+                param_type = annotations[param_name]
                 raise ArgumentConversionError(
                     f"Failed to convert argument '{param_name}' to type {param_type}: {e}",
                     param_name=param_name,
                 ) from e
+        return converted
 
-    except (ValueError, TypeError, AttributeError) as e:
-        raise ArgumentConversionError(f"Failed to process function arguments: {e}") from e
+    return convert
+
+
+def _string_converter(param_type: Any) -> Callable[[str], Any]:
+    """Pick the conversion ``convert_string_to_type`` would apply for ``param_type``."""
+    with contextlib.suppress(TypeError):  # Unhashable annotations
+        if param_type in _BASIC_CONVERTERS:
+            return _BASIC_CONVERTERS[param_type]
+
+    container = get_origin(param_type) or param_type
+    if container in (list, dict) and type(None) not in get_args(param_type):
+        return _convert_to_list if container is list else _convert_to_dict
 
-    return converted
+    return partial(convert_string_to_type, param_type=param_type)
+
+
+def convert_arguments(func: Callable[..., Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+    return build_argument_converter(func)(kwargs)
 
 
 def convert_string_to_type(value: str, param_type: Any) -> Any:
@@ -69,15 +91,8 @@ def convert_string_to_type(value: str, param_type: Any) -> Any:
 
 
 def _convert_basic_types(value: str, param_type: Any, origin: Any = None) -> Any:
-    basic_type_converters: dict[Any, Callable[[str], Any]] = {
-        int: int,
-        float: float,
-        bool: _convert_to_bool,
-        str: str,
-    }
-
-    if param_type in basic_type_converters:
-        return basic_type_converters[param_type](value)
+    if param_type in _BASIC_CONVERTERS:
+        return _BASIC_CONVERTERS[param_type](value)
 
     if list in (origin, param_type):
         return _convert_to_list(value)
@@ -119,3 +134,11 @@ def _convert_to_dict(value: str) -> dict[str, Any]:
         return {}
     else:
         return {}
+
+
+_BASIC_CONVERTERS: dict[Any, Callable[[str], Any]] = {
+    int: int,
+    float: float,
+    bool: _convert_to_bool,
+    str: str,
+}
@@ -12,6 +12,8 @@ Key Systems:
 """
 
 import uuid
+import weakref
+from collections import deque
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
 
@@ -22,20 +24,29 @@ from strix.tools.registry import register_tool
 # Data Structures
 # =============================================================================
 
+MAX_HELP_REQUESTS = 500
+MAX_MESSAGES = 1000
+
 # Claims: agent_id -> list of claimed targets
 _claims: dict[str, list[dict[str, Any]]] = {}
 
+# Claim index: "target:test_type" -> latest claim for that key
+_claims_by_target: dict[str, dict[str, Any]] = {}
+
 # Findings: shared vulnerability findings for chaining
 _findings: dict[str, dict[str, Any]] = {}
 
+# Finding index: severity -> finding IDs in the order they were shared
+_findings_by_severity: dict[str, list[str]] = {}
+
 # Work Queue: central queue of targets to test
 _work_queue: list[dict[str, Any]] = []
 
-# Help Requests: requests for specialized assistance
-_help_requests: list[dict[str, Any]] = []
+# Help Requests: requests for specialized assistance (oldest dropped first)
+_help_requests: deque[dict[str, Any]] = deque(maxlen=MAX_HELP_REQUESTS)
 
-# Messages: broadcast messages between agents
-_messages: list[dict[str, Any]] = []
+# Messages: broadcast messages between agents (oldest dropped first)
+_messages: deque[dict[str, Any]] = deque(maxlen=MAX_MESSAGES)
 
 # Statistics
 _collaboration_stats: dict[str, Any] = {
@@ -55,12 +66,38 @@ def _generate_id(prefix: str = "id") -> str:
     return f"{prefix}_{uuid.uuid4().hex[:8]}"
 
 
+# Agent info per live agent state. AgentState is unhashable, so entries are keyed
+# by id() and hold a weak reference that both validates the key and evicts it.
+_agent_info_cache: dict[int, tuple[weakref.ref[Any], dict[str, str]]] = {}
+
+
+def _forget_agent_info(key: int, ref: weakref.ref[Any]) -> None:
+    cached = _agent_info_cache.get(key)
+    if cached is not None and cached[0] is ref:
+        del _agent_info_cache[key]
+
+
 def _get_agent_info(agent_state: Any) -> dict[str, str]:
-    """Extract agent information from state."""
-    return {
+    """Extract agent information from state.
+
+    The result is cached for as long as the state object is alive and must
+    not be mutated by callers.
+    """
+    key = id(agent_state)
+    cached = _agent_info_cache.get(key)
+    if cached is not None and cached[0]() is agent_state:
+        return cached[1]
+
+    info = {
         "agent_id": getattr(agent_state, "agent_id", "unknown"),
         "agent_name": getattr(agent_state, "agent_name", "Unknown Agent"),
     }
+    try:
+        ref = weakref.ref(agent_state, lambda r: _forget_agent_info(key, r))
+    except TypeError:
+        return info
+    _agent_info_cache[key] = (ref, info)
+    return info
 
 
 # =============================================================================
@@ -105,31 +142,29 @@ def claim_target(
     claim_key = f"{target}:{test_type}"
     
     # Check if already claimed by any agent
-    for agent_id, claims in _claims.items():
-        for claim in claims:
-            if claim.get("claim_key") == claim_key:
-                if claim.get("status") == "active":
-                    # Check if claim has expired (2x estimated duration)
-                    claimed_at = datetime.fromisoformat(claim["claimed_at"])
-                    expiry_minutes = claim.get("estimated_duration", 30) * 2
-                    if datetime.now(UTC) - claimed_at < timedelta(minutes=expiry_minutes):
-                        _collaboration_stats["duplicate_tests_prevented"] += 1
-                        return {
-                            "success": False,
-                            "status": "already_claimed",
-                            "claimed_by": {
-                                "agent_id": agent_id,
-                                "agent_name": claim.get("agent_name"),
-                            },
-                            "claimed_at": claim["claimed_at"],
-                            "test_type": claim["test_type"],
-                            "message": f"Target already being tested by {claim.get('agent_name', agent_id)}. "
-                                       f"Consider testing a different vulnerability type or target.",
-                            "suggestion": f"Try a different test_type (currently claimed for: {test_type})",
-                        }
-                    else:
-                        # Claim expired, release it
-                        claim["status"] = "expired"
+    claim = _claims_by_target.get(claim_key)
+    if claim is not None and claim.get("status") == "active":
+        agent_id = claim["agent_id"]
+        # Check if claim has expired (2x estimated duration)
+        claimed_at = datetime.fromisoformat(claim["claimed_at"])
+        expiry_minutes = claim.get("estimated_duration", 30) * 2
+        if datetime.now(UTC) - claimed_at < timedelta(minutes=expiry_minutes):
+            _collaboration_stats["duplicate_tests_prevented"] += 1
+            return {
+                "success": False,
+                "status": "already_claimed",
+                "claimed_by": {
+                    "agent_id": agent_id,
+                    "agent_name": claim.get("agent_name"),
+                },
+                "claimed_at": claim["claimed_at"],
+                "test_type": claim["test_type"],
+                "message": f"Target already being tested by {claim.get('agent_name', agent_id)}. "
+                           f"Consider testing a different vulnerability type or target.",
+                "suggestion": f"Try a different test_type (currently claimed for: {test_type})",
+            }
+        # Claim expired, release it
+        claim["status"] = "expired"
     
     # Create new claim
     claim_id = _generate_id("claim")
@@ -152,6 +187,7 @@ def claim_target(
         _claims[agent_info["agent_id"]] = []
     
     _claims[agent_info["agent_id"]].append(new_claim)
+    _claims_by_target[claim_key] = new_claim
     _collaboration_stats["total_claims"] += 1
     
     return {
@@ -425,6 +461,7 @@ def share_finding(
     }
     
     _findings[finding_id] = finding
+    _findings_by_severity.setdefault(severity, []).append(finding_id)
     _collaboration_stats["total_findings"] += 1
     
     if chainable:
@@ -510,10 +547,13 @@ def list_findings(
     """
     filtered_findings = []
     
-    for finding_id, finding in _findings.items():
+    if severity:
+        candidates = [(fid, _findings[fid]) for fid in _findings_by_severity.get(severity, [])]
+    else:
+        candidates = list(_findings.items())
+
+    for finding_id, finding in candidates:
         # Apply filters
-        if severity and finding.get("severity") != severity:
-            continue
         if vulnerability_type and finding.get("vulnerability_type") != vulnerability_type:
             continue
         if chainable_only and not finding.get("chainable"):
@@ -538,14 +578,11 @@ def list_findings(
     filtered_findings = filtered_findings[:limit]
     
     # Calculate statistics
-    by_severity: dict[str, int] = {}
+    by_severity = {sev: len(ids) for sev, ids in _findings_by_severity.items() if ids}
     by_type: dict[str, int] = {}
     chainable_count = 0
     
     for f in _findings.values():
-        sev = f.get("severity", "info")
-        by_severity[sev] = by_severity.get(sev, 0) + 1
-        
         vt = f.get("vulnerability_type", "unknown")
         by_type[vt] = by_type.get(vt, 0) + 1
         
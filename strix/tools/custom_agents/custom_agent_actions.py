@@ -206,8 +206,9 @@ def create_custom_agent(
             daemon=True,
             name=f"CustomAgent-{name}-{state.agent_id}",
         )
-        thread.start()
+        # Register before starting so a fast agent's cleanup cannot run first
         _get_running_agents()[state.agent_id] = thread
+        thread.start()
         
     except Exception as e:  # noqa: BLE001
         return {
@@ -96,14 +96,19 @@ def _get_module_name(func: Callable[..., Any]) -> str:
 
 
 def register_tool(
-    func: Callable[..., Any] | None = None, *, sandbox_execution: bool = True
+    func: Callable[..., Any] | None = None,
+    *,
+    sandbox_execution: bool = True,
+    idempotent: bool = False,
 ) -> Callable[..., Any]:
+    # idempotent tools only read state: identical calls in one batch may share a result
     def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
         func_dict = {
             "name": f.__name__,
             "function": f,
             "module": _get_module_name(f),
             "sandbox_execution": sandbox_execution,
+            "idempotent": idempotent,
         }
 
         sandbox_mode = os.getenv("STRIX_SANDBOX_MODE", "false").lower() == "true"
@@ -168,6 +173,13 @@ def should_execute_in_sandbox(tool_name: str) -> bool:
     return True
 
 
+def is_idempotent(tool_name: str) -> bool:
+    for tool in tools:
+        if tool.get("name") == tool_name:
+            return bool(tool.get("idempotent", False))
+    return False
+
+
 def get_tools_prompt() -> str:
     tools_by_module: dict[str, list[dict[str, Any]]] = {}
     for tool in tools:
@@ -0,0 +1,29 @@
+from typing import Any
+
+import pytest
+
+from strix.llm.config import ENDPOINT_ENV_KEYS, LLMConfig
+
+
+class TestLLMConfigEnvironment:
+    """Tests for LLMConfig's environment fallback."""
+
+    @pytest.fixture(autouse=True)
+    def _no_config(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def no_config() -> Any:
+            raise RuntimeError("no config")
+
+        monkeypatch.setattr("strix.config.get_config", no_config)
+        for key in ("CLIPROXY_BASE_URL", *ENDPOINT_ENV_KEYS):
+            monkeypatch.delenv(key, raising=False)
+
+    def test_legacy_keys_in_priority_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that LLM_API_BASE wins over the other legacy base URL variables."""
+        monkeypatch.setenv("OLLAMA_API_BASE", "http://localhost:11434")
+        monkeypatch.setenv("LLM_API_BASE", "http://proxy/v1")
+        assert LLMConfig(model_name="m").api_endpoint == "http://proxy/v1"
+
+    def test_ignores_cliproxy_endpoint(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that CLIPROXY_ENDPOINT is left to the LLM and direct API clients."""
+        monkeypatch.setenv("CLIPROXY_ENDPOINT", "http://localhost:8317/v1")
+        assert LLMConfig(model_name="m").api_endpoint == ""
@@ -0,0 +1,297 @@
+import io
+import json
+from typing import Any, Self
+
+import httpx
+import pytest
+import requests
+
+from strix.llm import direct_api
+from strix.llm.direct_api import DirectAPIClient, DirectAPIError
+
+
+@pytest.fixture
+def client() -> DirectAPIClient:
+    """Create a client pointed at a dummy endpoint."""
+    return DirectAPIClient(endpoint="http://localhost:8317", model="test-model", api_key="k")
+
+
+def _completion(**overrides: Any) -> dict[str, Any]:
+    response: dict[str, Any] = {
+        "model": "served-model",
+        "choices": [{"message": {"content": "hello"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+    }
+    response.update(overrides)
+    return response
+
+
+class TestParseCompletion:
+    """Tests for DirectAPIClient._parse_completion."""
+
+    def test_parses_first_choice(self, client: DirectAPIClient) -> None:
+        """Test that content, model and finish reason come from the payload."""
+        result = client._parse_completion(_completion())
+        assert result.content == "hello"
+        assert result.model == "served-model"
+        assert result.finish_reason == "stop"
+        assert result.usage["total_tokens"] == 5
+        assert client.get_stats()["total_tokens"] == 5
+
+    def test_missing_usage_defaults_to_zero(self, client: DirectAPIClient) -> None:
+        """Test that a response without usage reports zero tokens."""
+        result = client._parse_completion(_completion(usage=None))
+        assert result.usage == {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+    def test_default_usage_is_not_shared(self, client: DirectAPIClient) -> None:
+        """Test that changing one response's default usage does not leak into the next."""
+        client._parse_completion(_completion(usage=None)).usage["total_tokens"] = 9
+        result = client._parse_completion(_completion(usage=None))
+        assert result.usage["total_tokens"] == 0
+
+    def test_copy_usage_normalizes_keys(self, client: DirectAPIClient) -> None:
+        """Test that copy_usage returns a fresh dict with the standard keys."""
+        response = _completion(usage={"total_tokens": 7, "extra": 1})
+        result = client._parse_completion(response, copy_usage=True)
+        assert result.usage == {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 7}
+        assert result.usage is not response["usage"]
+
+    def test_null_content_becomes_empty_string(self, client: DirectAPIClient) -> None:
+        """Test that a null message content is returned as an empty string."""
+        response = _completion(choices=[{"message": {"content": None}}])
+        result = client._parse_completion(response)
+        assert result.content == ""
+        assert result.finish_reason == "unknown"
+
+    @pytest.mark.parametrize("choices", [[], None, [{}]])
+    def test_malformed_choices_raise(self, client: DirectAPIClient, choices: Any) -> None:
+        """Test that missing or empty choices raise DirectAPIError."""
+        with pytest.raises(DirectAPIError):
+            client._parse_completion(_completion(choices=choices))
+
+
+class TestChatCompletionBatch:
+    """Tests for DirectAPIClient.chat_completion_batch_async."""
+
+    async def test_results_keep_batch_order(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that responses line up with the input batch."""
+
+        async def fake_request(
+            self: DirectAPIClient,
+            method: str,
+            path: str,
+            json_data: dict[str, Any] | None = None,
+        ) -> dict[str, Any]:
+            assert json_data is not None
+            text = json_data["messages"][0]["content"]
+            return _completion(choices=[{"message": {"content": text.upper()}}])
+
+        monkeypatch.setattr(DirectAPIClient, "_make_request_async", fake_request)
+
+        batch = [[{"role": "user", "content": text}] for text in ("a", "b", "c")]
+        results = await client.chat_completion_batch_async(batch)
+
+        assert [r.content for r in results] == ["A", "B", "C"]
+        assert client.get_stats()["total_requests"] == 3
+
+
+class TestTokenCounter:
+    """Tests for the token_counter function."""
+
+    def test_falls_back_to_character_estimate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the heuristic is used when no encoder is available."""
+        monkeypatch.setattr(direct_api, "_get_encoder", lambda: None)
+        direct_api.token_counter.cache_clear()
+        try:
+            assert direct_api.token_counter("a" * 40) == 10
+        finally:
+            direct_api.token_counter.cache_clear()
+
+    def test_counts_with_encoder(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the encoder is used when available."""
+
+        class WordEncoder:
+            def encode(self, text: str, **_kwargs: Any) -> list[str]:
+                return text.split()
+
+        monkeypatch.setattr(direct_api, "_get_encoder", WordEncoder)
+        direct_api.token_counter.cache_clear()
+        try:
+            assert direct_api.token_counter("one two three") == 3
+        finally:
+            direct_api.token_counter.cache_clear()
+
+
+class TestSharedClient:
+    """Tests for DirectAPIClient.shared."""
+
+    def test_same_arguments_share_instance(self) -> None:
+        """Test that identical configurations reuse one client."""
+        try:
+            first = DirectAPIClient.shared(endpoint="http://a", model="m", api_key="k")
+            second = DirectAPIClient.shared(endpoint="http://a", model="m", api_key="k")
+            other = DirectAPIClient.shared(endpoint="http://b", model="m", api_key="k")
+            assert first is second
+            assert first is not other
+        finally:
+            DirectAPIClient.clear_shared()
+
+
+class TestModelCapabilities:
+    """Tests for model capability checks."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("claude-sonnet-4-5-20250929", True),
+            ("anthropic/claude-3-5-haiku-latest", True),
+            ("Gemini-2.5-Pro", True),
+            ("gemini-2.5-flash", False),
+            ("qwen3-coder-plus", False),
+        ],
+    )
+    def test_supports_prompt_caching(self, model: str, expected: bool) -> None:
+        """Test the prompt caching allow-list."""
+        assert direct_api.supports_prompt_caching(model) is expected
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [("gpt-4o-mini", True), ("Claude-3-opus", True), ("qwen3-coder-plus", False)],
+    )
+    def test_supports_vision(self, model: str, expected: bool) -> None:
+        """Test vision detection from model name fragments."""
+        assert direct_api.supports_vision(model) is expected
+
+
+class _FakeStream:
+    def __init__(self, lines: list[str]) -> None:
+        self.status_code = 200
+        self.lines = lines
+        self.read = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def iter_lines(self) -> Any:
+        for line in self.lines:
+            self.read += 1
+            yield line.encode()
+
+
+def _sse(content: str | None = None, **extra: Any) -> str:
+    chunk: dict[str, Any] = {"model": "served-model", **extra}
+    if content is not None:
+        chunk["choices"] = [{"delta": {"content": content}}]
+    return "data: " + json.dumps(chunk)
+
+
+class TestStreamRequest:
+    """Tests for DirectAPIClient._stream_request."""
+
+    def test_assembles_deltas_and_usage(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that deltas are joined and the reported usage is kept."""
+        usage = {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}
+        stream = _FakeStream(
+            [_sse("hel"), "", _sse("lo"), _sse(choices=[], usage=usage), "data: [DONE]"]
+        )
+        monkeypatch.setattr(direct_api.requests, "post", lambda *_args, **_kwargs: stream)
+
+        result = client._parse_completion(client._stream_request({"messages": []}))
+
+        assert result.content == "hello"
+        assert result.usage == usage
+
+    def test_stops_after_cutoff_split_across_chunks(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that reading ends at the requested occurrence of the cutoff."""
+        stream = _FakeStream(
+            [_sse("<f>a</fun"), _sse("ction> <f>b</function>"), _sse(" more"), _sse("never")]
+        )
+        monkeypatch.setattr(direct_api.requests, "post", lambda *_args, **_kwargs: stream)
+
+        payload = client._stream_request({"messages": []}, cutoff="</function>", cutoff_count=2)
+
+        assert payload["choices"][0]["message"]["content"] == "<f>a</function> <f>b</function>"
+        assert payload["choices"][0]["finish_reason"] == "stop"
+        assert payload["usage"]["completion_tokens"] > 0
+        assert stream.read == 2
+
+    def test_non_ascii_deltas_are_decoded_as_utf8(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a stream without a charset is still read as UTF-8."""
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/event-stream"
+        response.raw = io.BytesIO(
+            "\n\n".join([_sse("héllo — "), _sse("你好"), "data: [DONE]"]).encode()
+        )
+        monkeypatch.setattr(direct_api.requests, "post", lambda *_args, **_kwargs: response)
+
+        result = client._parse_completion(client._stream_request({"messages": []}))
+
+        assert result.content == "héllo — 你好"
+
+
+class TestMakeRequestAsync:
+    """Tests for DirectAPIClient._make_request_async."""
+
+    async def test_posts_through_pooled_client(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that async requests use the loop's httpx client and parse the reply."""
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=_completion())
+
+        pooled = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(DirectAPIClient, "_get_async_client", lambda _self: pooled)
+
+        result = await client.chat_completion_async([{"role": "user", "content": "hi"}])
+
+        assert result.content == "hello"
+        assert str(seen[0].url) == "http://localhost:8317/v1/chat/completions"
+        assert seen[0].headers["Authorization"] == "Bearer k"
+        await pooled.aclose()
+
+    async def test_error_status_raises(
+        self, client: DirectAPIClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that non-retryable HTTP errors surface as DirectAPIError."""
+        transport = httpx.MockTransport(
+            lambda _request: httpx.Response(400, json={"error": {"message": "bad model"}})
+        )
+        pooled = httpx.AsyncClient(transport=transport)
+        monkeypatch.setattr(DirectAPIClient, "_get_async_client", lambda _self: pooled)
+
+        with pytest.raises(DirectAPIError, match="bad model"):
+            await client.list_models_async()
+        await pooled.aclose()
+
+    async def test_one_client_per_loop(self, client: DirectAPIClient) -> None:
+        """Test that the pooled client is reused within a loop."""
+        assert client._get_async_client() is client._get_async_client()
+        await client.aclose_async_client()
+        assert client._async_clients == {}
+
+    async def test_aclose_shared_async_clients(self) -> None:
+        """Test that closing shared clients drops the running loop's client."""
+        DirectAPIClient.clear_shared()
+        shared = DirectAPIClient.shared(endpoint="http://localhost:8317", model="m", api_key="k")
+        pooled = shared._get_async_client()
+
+        await DirectAPIClient.aclose_shared_async_clients()
+
+        assert pooled.is_closed
+        assert shared._async_clients == {}
+        DirectAPIClient.clear_shared()
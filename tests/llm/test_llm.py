@@ -0,0 +1,351 @@
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from strix.llm import llm as llm_module
+from strix.llm import request_queue
+from strix.llm.config import ENDPOINT_ENV_KEYS, LLMConfig
+from strix.llm.direct_api import DirectAPIClient, DirectAPIResponse, get_direct_api_client
+from strix.llm.llm import (
+    LLM,
+    REASONING_EFFORT_PATTERNS,
+    SUPPORTS_STOP_WORDS_FALSE_PATTERNS,
+    _dict_usage,
+    _load_credentials,
+    _select_usage_extractor,
+    compile_model_patterns,
+    model_matches,
+    normalize_model_name,
+)
+from strix.llm.request_queue import LLMRequestQueue
+
+
+@pytest.fixture
+def llm(monkeypatch: pytest.MonkeyPatch) -> Iterator[LLM]:
+    """Create an LLM without an agent prompt, pointed at a dummy endpoint."""
+    monkeypatch.setenv("STRIX_LLM", "qwen3-coder-plus")
+    monkeypatch.setenv("LLM_API_BASE", "http://localhost:8317/v1")
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    monkeypatch.setattr("strix.llm.config._get_strix_config", lambda: None)
+    yield LLM(LLMConfig())
+    get_direct_api_client.cache_clear()
+    DirectAPIClient.clear_shared()
+
+
+class TestNormalizeModelName:
+    """Tests for the normalize_model_name function."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("gpt-5", "gpt-5"),
+            ("openai/GPT-5", "gpt-5"),
+            ("ollama/deepseek-r1:70b", "deepseek-r1"),
+            ("hf/some-model-gguf", "some-model"),
+            ("", ""),
+        ],
+    )
+    def test_normalization(self, model: str, expected: str) -> None:
+        """Test provider prefix, tag and suffix stripping."""
+        assert normalize_model_name(model) == expected
+
+
+class TestModelMatches:
+    """Tests for compiled model pattern matching."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("o1-mini", True),
+            ("openai/o1-preview", True),
+            ("grok-4-0709", True),
+            ("xai/grok-4-0709-extra", False),
+            ("deepseek/deepseek-r1-0528-qwen", True),
+            ("gpt-5", False),
+        ],
+    )
+    def test_stop_words_patterns(self, model: str, expected: bool) -> None:
+        """Test matching against the stop-word exclusion list."""
+        patterns = compile_model_patterns(SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+        assert model_matches(model, patterns) is expected
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("o3", True),
+            ("o3-pro", False),
+            ("openai/gpt-5-mini", True),
+            ("anthropic/claude-sonnet-4-5-20250929", True),
+            ("gemini-2.5-flash-lite", False),
+        ],
+    )
+    def test_reasoning_effort_patterns(self, model: str, expected: bool) -> None:
+        """Test matching against the reasoning effort list."""
+        patterns = compile_model_patterns(REASONING_EFFORT_PATTERNS)
+        assert model_matches(model, patterns) is expected
+
+    def test_slash_patterns_match_full_model_string(self) -> None:
+        """Test that patterns with a provider prefix match the raw model string."""
+        patterns = compile_model_patterns(["openai/o1*"])
+        assert model_matches("OpenAI/o1-mini", patterns) is True
+        assert model_matches("azure/o1-mini", patterns) is False
+
+
+class TestFilterImagesFromMessages:
+    """Tests for LLM._filter_images_from_messages."""
+
+    def test_returns_same_list_without_list_content(self, llm: LLM) -> None:
+        """Test the fast path when no message has list content."""
+        messages = [{"role": "user", "content": "hi"}]
+        assert llm._filter_images_from_messages(messages) is messages
+
+    def test_text_only_list_is_flattened(self, llm: LLM) -> None:
+        """Test that text-only list content becomes a string even without images."""
+        msg = {"role": "user", "content": [{"type": "text", "text": "a"}, {"type": "text"}]}
+        assert llm._filter_images_from_messages([msg])[0]["content"] == "a\n"
+
+    def test_empty_list_becomes_empty_string(self, llm: LLM) -> None:
+        """Test that empty list content is sent as an empty string."""
+        msg = {"role": "user", "content": []}
+        assert llm._filter_images_from_messages([msg])[0]["content"] == ""
+
+    def test_non_text_without_images_is_untouched(self, llm: LLM) -> None:
+        """Test that list content with no images and no flattening keeps its message."""
+        msg = {"role": "user", "content": [{"type": "input_audio"}]}
+        assert llm._filter_images_from_messages([msg])[0] is msg
+
+    def test_all_text_after_filtering_is_joined(self, llm: LLM) -> None:
+        """Test that content becomes a string when only text remains."""
+        msg = {
+            "role": "user",
+            "content": [{"type": "text", "text": "look"}, {"type": "image_url", "image_url": {}}],
+        }
+        result = llm._filter_images_from_messages([msg])[0]
+        assert isinstance(result["content"], str)
+        assert result["content"].startswith("look\n[Screenshot removed")
+        assert msg["content"][1]["type"] == "image_url"
+
+    def test_mixed_content_stays_a_list(self, llm: LLM) -> None:
+        """Test that non-text items keep the content as a list."""
+        other: dict[str, Any] = {"type": "input_audio"}
+        msg = {"role": "user", "content": [other, {"type": "image_url", "image_url": {}}]}
+        result = llm._filter_images_from_messages([msg])[0]
+        assert result["content"][0] is other
+        assert result["content"][1]["type"] == "text"
+
+
+async def test_make_request_passes_priority_to_queue(
+    llm: LLM, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the request priority reaches the shared queue."""
+    seen: list[int] = []
+
+    class FakeQueue:
+        response_cache = None
+
+        async def make_request(self, _completion_args: dict[str, Any], priority: int) -> str:
+            seen.append(priority)
+            return "response"
+
+    monkeypatch.setattr("strix.llm.llm._litellm_available", True)
+    monkeypatch.setattr("strix.llm.llm.get_global_queue", FakeQueue)
+
+    assert await llm._make_request([{"role": "user", "content": "hi"}], priority=1) == "response"
+    assert seen == [1]
+
+
+async def test_response_cache_serves_repeated_llm_requests(
+    llm: LLM, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that with STRIX_LLM_CACHE_ENABLED an identical LLM request is answered from disk."""
+
+    class FakeModelResponse:
+        def __init__(self, **data: Any) -> None:
+            self.data = data
+
+        def model_dump_json(self) -> str:
+            return json.dumps(self.data)
+
+    sent: list[dict[str, Any]] = []
+
+    async def fake_request(completion_args: dict[str, Any]) -> FakeModelResponse:
+        sent.append(completion_args)
+        return FakeModelResponse(id="r1")
+
+    monkeypatch.setenv("STRIX_LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("STRIX_LLM_CACHE", str(tmp_path))
+    monkeypatch.setattr(request_queue, "_litellm_available", True)
+    monkeypatch.setattr(request_queue, "ModelResponse", FakeModelResponse, raising=False)
+    monkeypatch.setattr(llm_module, "_litellm_available", True)
+    queue = LLMRequestQueue(delay_between_requests=0)
+    monkeypatch.setattr(queue, "_reliable_request", fake_request)
+    monkeypatch.setattr(llm_module, "get_global_queue", lambda: queue)
+
+    messages = [{"role": "user", "content": "hi"}]
+    first = await llm._make_request(messages)
+    second = await llm._make_request(messages)
+
+    assert len(sent) == 1
+    assert sent[0]["temperature"] == 0
+    assert second.data == first.data == {"id": "r1"}
+
+
+class TestAddCacheControl:
+    """Tests for LLM._add_cache_control_to_content."""
+
+    def test_string_becomes_tagged_text_item(self, llm: LLM) -> None:
+        """Test that string content is wrapped in a tagged text item."""
+        assert llm._add_cache_control_to_content("hi") == [
+            {"type": "text", "text": "hi", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_last_text_item_is_tagged_without_mutating_input(self, llm: LLM) -> None:
+        """Test that only the last item is replaced and the input is left alone."""
+        first = {"type": "text", "text": "a"}
+        last = {"type": "text", "text": "b"}
+        result = llm._add_cache_control_to_content([first, last])
+        assert result[0] is first
+        assert result[1] == {**last, "cache_control": {"type": "ephemeral"}}
+        assert "cache_control" not in last
+
+    def test_already_tagged_content_is_returned_unchanged(self, llm: LLM) -> None:
+        """Test that re-tagging returns the same list object."""
+        content = llm._add_cache_control_to_content("hi")
+        assert llm._add_cache_control_to_content(content) is content
+
+
+def test_memory_compressor_is_created_on_first_use(llm: LLM) -> None:
+    """Test that the compressor is built lazily and then reused."""
+    assert "memory_compressor" not in vars(llm)
+    compressor = llm.memory_compressor
+    assert llm.memory_compressor is compressor
+    assert compressor.model_name == llm.config.model_name
+
+
+def test_build_messages_keeps_history_without_compression(llm: LLM) -> None:
+    """Test that an uncompressed history is appended after the system prompt as-is."""
+    history = [{"role": "user", "content": "task"}]
+    messages = llm._build_messages(history)
+    assert messages[0]["role"] == "system"
+    assert messages[1:] == [{"role": "user", "content": "task"}]
+    assert history == [{"role": "user", "content": "task"}]
+
+
+class TestUpdateUsageStats:
+    """Tests for LLM._update_usage_stats."""
+
+    def test_dict_usage_is_recorded(self, llm: LLM) -> None:
+        """Test that direct API usage dicts update the totals and pick the dict reader."""
+        response = DirectAPIResponse(
+            content="",
+            model="m",
+            usage={"prompt_tokens": 5, "completion_tokens": 2},
+            finish_reason="stop",
+            raw_response={},
+        )
+        llm._update_usage_stats(response)
+        llm._update_usage_stats(response)
+        assert llm.usage_stats["total"]["input_tokens"] == 10
+        assert llm.usage_stats["last_request"]["output_tokens"] == 2
+        assert llm._usage_extractor is _dict_usage
+
+    def test_object_usage_reads_cache_details(self) -> None:
+        """Test the attribute reader used for LiteLLM usage objects."""
+        usage = SimpleNamespace(
+            prompt_tokens=10,
+            completion_tokens=3,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=None),
+            cache_creation_input_tokens=4,
+        )
+        assert _select_usage_extractor(usage)(usage) == (10, 3, 0, 4)
+
+    def test_litellm_cost_comes_from_the_response(
+        self, llm: LLM, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that LiteLLM responses are priced by completion_cost on the response itself."""
+        priced: list[Any] = []
+
+        def completion_cost(response: Any) -> float:
+            priced.append(response)
+            return 0.25
+
+        monkeypatch.setattr(llm_module, "_litellm_available", True)
+        monkeypatch.setattr(llm_module, "completion_cost", completion_cost, raising=False)
+        monkeypatch.setattr(llm, "_use_direct_api", False)
+        response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=3))
+
+        llm._update_usage_stats(response)
+
+        assert priced == [response]
+        assert llm.usage_stats["total"]["cost"] == 0.25
+
+
+def test_identity_message_follows_set_agent_identity(llm: LLM) -> None:
+    """Test that the cached identity message is rebuilt when the identity changes."""
+    assert llm._build_identity_message() is None
+    llm.set_agent_identity("Recon Agent", "agent_1")
+    message = llm._build_identity_message()
+    assert message is not None
+    assert "<agent_name>Recon Agent</agent_name>" in message["content"]
+    assert llm._build_identity_message() is message
+
+
+def test_build_messages_starts_with_system_and_identity(llm: LLM) -> None:
+    """Test that the cached prefix carries the current identity."""
+    llm.set_agent_identity("Recon Agent", "agent_1")
+    messages = llm._build_messages([{"role": "user", "content": "task"}])
+    assert [m["role"] for m in messages] == ["system", "user", "user"]
+    assert messages[1] is llm._build_identity_message()
+    assert messages[-1] == {"role": "user", "content": "task"}
+
+
+class TestLoadCredentials:
+    """Tests for _load_credentials."""
+
+    @pytest.fixture(autouse=True)
+    def _no_config(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def no_config() -> Any:
+            raise RuntimeError("no config")
+
+        monkeypatch.setattr("strix.config.get_config", no_config)
+        for key in ("LLM_API_KEY", *ENDPOINT_ENV_KEYS):
+            monkeypatch.delenv(key, raising=False)
+
+    def test_endpoint_without_key_uses_oauth_placeholder(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a CLIProxy endpoint alone implies OAuth mode."""
+        monkeypatch.setenv("CLIPROXY_ENDPOINT", "http://localhost:8317/v1")
+        assert _load_credentials() == ("cliproxy-oauth-mode", "http://localhost:8317/v1")
+
+    def test_ollama_base_does_not_imply_oauth(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that OLLAMA_API_BASE sets the base but not a placeholder key."""
+        monkeypatch.setenv("OLLAMA_API_BASE", "http://localhost:11434")
+        assert _load_credentials() == (None, "http://localhost:11434")
+
+    def test_explicit_key_wins(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that LLM_API_KEY is preferred over the placeholder."""
+        monkeypatch.setenv("LLM_API_KEY", "sk-test")
+        monkeypatch.setenv("LLM_API_BASE", "http://proxy/v1")
+        assert _load_credentials() == ("sk-test", "http://proxy/v1")
+
+
+def test_caching_inactive_returns_messages_unchanged(llm: LLM) -> None:
+    """Test that models without prompt caching skip cache tagging entirely."""
+    assert llm._caching_active is False
+    messages = [{"role": "system", "content": "sys"}]
+    assert llm._prepare_cached_messages(messages) is messages
+
+
+def test_completion_args_reuse_template(llm: LLM) -> None:
+    """Test that per-request args only add messages to the cached template."""
+    messages = [{"role": "user", "content": "hi"}]
+    args = llm._build_completion_args(messages)
+    assert args["messages"] is messages
+    assert args["model"] == llm.config.model_name
+    assert args["stop"] == ["</function>"]
+    assert "messages" not in llm._completion_args_template
@@ -0,0 +1,78 @@
+from typing import Any
+
+import pytest
+
+from strix.llm import memory_compressor
+from strix.llm.memory_compressor import (
+    _batch_chunks,
+    _split_batch_summaries,
+    _summarize_message_batch,
+)
+
+
+def _chunk(text: str) -> list[dict[str, Any]]:
+    return [{"role": "user", "content": text}]
+
+
+class TestSplitBatchSummaries:
+    """Tests for the _split_batch_summaries function."""
+
+    def test_splits_in_marker_order(self) -> None:
+        """Test that summaries are returned by segment number."""
+        text = "<<<SUMMARY 2>>>\nsecond\n<<<SUMMARY 1>>>\nfirst\n"
+        assert _split_batch_summaries(text, 2) == ["first", "second"]
+
+    def test_missing_summary_returns_none(self) -> None:
+        """Test that a missing or empty segment invalidates the batch."""
+        assert _split_batch_summaries("<<<SUMMARY 1>>>\nonly one", 2) is None
+        assert _split_batch_summaries("<<<SUMMARY 1>>>\n<<<SUMMARY 2>>>\nx", 2) is None
+
+
+class TestSummarizeMessageBatch:
+    """Tests for the _summarize_message_batch function."""
+
+    def test_one_call_for_whole_batch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a well-formed response is split into one summary per chunk."""
+        prompts: list[str] = []
+
+        def fake_complete(prompt: str, model: str, timeout: int) -> str:
+            prompts.append(prompt)
+            return "<<<SUMMARY 1>>>\nA\n<<<SUMMARY 2>>>\nB"
+
+        monkeypatch.setattr(memory_compressor, "_complete", fake_complete)
+
+        result = _summarize_message_batch([_chunk("a"), _chunk("b")], "m")
+
+        assert len(prompts) == 1
+        assert "<<<QUERY 2>>>\nuser: b" in prompts[0]
+        assert [msg["content"] for msg in result] == [
+            "<context_summary message_count='1'>A</context_summary>",
+            "<context_summary message_count='1'>B</context_summary>",
+        ]
+
+    def test_falls_back_to_single_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an unparseable batch response is retried chunk by chunk."""
+        responses = iter(["no markers", "S1", "S2"])
+        monkeypatch.setattr(memory_compressor, "_complete", lambda *_: next(responses))
+
+        result = _summarize_message_batch([_chunk("a"), _chunk("b")], "m")
+
+        assert [msg["content"] for msg in result] == [
+            "<context_summary message_count='1'>S1</context_summary>",
+            "<context_summary message_count='1'>S2</context_summary>",
+        ]
+
+
+class TestBatchChunks:
+    """Tests for the _batch_chunks function."""
+
+    def test_respects_count_and_token_limits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that batches are split by size and by token budget."""
+        monkeypatch.setattr(memory_compressor, "MAX_SUMMARY_BATCH", 2)
+        monkeypatch.setattr(memory_compressor, "MAX_SUMMARY_BATCH_TOKENS", 10)
+        monkeypatch.setattr(memory_compressor, "_count_tokens", lambda text, _model: len(text))
+
+        chunks = [_chunk("aaa"), _chunk("bbb"), _chunk("ccc"), _chunk("d" * 9), _chunk("e")]
+        batches = _batch_chunks(chunks, "m")
+
+        assert [len(batch) for batch in batches] == [2, 1, 2]
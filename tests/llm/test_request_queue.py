@@ -0,0 +1,396 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, ClassVar
+
+import pytest
+
+from strix.llm import request_queue
+from strix.llm.request_queue import (
+    LLMRequestQueue,
+    LoopSafeSemaphore,
+    RateLimiter,
+    ResponseCache,
+)
+
+
+class TestLoopSafeSemaphore:
+    """Tests for LoopSafeSemaphore."""
+
+    async def test_limits_concurrency(self) -> None:
+        """Test that no more than the configured number of holders run at once."""
+        semaphore = LoopSafeSemaphore(2)
+        active = 0
+        peak = 0
+
+        async def worker() -> None:
+            nonlocal active, peak
+            async with semaphore:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker() for _ in range(6)))
+        assert peak == 2
+
+    async def test_cancelled_waiter_does_not_leak_slot(self) -> None:
+        """Test that cancelling a queued acquire leaves the slot count intact."""
+        semaphore = LoopSafeSemaphore(1)
+        await semaphore.acquire()
+
+        waiter = asyncio.create_task(semaphore.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        semaphore.release()
+        await asyncio.wait_for(semaphore.acquire(), timeout=1)
+
+    async def test_lower_priority_value_is_served_first(self) -> None:
+        """Test that queued waiters get the slot by priority, then arrival order."""
+        semaphore = LoopSafeSemaphore(1)
+        await semaphore.acquire()
+        order: list[str] = []
+
+        async def worker(name: str, priority: int) -> None:
+            await semaphore.acquire(priority)
+            order.append(name)
+            semaphore.release()
+
+        tasks = [
+            asyncio.create_task(worker(name, priority))
+            for name, priority in [("bulk1", 5), ("bulk2", 5), ("interactive", 1)]
+        ]
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["interactive", "bulk1", "bulk2"]
+
+    def test_wakes_waiter_on_another_loop(self) -> None:
+        """Test that a release in one thread wakes a waiter running another loop."""
+        semaphore = LoopSafeSemaphore(1)
+        asyncio.run(semaphore.acquire())
+        acquired = threading.Event()
+
+        def other_thread() -> None:
+            asyncio.run(semaphore.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        assert not acquired.wait(0.05)
+        semaphore.release()
+        assert acquired.wait(1)
+        thread.join(1)
+
+
+class TestRateLimiter:
+    """Tests for the token bucket RateLimiter."""
+
+    def test_burst_up_to_limit_then_wait(self) -> None:
+        """Test that a full bucket allows max_requests calls before asking to wait."""
+        limiter = RateLimiter(max_requests_per_minute=3)
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.get_remaining_capacity() == 0
+
+        wait = limiter.acquire()
+        assert 0 < wait <= 20.0
+
+    def test_refills_over_time(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that tokens come back at max_requests per minute."""
+        now = [1000.0]
+        monkeypatch.setattr("strix.llm.request_queue.time.monotonic", lambda: now[0])
+        limiter = RateLimiter(max_requests_per_minute=60)
+        for _ in range(60):
+            limiter.acquire()
+        assert limiter.get_current_rate() == 60
+
+        now[0] += 2.0
+        assert limiter.get_remaining_capacity() == 2
+        assert limiter.acquire() == 0.0
+
+
+class TestConcurrentRequests:
+    """Tests for concurrent LLMRequestQueue.make_request calls."""
+
+    async def test_concurrency_limit_is_respected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that concurrent requests never exceed max_concurrent in flight."""
+        monkeypatch.setattr(request_queue, "_litellm_available", True)
+        queue = LLMRequestQueue(max_concurrent=2, delay_between_requests=0)
+        active = 0
+        peak = 0
+
+        async def fake_request(completion_args: dict[str, Any]) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01 * (3 - completion_args["i"]))
+            active -= 1
+            return f"r{completion_args['i']}"
+
+        monkeypatch.setattr(queue, "_reliable_request", fake_request)
+
+        results = await asyncio.gather(*(queue.make_request({"i": i}) for i in range(3)))
+
+        assert results == ["r0", "r1", "r2"]
+        assert peak == 2
+        assert queue.get_stats()["total_requests"] == 3
+
+
+async def test_request_delay_reserves_spaced_slots(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that concurrent callers are each given their own start slot."""
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr("strix.llm.request_queue.time.monotonic", lambda: 100.0)
+    monkeypatch.setattr(request_queue.asyncio, "sleep", fake_sleep)
+    queue = LLMRequestQueue(delay_between_requests=0.5)
+
+    for _ in range(3):
+        await queue._apply_request_delay()
+
+    assert sleeps == [0.5, 1.0]
+    assert queue._last_request_time == 101.0
+
+
+class TestReliableRequest:
+    """Tests for LLMRequestQueue._reliable_request."""
+
+    async def test_completion_runs_off_the_event_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the blocking LiteLLM call runs in the queue's worker threads."""
+
+        class FakeResponse:
+            pass
+
+        threads: list[str] = []
+
+        def fake_completion(**kwargs: Any) -> FakeResponse:
+            assert kwargs == {"model": "m", "stream": False}
+            threads.append(threading.current_thread().name)
+            return FakeResponse()
+
+        monkeypatch.setattr(request_queue, "_litellm_available", True)
+        monkeypatch.setattr(request_queue, "completion", fake_completion, raising=False)
+        monkeypatch.setattr(request_queue, "ModelResponse", FakeResponse, raising=False)
+        queue = LLMRequestQueue(delay_between_requests=0)
+
+        response = await queue._reliable_request({"model": "m"})
+
+        assert isinstance(response, FakeResponse)
+        assert threads[0].startswith("strix-llm")
+
+    async def test_retries_transient_errors(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that retryable failures are retried up to MAX_ATTEMPTS."""
+        calls = 0
+
+        async def flaky(completion_args: dict[str, Any]) -> str:
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise RuntimeError("server error")
+            return "ok"
+
+        monkeypatch.setattr(request_queue, "_litellm_available", True)
+        monkeypatch.setattr(request_queue, "should_retry_exception", lambda _e: True)
+        monkeypatch.setattr(request_queue, "_retry_delay", lambda _attempt: 0)
+        queue = LLMRequestQueue()
+        monkeypatch.setattr(queue, "_request_once", flaky)
+
+        assert await queue._reliable_request({"model": "m"}) == "ok"
+        assert calls == 3
+
+    async def test_gives_up_after_max_attempts(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the last failure is raised once attempts run out."""
+        calls = 0
+
+        async def failing(completion_args: dict[str, Any]) -> str:
+            nonlocal calls
+            calls += 1
+            raise ValueError(calls)
+
+        monkeypatch.setattr(request_queue, "_litellm_available", True)
+        monkeypatch.setattr(request_queue, "should_retry_exception", lambda _e: True)
+        monkeypatch.setattr(request_queue, "_retry_delay", lambda _attempt: 0)
+        queue = LLMRequestQueue()
+        monkeypatch.setattr(queue, "_request_once", failing)
+
+        with pytest.raises(ValueError, match=str(request_queue.MAX_ATTEMPTS)):
+            await queue._reliable_request({"model": "m"})
+
+    async def test_requires_litellm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that without LiteLLM the queue refuses requests instead of guessing."""
+        monkeypatch.setattr(request_queue, "_litellm_available", False)
+        queue = LLMRequestQueue(delay_between_requests=0)
+
+        with pytest.raises(RuntimeError, match="LiteLLM is not available"):
+            await queue.make_request({"model": "m", "messages": []})
+
+
+class TestShouldRetryException:
+    """Tests for should_retry_exception."""
+
+    def test_litellm_decision_is_cached_per_status(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that litellm is consulted once per status code, read from the response too."""
+        asked: list[int] = []
+
+        def should_retry(status_code: int) -> bool:
+            asked.append(status_code)
+            return status_code == 429
+
+        monkeypatch.setattr(request_queue, "_litellm_available", True)
+        monkeypatch.setattr(
+            request_queue, "litellm", SimpleNamespace(_should_retry=should_retry), raising=False
+        )
+        monkeypatch.setattr(request_queue, "_RETRY_BY_STATUS", {})
+
+        error = Exception()
+        error.response = SimpleNamespace(status_code=429)  # type: ignore[attr-defined]
+        assert request_queue.should_retry_exception(error) is True
+        assert request_queue.should_retry_exception(error) is True
+        assert asked == [429]
+        assert request_queue.should_retry_exception(RuntimeError()) is True
+
+    def test_direct_mode_retries_server_errors_only(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the status check used when LiteLLM is unavailable."""
+        monkeypatch.setattr(request_queue, "_litellm_available", False)
+        error = Exception()
+        error.status_code = 503  # type: ignore[attr-defined]
+        assert request_queue.should_retry_exception(error) is True
+        assert request_queue.should_retry_exception(RuntimeError()) is False
+
+
+class TestModelShards:
+    """Tests for per-model rate limit and concurrency budgets."""
+
+    def test_models_get_independent_shards(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that each model has its own limiter, with optional env overrides."""
+        monkeypatch.setenv("LLM_RATE_LIMIT_OPENAI_GPT_5_RPM", "7")
+        queue = LLMRequestQueue(max_requests_per_minute=50)
+
+        gpt = queue._get_shard("openai/gpt-5")
+        claude = queue._get_shard("anthropic/claude-opus-4")
+
+        assert queue._get_shard("openai/gpt-5") is gpt
+        assert gpt.rate_limiter.max_requests == 7
+        assert claude.rate_limiter.max_requests == 50
+        assert gpt.semaphore is not claude.semaphore
+        assert set(queue.get_stats()["models"]) == {"openai/gpt-5", "anthropic/claude-opus-4"}
+
+
+class TestProviderRateLimits:
+    """Tests for adapting the rate limiter to provider feedback."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("12", 12.0), ("6m0s", 360.0), ("1m30.5s", 90.5), ("20ms", 0.02), ("soon", None)],
+    )
+    def test_parse_reset_seconds(self, value: str, expected: float | None) -> None:
+        """Test the reset header formats."""
+        assert request_queue._parse_reset_seconds(value) == expected
+
+    def test_headers_cap_tokens_and_schedule_refill(self) -> None:
+        """Test that the reported remaining budget caps the local bucket."""
+
+        class Response:
+            _hidden_params: ClassVar[dict[str, Any]] = {
+                "additional_headers": {
+                    "llm_provider-x-ratelimit-remaining-requests": "2",
+                    "llm_provider-x-ratelimit-reset-requests": "30s",
+                }
+            }
+
+        limiter = RateLimiter(max_requests_per_minute=60)
+        limiter.update_from_provider(*request_queue._rate_limit_headers(Response()))
+
+        assert limiter.get_remaining_capacity() == 2
+        assert limiter.full_refill_at == pytest.approx(limiter.last_refill + 30, abs=1)
+
+    def test_rate_limited_drains_bucket(self) -> None:
+        """Test that a 429 stops bursting until tokens refill."""
+        limiter = RateLimiter(max_requests_per_minute=60)
+        limiter.on_rate_limited()
+        assert limiter.acquire() > 0
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_only_deterministic_requests_by_default(self, tmp_path: Path) -> None:
+        """Test that sampled requests get no key unless cache_all is set."""
+        args = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        assert ResponseCache(tmp_path).key(args) is None
+        assert ResponseCache(tmp_path).key({**args, "temperature": 0}) is not None
+        assert ResponseCache(tmp_path, cache_all=True).key(args) is not None
+
+    def test_round_trip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a stored response is read back and keys are order independent."""
+
+        class FakeModelResponse:
+            def __init__(self, **data: Any) -> None:
+                self.data = data
+
+            def model_dump_json(self) -> str:
+                return json.dumps(self.data)
+
+        monkeypatch.setattr(request_queue, "ModelResponse", FakeModelResponse, raising=False)
+        cache = ResponseCache(tmp_path, cache_all=True)
+        key = cache.key({"model": "m", "messages": []})
+        assert key == cache.key({"messages": [], "model": "m"})
+        assert key is not None
+        assert cache.get(key) is None
+
+        cache.put(key, FakeModelResponse(id="r1"))
+
+        cached = cache.get(key)
+        assert isinstance(cached, FakeModelResponse)
+        assert cached.data == {"id": "r1"}
+        assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_global_queue_is_created_once_across_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that concurrent first calls share a single queue."""
+    monkeypatch.setattr(request_queue, "_global_queue", None)
+    barrier = threading.Barrier(8)
+    queues: list[LLMRequestQueue] = []
+
+    def worker() -> None:
+        barrier.wait()
+        queues.append(request_queue.get_global_queue())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(1)
+
+    assert len(queues) == 8
+    assert all(queue is queues[0] for queue in queues)
+
+
+def test_env_defaults_override_builtin_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the limit environment variables replace the built-in defaults."""
+    monkeypatch.setenv("LLM_RATE_LIMIT_CONCURRENT", "5")
+    monkeypatch.setenv("LLM_RATE_LIMIT_DELAY", "")
+    monkeypatch.delenv("LLM_MAX_REQUESTS_PER_MINUTE", raising=False)
+    assert request_queue._load_env_defaults() == {
+        "max_concurrent": 5,
+        "delay": 0.1,
+        "max_rpm": 120,
+    }
+
+
+def test_single_request_queue_definition() -> None:
+    """Test that the module exports what it defines and defines the queue only once."""
+    source = Path(request_queue.__file__).read_text(encoding="utf-8")
+    assert source.count("class LLMRequestQueue") == 1
+    assert all(hasattr(request_queue, name) for name in request_queue.__all__)
@@ -0,0 +1,51 @@
+import pytest
+
+from strix.llm.utils import (
+    _extract_tool_block,
+    _truncate_to_first_function,
+    parse_tool_invocations,
+)
+
+
+def _legacy_extract(content: str) -> tuple[str, list | None]:
+    content = _truncate_to_first_function(content)
+    if "</function>" in content:
+        content = content[: content.rfind("</function>") + len("</function>")]
+    return content, parse_tool_invocations(content)
+
+
+def _call(name: str, **params: str) -> str:
+    body = "".join(f"<parameter={k}>{v}</parameter>\n" for k, v in params.items())
+    return f"<function={name}>\n{body}</function>"
+
+
+class TestExtractToolBlock:
+    """Tests for _extract_tool_block."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "",
+            "just text",
+            "thinking...\n" + _call("terminal_execute", command="ls &amp;&amp; id"),
+            _call("a", x="1") + "\n" + _call("b", y=" 2 ") + "\ntrailing text",
+            _call("think", thought="t") + "\n</function> stray",
+            "<function=think>\n<parameter=thought>unterminated",
+            "<function=think>\n<parameter=thought>x</parameter>\n</",
+            "<function=a>\n<function=b>\n",
+            "<function=>\n</function>" + _call("ok"),
+            "\n".join(_call(f"tool{i}", n=str(i)) for i in range(10)) + "\nextra",
+            "\n".join(_call(f"tool{i}") for i in range(5)) + "<function=x><function=y><function=z>",
+        ],
+    )
+    def test_matches_legacy_pipeline(self, content: str) -> None:
+        """Test that the single scan agrees with truncate + rfind + regex parse."""
+        assert _extract_tool_block(content) == _legacy_extract(content)
+
+    def test_limits_to_seven_calls(self) -> None:
+        """Test that content after the seventh call is dropped."""
+        content = "\n".join(_call(f"tool{i}") for i in range(9))
+        trimmed, invocations = _extract_tool_block(content)
+        assert invocations is not None
+        assert [inv["toolName"] for inv in invocations] == [f"tool{i}" for i in range(7)]
+        assert trimmed.endswith(_call("tool6"))
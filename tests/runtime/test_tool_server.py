@@ -0,0 +1,265 @@
+"""Tests for the sandbox tool server's HTTP endpoints."""
+
+import importlib
+import signal
+import sys
+import threading
+from collections.abc import Iterator
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+from strix.tools import registry
+
+
+if sys.version_info < (3, 12):  # noqa: UP036
+    # pydantic only accepts typing.TypedDict request bodies from Python 3.12 on,
+    # so the module cannot even be imported by an older interpreter
+    pytest.skip("the tool server requires Python 3.12", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+
+
+TOKEN = "test-token"  # noqa: S105
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+calls: list[str] = []
+
+
+def _echo(value: str) -> str:
+    calls.append(f"echo:{value}")
+    return value
+
+
+def _count() -> int:
+    calls.append("count")
+    return len(calls)
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+def _append(items: list[str]) -> list[str]:
+    items.append("x")
+    return items
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+async def _async_echo(value: str) -> str:
+    calls.append(f"async_echo:{value}")
+    return value
+
+
+TEST_TOOLS: dict[str, tuple[Any, bool]] = {
+    "_echo": (_echo, True),
+    "_count": (_count, False),
+    "_fail": (_fail, False),
+    "_append": (_append, False),
+    "_thread_name": (_thread_name, False),
+    "_async_echo": (_async_echo, True),
+}
+
+
+@pytest.fixture(scope="module")
+def tool_server() -> Iterator[ModuleType]:
+    """Import the tool server as it is started in the sandbox."""
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGINT)}
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("STRIX_SANDBOX_MODE", "true")
+        mp.setattr(sys, "argv", ["tool_server", "--token", TOKEN, "--port", "0"])
+        module = importlib.import_module("strix.runtime.tool_server")
+        for func, idempotent in TEST_TOOLS.values():
+            registry.register_tool(func, idempotent=idempotent)
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
+    yield module
+    registry.tools[:] = [tool for tool in registry.tools if tool["name"] not in TEST_TOOLS]
+    for name in TEST_TOOLS:
+        registry._tools_by_name.pop(name, None)
+        module._tool_entries.pop(name, None)
+
+
+@pytest.fixture
+def app(tool_server: ModuleType, monkeypatch: pytest.MonkeyPatch) -> Any:
+    async def no_network_check() -> None:
+        pass
+
+    monkeypatch.setattr(tool_server, "_refresh_network_status", no_network_check)
+    calls.clear()
+    return tool_server.app
+
+
+@pytest.fixture
+def client(app: Any) -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _execute(client: TestClient, tool_name: str, **kwargs: Any) -> Any:
+    body = {"agent_id": "agent-1", "tool_name": tool_name, "kwargs": kwargs}
+    return client.post("/execute", json=body, headers=AUTH).json()
+
+
+def _execute_batch(client: TestClient, *tools: tuple[str, dict[str, Any]]) -> Any:
+    body = {
+        "agent_id": "agent-1",
+        "tools": [{"tool_name": name, "kwargs": kwargs} for name, kwargs in tools],
+    }
+    return client.post("/execute_batch", json=body, headers=AUTH).json()
+
+
+class TestExecute:
+    """Tests for the /execute endpoint."""
+
+    def test_sync_tool_result(self, client: TestClient) -> None:
+        """Test that a sync tool's return value comes back as the result."""
+        assert _execute(client, "_echo", value="hi") == {"result": "hi"}
+
+    def test_async_tool_result(self, client: TestClient) -> None:
+        """Test that a coroutine tool is awaited."""
+        assert _execute(client, "_async_echo", value="hi") == {"result": "hi"}
+
+    def test_unknown_tool(self, client: TestClient) -> None:
+        """Test that an unregistered tool is reported as an error."""
+        assert _execute(client, "_missing") == {"error": "Tool '_missing' not found"}
+
+    def test_tool_exception(self, client: TestClient) -> None:
+        """Test that a raising tool is reported as an error instead of a 500."""
+        assert _execute(client, "_fail") == {"error": "Tool execution error: ValueError: boom"}
+
+
+class TestExecuteBatch:
+    """Tests for the /execute_batch endpoint."""
+
+    def test_results_keep_request_order(self, client: TestClient) -> None:
+        """Test that results line up with the requested tools, errors included."""
+        results = _execute_batch(
+            client,
+            ("_echo", {"value": "a"}),
+            ("_fail", {}),
+            ("_async_echo", {"value": "b"}),
+            ("_missing", {}),
+        )["results"]
+
+        assert results == [
+            {"result": "a"},
+            {"error": "Tool execution error: ValueError: boom"},
+            {"result": "b"},
+            {"error": "Tool '_missing' not found"},
+        ]
+
+    def test_identical_idempotent_calls_run_once(self, client: TestClient) -> None:
+        """Test that repeated calls to an idempotent tool share one execution."""
+        results = _execute_batch(
+            client,
+            ("_echo", {"value": "a"}),
+            ("_echo", {"value": "b"}),
+            ("_echo", {"value": "a"}),
+        )["results"]
+
+        assert results == [{"result": "a"}, {"result": "b"}, {"result": "a"}]
+        assert sorted(calls) == ["echo:a", "echo:b"]
+
+    def test_other_calls_are_not_deduplicated(self, client: TestClient) -> None:
+        """Test that every call to a non-idempotent tool runs."""
+        results = _execute_batch(client, ("_count", {}), ("_count", {}))["results"]
+
+        assert sorted(result["result"] for result in results) == [1, 2]
+
+    def test_converted_arguments_are_not_shared(self, client: TestClient) -> None:
+        """Test that calls converting the same arguments get their own lists."""
+        results = _execute_batch(
+            client, ("_append", {"items": '["a"]'}), ("_append", {"items": '["a"]'})
+        )["results"]
+
+        assert results == [{"result": ["a", "x"]}, {"result": ["a", "x"]}]
+
+    def test_empty_batch(self, client: TestClient) -> None:
+        """Test that an empty batch returns no results."""
+        assert _execute_batch(client) == {"results": []}
+
+
+class TestAuthentication:
+    """Tests for the Bearer token check."""
+
+    @pytest.mark.parametrize(
+        "headers",
+        [{}, {"Authorization": TOKEN}, {"Authorization": "Bearer wrong-token"}],
+    )
+    def test_rejects_missing_or_wrong_token(
+        self, client: TestClient, headers: dict[str, str]
+    ) -> None:
+        """Test that requests without the expected Bearer token get a 401."""
+        body = {"agent_id": "agent-1", "tool_name": "_echo", "kwargs": {"value": "a"}}
+        response = client.post("/execute", json=body, headers=headers)
+
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert calls == []
+
+
+class TestBodyValidation:
+    """Tests for request body validation errors."""
+
+    def test_missing_field(self, client: TestClient) -> None:
+        """Test that a missing field is a 422 located in the body, like FastAPI's own."""
+        response = client.post("/execute", json={"agent_id": "agent-1"}, headers=AUTH)
+
+        assert response.status_code == 422
+        locations = [error["loc"] for error in response.json()["detail"]]
+        assert locations == [["body", "tool_name"], ["body", "kwargs"]]
+
+    def test_invalid_json(self, client: TestClient) -> None:
+        """Test that a malformed body is a 422 rather than a server error."""
+        response = client.post("/execute_batch", content=b"{", headers=AUTH)
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+class TestMicroBatching:
+    """Tests for grouping concurrent calls to a sync tool (STRIX_MICRO_BATCH_MS)."""
+
+    def test_calls_in_one_window_share_a_pool_job(
+        self, tool_server: ModuleType, app: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that concurrent calls to a sync tool run in one pool thread."""
+        monkeypatch.setattr(tool_server, "MICRO_BATCH_MS", 50)
+        with TestClient(app) as client:
+            results = _execute_batch(client, *[("_thread_name", {})] * 3)["results"]
+            single = _execute(client, "_echo", value="a")
+
+        assert len({result["result"] for result in results}) == 1
+        assert single == {"result": "a"}
+
+    @pytest.mark.usefixtures("client")
+    def test_disabled_by_default(self, app: Any) -> None:
+        """Test that without a window every call is its own pool job."""
+        assert app.state.micro_batcher is None
+
+
+class TestSmallBatches:
+    """Tests for running small batches as one job (STRIX_BATCH_PARALLEL_THRESHOLD)."""
+
+    def test_batch_within_threshold_runs_in_one_job(
+        self, tool_server: ModuleType, app: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a batch of few sync calls runs in one pool thread."""
+        monkeypatch.setattr(tool_server, "BATCH_PARALLEL_THRESHOLD", 3)
+        with TestClient(app) as client:
+            results = _execute_batch(
+                client,
+                ("_thread_name", {}),
+                ("_async_echo", {"value": "a"}),
+                ("_thread_name", {}),
+                ("_count", {}),
+            )["results"]
+
+        assert results[0] == results[2]
+        assert results[1] == {"result": "a"}
+        assert sorted(calls) == ["async_echo:a", "count"]
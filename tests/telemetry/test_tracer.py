@@ -0,0 +1,15 @@
+from strix.telemetry.tracer import Tracer
+
+
+def test_get_agent_tools_returns_agent_executions_in_order() -> None:
+    """Test the per-agent index, including tools logged before the agent."""
+    tracer = Tracer("test-run")
+    first = tracer.log_tool_execution_start("agent_a", "terminal_execute", {"command": "id"})
+    tracer.log_agent_creation("agent_a", "Recon", "task")
+    tracer.log_tool_execution_start("agent_b", "browser_action", {})
+    second = tracer.log_tool_execution_start("agent_a", "think", {"thought": "x"})
+
+    tools = tracer.get_agent_tools("agent_a")
+    assert [t["execution_id"] for t in tools] == [first, second]
+    assert tools[0] is tracer.tool_executions[first]
+    assert tracer.get_agent_tools("missing") == []
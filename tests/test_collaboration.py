@@ -10,33 +10,40 @@ Tests cover:
 - Broadcast messaging
 """
 
-import pytest
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
-from datetime import datetime, UTC
+
+import pytest
+
+from strix.agents.state import AgentState
 
 # Import the module under test
 from strix.tools.collaboration.collaboration_actions import (
-    claim_target,
-    release_claim,
-    list_claims,
-    share_finding,
-    list_findings,
-    get_finding_details,
-    add_to_work_queue,
-    get_next_work_item,
-    request_help,
-    get_collaboration_status,
-    broadcast_message,
+    MAX_MESSAGES,
+    _agent_info_cache,
     _claims,
-    _findings,
-    _work_queue,
-    _help_requests,
-    _messages,
+    _claims_by_target,
     _collaboration_stats,
-    _generate_id,
-    _get_agent_info,
+    _findings,
+    _findings_by_severity,
     _generate_chain_tips,
     _generate_help_tips,
+    _generate_id,
+    _get_agent_info,
+    _help_requests,
+    _messages,
+    _work_queue,
+    add_to_work_queue,
+    broadcast_message,
+    claim_target,
+    get_collaboration_status,
+    get_finding_details,
+    get_next_work_item,
+    list_claims,
+    list_findings,
+    release_claim,
+    request_help,
+    share_finding,
 )
 
 
@@ -63,7 +70,9 @@ def mock_agent_state_2():
 def clear_state():
     """Clear all collaboration state before each test."""
     _claims.clear()
+    _claims_by_target.clear()
     _findings.clear()
+    _findings_by_severity.clear()
     _work_queue.clear()
     _help_requests.clear()
     _messages.clear()
@@ -103,6 +112,18 @@ class TestHelperFunctions:
         assert info["agent_id"] == "test_agent_001"
         assert info["agent_name"] == "Test Agent"
     
+    def test_get_agent_info_is_cached_per_state(self):
+        """Test that agent info is reused for a live state and dropped with it."""
+        state = AgentState(agent_name="Cached Agent")
+        info = _get_agent_info(state)
+
+        assert _get_agent_info(state) is info
+        assert info == {"agent_id": state.agent_id, "agent_name": "Cached Agent"}
+
+        key = id(state)
+        del state
+        assert key not in _agent_info_cache
+
     def test_generate_chain_tips_ssrf(self):
         """Test chain tips for SSRF vulnerabilities."""
         tips = _generate_chain_tips("ssrf", None)
@@ -259,6 +280,16 @@ class TestReleaseClaim:
         
         assert result["success"] is False
 
+    def test_released_target_can_be_claimed_again(self, mock_agent_state, mock_agent_state_2):
+        """Test that the claim index follows releases."""
+        claim = claim_target(mock_agent_state, "/login", "sqli")
+        release_claim(mock_agent_state, claim_id=claim["claim_id"])
+
+        result = claim_target(mock_agent_state_2, "/login", "sqli")
+
+        assert result["success"] is True
+        assert _claims_by_target["/login:sqli"]["agent_id"] == "test_agent_002"
+
 
 class TestListClaims:
     """Tests for listing claims."""
@@ -409,6 +440,18 @@ class TestListFindings:
         assert result["filtered_count"] == 1
         assert all(f["chainable"] for f in result["findings"])
 
+    def test_severity_index_matches_statistics(self, mock_agent_state):
+        """Test that severity counts come from the severity index."""
+        share_finding(mock_agent_state, "A", "sqli", "/a", "D", severity="high")
+        share_finding(mock_agent_state, "B", "xss", "/b", "D", severity="high")
+        share_finding(mock_agent_state, "C", "idor", "/c", "D", severity="low")
+
+        result = list_findings(mock_agent_state, severity="high")
+
+        assert [f["title"] for f in result["findings"]] == ["A", "B"]
+        assert result["statistics"]["by_severity"] == {"high": 2, "low": 1}
+        assert len(_findings_by_severity["high"]) == 2
+
 
 class TestGetFindingDetails:
     """Tests for getting finding details."""
@@ -550,6 +593,14 @@ class TestHelpRequest:
         assert len(_messages) > 0
         assert _messages[-1]["type"] == "help_request"
 
+    def test_messages_are_bounded(self, mock_agent_state):
+        """Test that the oldest broadcasts are dropped once the buffer is full."""
+        for i in range(MAX_MESSAGES + 5):
+            broadcast_message(mock_agent_state, f"m{i}")
+
+        assert len(_messages) == MAX_MESSAGES
+        assert _messages[0]["content"] == "m5"
+
 
 class TestCollaborationStatus:
     """Tests for collaboration status dashboard."""
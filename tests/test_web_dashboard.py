@@ -0,0 +1,320 @@
+"""Tests for the web dashboard server state and SSE stream."""
+
+import copy
+import gzip
+import http.client
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from strix.dashboard import web_server
+from strix.dashboard.web_integration import WebDashboardIntegration
+from strix.dashboard.web_server import (
+    MAX_LIVE_FEED_ENTRIES,
+    WebDashboardServer,
+    _accepts_gzip,
+    _dumps,
+    _get_fallback_html,
+    _get_gzipped_state,
+    _get_sse_update_frame,
+    _get_static_gzip,
+    _now_iso,
+    add_live_feed_entry,
+    add_tool_execution,
+    get_dashboard_state,
+    get_encoded_dashboard_state,
+    update_dashboard_state,
+)
+
+
+@pytest.fixture(autouse=True)
+def _restore_state() -> Iterator[None]:
+    saved = copy.deepcopy(web_server._web_dashboard_state)
+    yield
+    with web_server._update_lock:
+        web_server._web_dashboard_state.clear()
+        web_server._web_dashboard_state.update(saved)
+        web_server._mark_updated()
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[WebDashboardServer]:
+    # Short keepalives let the stream notice a closed client quickly
+    monkeypatch.setattr(web_server, "SSE_KEEPALIVE_SECONDS", 0.05)
+    dashboard_server = WebDashboardServer(host="127.0.0.1", port=0)
+    dashboard_server.start()
+    yield dashboard_server
+    dashboard_server.stop()
+
+
+def _read_event(response: http.client.HTTPResponse) -> tuple[str, dict]:
+    """Read SSE lines until a full event, skipping keepalive comments."""
+    event = ""
+    while True:
+        line = response.readline().decode().rstrip("\n")
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: ") :])
+            response.readline()
+            return event, data
+
+
+def test_add_tool_execution_bumps_state_version() -> None:
+    """Test that nested state updates re-enter the lock and count as a change."""
+    version = web_server._encodings.version
+    add_tool_execution({"tool_name": "terminal_execute", "args": {"command": "id"}})
+    assert web_server._encodings.version > version
+    assert get_dashboard_state()["live_feed"][-1]["tool_name"] == "terminal_execute"
+
+
+def test_sse_stream_pushes_updates(server: WebDashboardServer) -> None:
+    """Test that an update is pushed without waiting for a poll interval."""
+    assert server.server is not None
+    conn = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+    conn.request("GET", "/api/stream")
+    response = conn.getresponse()
+
+    event, _ = _read_event(response)
+    assert event == "state"
+
+    threading.Timer(0.05, update_dashboard_state, [{"scan_config": {"target": "x"}}]).start()
+    event, data = _read_event(response)
+    assert event == "update"
+    assert data["scan_config"] == {"target": "x"}
+    conn.close()
+
+
+def test_requests_are_served_while_a_stream_is_open(server: WebDashboardServer) -> None:
+    """Test that an open SSE stream does not block other clients."""
+    assert server.server is not None
+    address = server.server.server_address[:2]
+    stream = http.client.HTTPConnection(*address, timeout=5)
+    stream.request("GET", "/api/stream")
+    _read_event(stream.getresponse())
+
+    conn = http.client.HTTPConnection(*address, timeout=5)
+    conn.request("GET", "/health")
+    assert json.loads(conn.getresponse().read())["status"] == "healthy"
+    conn.close()
+    stream.close()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_matches_stdlib_json(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    """Test both encoders produce the same data, stringifying unknown types."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(web_server, "_orjson", None)
+    payload = {"a": [1, 2.5, None, "é"], "b": {"c": True}, 3: "int key", "obj": object}
+    assert json.loads(_dumps(payload)) == json.loads(json.dumps(payload, default=str))
+    assert json.loads(_dumps(payload, indent=True)) == json.loads(_dumps(payload))
+
+
+def test_now_iso_is_formatted_once_per_millisecond(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that calls within one millisecond share a string and later ones do not."""
+    now_ns = 1_700_000_000_123_456_789
+    monkeypatch.setattr(web_server.time, "time_ns", lambda: now_ns)
+    first = _now_iso()
+    assert first == "2023-11-14T22:13:20.123000+00:00"
+    assert _now_iso() is first
+    now_ns += 1_000_000
+    assert datetime.fromisoformat(_now_iso()) > datetime.fromisoformat(first)
+
+
+def test_connection_is_reused_across_requests(server: WebDashboardServer) -> None:
+    """Test that plain responses carry a length and keep the connection open."""
+    assert server.server is not None
+    conn = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+    for path in ("/health", "/api/state", "/api/live-feed", "/api/missing"):
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read()
+        assert int(response.headers["Content-Length"]) == len(body)
+        assert not response.will_close
+    conn.close()
+
+
+def test_live_feed_is_bounded_and_returned_as_a_list() -> None:
+    """Test that old feed entries are dropped and snapshots are plain lists."""
+    for i in range(MAX_LIVE_FEED_ENTRIES + 10):
+        add_live_feed_entry({"type": "system", "message": str(i)})
+    feed = get_dashboard_state()["live_feed"]
+    assert isinstance(feed, list)
+    assert len(feed) == MAX_LIVE_FEED_ENTRIES
+    assert feed[-1]["message"] == str(MAX_LIVE_FEED_ENTRIES + 9)
+
+
+def test_snapshots_are_not_changed_by_later_updates() -> None:
+    """Test that updates replace nested containers instead of mutating them."""
+    vulnerabilities = [{"id": "v1"}]
+    update_dashboard_state(
+        {"agents": {"a": {"status": "running"}}, "vulnerabilities": vulnerabilities}
+    )
+    snapshot = get_dashboard_state()
+
+    update_dashboard_state({"agents": {"b": {"status": "running"}}})
+    vulnerabilities.append({"id": "v2"})
+
+    assert list(snapshot["agents"]) == ["a"]
+    assert list(get_dashboard_state()["agents"]) == ["a", "b"]
+    assert get_dashboard_state()["vulnerabilities"] == [{"id": "v1"}]
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, GZIP;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("deflate", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(header: str, expected: bool) -> None:
+    """Test Accept-Encoding parsing."""
+    assert _accepts_gzip(header) is expected
+
+
+def test_large_json_is_gzipped_when_accepted(server: WebDashboardServer) -> None:
+    """Test that the state is compressed only for clients that accept gzip."""
+    update_dashboard_state({"scan_config": {"notes": "x" * 4096}})
+    assert server.server is not None
+    conn = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+
+    conn.request("GET", "/api/state", headers={"Accept-Encoding": "gzip"})
+    response = conn.getresponse()
+    body = response.read()
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body))["scan_config"]["notes"] == "x" * 4096
+
+    conn.request("GET", "/api/state")
+    response = conn.getresponse()
+    assert response.headers["Content-Encoding"] is None
+    assert json.loads(response.read())["scan_config"]["notes"] == "x" * 4096
+    conn.close()
+
+
+def test_encoded_state_is_shared_until_the_state_changes() -> None:
+    """Test that one encoding serves every reader of a state version."""
+    version, body = get_encoded_dashboard_state()
+    assert get_encoded_dashboard_state()[1] is body
+    assert json.loads(body) == json.loads(_dumps(get_dashboard_state()))
+
+    update_dashboard_state({"scan_config": {"target": "y"}})
+    new_version, new_body = get_encoded_dashboard_state()
+    assert new_version > version
+    assert json.loads(new_body)["scan_config"]["target"] == "y"
+
+
+def test_stalled_sse_client_is_dropped(
+    server: WebDashboardServer,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a client that stops reading does not hold its stream forever."""
+    monkeypatch.setattr(web_server, "SSE_WRITE_TIMEOUT_SECONDS", 0.2)
+    update_dashboard_state({"scan_config": {"blob": "x" * 8_000_000}})
+    assert server.server is not None
+
+    caplog.set_level(logging.DEBUG, logger=web_server.__name__)
+    client = socket.socket()
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    client.connect(server.server.server_address[:2])
+    client.sendall(b"GET /api/stream HTTP/1.1\r\nHost: x\r\n\r\n")
+
+    deadline = time.monotonic() + 5
+    while "stopped reading" not in caplog.text and time.monotonic() < deadline:
+        time.sleep(0.05)
+    client.close()
+    assert "Dropped SSE client that stopped reading" in caplog.text
+
+
+def test_sse_update_frame_is_built_once_per_version() -> None:
+    """Test that streams share one prebuilt frame for each state version."""
+    version, frame = _get_sse_update_frame()
+    assert _get_sse_update_frame()[1] is frame
+    assert frame == b"event: update\ndata: " + get_encoded_dashboard_state()[1] + b"\n\n"
+    update_dashboard_state({"scan_config": {"target": "z"}})
+    assert _get_sse_update_frame()[0] > version
+
+
+def test_vulnerability_callback_is_published_by_the_sync_thread() -> None:
+    """Test that tracer callbacks only queue entries and wake the sync loop."""
+    integration = WebDashboardIntegration()
+    integration._on_vulnerability_found("v1", "SQLi", "details", "high")
+    assert integration._wake.is_set()
+    assert all(e.get("vuln_id") != "v1" for e in get_dashboard_state()["live_feed"])
+
+    integration._drain_pending_feed()
+    assert get_dashboard_state()["live_feed"][-1]["vuln_id"] == "v1"
+
+
+def test_static_gzip_prefers_a_fresh_sibling(tmp_path: Path) -> None:
+    """Test that build-time .gz files are used unless the asset is newer."""
+    asset = tmp_path / "app.js"
+    asset.write_bytes(b"x" * 4096)
+    sibling = tmp_path / "app.js.gz"
+    sibling.write_bytes(gzip.compress(b"x" * 4096))
+    os.utime(asset, ns=(1, 1))
+    assert _get_static_gzip(asset, asset.read_bytes()) == sibling.read_bytes()
+
+    asset.write_bytes(b"y" * 4096)
+    os.utime(sibling, ns=(1, 1))
+    assert gzip.decompress(_get_static_gzip(asset, asset.read_bytes())) == b"y" * 4096
+
+
+def test_fallback_page_is_served_gzipped(server: WebDashboardServer) -> None:
+    """Test that the built-in page is sent precompressed to gzip clients."""
+    if (Path(web_server.__file__).parent / "frontend" / "out").exists():
+        pytest.skip("a frontend build is present")
+    assert server.server is not None
+    conn = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+    conn.request("GET", "/", headers={"Accept-Encoding": "gzip"})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == _get_fallback_html()[0]
+
+
+def test_state_is_revalidated_with_etags(server: WebDashboardServer) -> None:
+    """Test that an unchanged state answers 304 and a changed one a new body."""
+    assert server.server is not None
+    conn = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+    conn.request("GET", "/api/state")
+    response = conn.getresponse()
+    response.read()
+    etag = response.headers["ETag"]
+
+    conn.request("GET", "/api/state", headers={"If-None-Match": etag})
+    response = conn.getresponse()
+    assert response.status == 304
+    assert response.read() == b""
+
+    update_dashboard_state({"scan_config": {"target": "etag"}})
+    conn.request("GET", "/api/state", headers={"If-None-Match": etag})
+    response = conn.getresponse()
+    assert response.status == 200
+    assert response.headers["ETag"] != etag
+    assert json.loads(response.read())["scan_config"]["target"] == "etag"
+    conn.close()
+
+
+def test_gzipped_state_is_compressed_once_per_version() -> None:
+    """Test that gzip clients share one compressed body per state version."""
+    version, body = get_encoded_dashboard_state()
+    compressed = _get_gzipped_state(version, body)
+    assert _get_gzipped_state(version, body) is compressed
+    assert gzip.decompress(compressed) == body
@@ -0,0 +1,54 @@
+"""Tests for sub-agent thread supervision in the agents graph."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from strix.agents.state import AgentState
+from strix.tools.agents_graph import agents_graph_actions as graph
+
+
+@pytest.fixture(autouse=True)
+def _clean_graph() -> Iterator[None]:
+    yield
+    graph._agent_graph["nodes"].clear()
+    graph._running_agents.clear()
+    graph._agent_instances.clear()
+    graph._agent_states.clear()
+
+
+class _FailingAgent:
+    async def agent_loop(self, _task: str) -> dict[str, Any]:
+        raise RuntimeError("boom")
+
+
+def test_failed_agent_is_recorded_and_reaped() -> None:
+    """Test that a crashing agent is marked failed and dropped from the registries."""
+    state = AgentState(task="t")
+    graph._agent_graph["nodes"][state.agent_id] = {"name": "A", "status": "running"}
+    graph._running_agents[state.agent_id] = SimpleNamespace()
+    graph._agent_instances[state.agent_id] = object()
+
+    with ThreadPoolExecutor(1) as pool:
+        result = pool.submit(graph._run_agent_in_thread, _FailingAgent(), state, []).result()
+
+    assert result == {"error": "boom"}
+    assert graph._agent_graph["nodes"][state.agent_id]["status"] == "error"
+    assert state.agent_id not in graph._running_agents
+    assert state.agent_id not in graph._agent_instances
+
+
+def test_stop_all_agents_requests_a_stop_for_each_running_agent() -> None:
+    """Test that shutdown asks every running agent to stop."""
+    states = [AgentState(task="t") for _ in range(2)]
+    for state in states:
+        graph._agent_graph["nodes"][state.agent_id] = {"name": "A", "status": "running"}
+        graph._agent_states[state.agent_id] = state
+        graph._running_agents[state.agent_id] = SimpleNamespace()
+
+    assert graph.stop_all_agents() == [s.agent_id for s in states]
+    assert all(s.stop_requested for s in states)
+    assert all(n["status"] == "stopping" for n in graph._agent_graph["nodes"].values())
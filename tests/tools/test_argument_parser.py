@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from typing import Any, Literal
 
 import pytest
 
@@ -8,6 +9,8 @@ from strix.tools.argument_parser import (
     _convert_to_bool,
     _convert_to_dict,
     _convert_to_list,
+    _string_converter,
+    build_argument_converter,
     convert_arguments,
     convert_string_to_type,
 )
@@ -255,6 +258,61 @@ class TestConvertArguments:
         assert exc_info.value.param_name == "count"
 
 
+class TestBuildArgumentConverter:
+    """Tests for the build_argument_converter function."""
+
+    def test_matches_convert_arguments(
+        self, sample_function_with_types: Callable[..., None]
+    ) -> None:
+        """Test that a prebuilt converter gives the same result on every call."""
+        convert = build_argument_converter(sample_function_with_types)
+        kwargs = {"count": "3", "enabled": "yes", "items": "a, b", "extra": "x", "name": None}
+        assert convert(kwargs) == convert_arguments(sample_function_with_types, kwargs)
+        assert convert({"ratio": "0.5"}) == {"ratio": 0.5}
+
+    @pytest.mark.parametrize(
+        "param_type",
+        [
+            int,
+            float,
+            bool,
+            str,
+            list,
+            dict,
+            list[int],
+            dict[str, Any],
+            dict[str, None],
+            str | None,
+            int | None,
+            Literal["a", "b"],
+            "int",
+            Any,
+        ],
+    )
+    @pytest.mark.parametrize("value", ["1", "0.5", "yes", "a, b", '{"k": 1}', "[1]", "x"])
+    def test_specialized_conversion_matches_generic(self, param_type: Any, value: str) -> None:
+        """Test that the converter picked per type behaves like convert_string_to_type."""
+
+        def outcome(convert: Callable[[], Any]) -> Any:
+            try:
+                return convert()
+            except (ValueError, TypeError) as e:
+                return type(e)
+
+        assert outcome(lambda: _string_converter(param_type)(value)) == outcome(
+            lambda: convert_string_to_type(value, param_type)
+        )
+
+    def test_raises_error_on_conversion_failure(
+        self, sample_function_with_types: Callable[..., None]
+    ) -> None:
+        """Test that conversion failures name the parameter."""
+        convert = build_argument_converter(sample_function_with_types)
+        with pytest.raises(ArgumentConversionError) as exc_info:
+            convert({"count": "many"})
+        assert exc_info.value.param_name == "count"
+
+
 class TestArgumentConversionError:
     """Tests for the ArgumentConversionError exception class."""
 
@@ -0,0 +1,37 @@
+"""Tests for the tool executor's sandbox HTTP client."""
+
+import asyncio
+
+import httpx
+
+from strix.tools.executor import _get_sandbox_client, _sandbox_clients, aclose_sandbox_client
+
+
+async def test_sandbox_client_is_reused_within_a_loop() -> None:
+    """Test that tool calls on one loop share a pooled client."""
+    client = _get_sandbox_client()
+    assert _get_sandbox_client() is client
+    assert not client.is_closed
+    await aclose_sandbox_client()
+
+
+def test_sandbox_clients_are_per_loop() -> None:
+    """Test that a client is never shared across event loops."""
+
+    async def get_client() -> httpx.AsyncClient:
+        client = _get_sandbox_client()
+        await aclose_sandbox_client()
+        return client
+
+    assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+
+async def test_aclose_sandbox_client_forgets_the_loop() -> None:
+    """Test that closing the loop's client releases it and the loop."""
+    client = _get_sandbox_client()
+
+    await aclose_sandbox_client()
+
+    assert client.is_closed
+    assert asyncio.get_running_loop() not in _sandbox_clients
+    await aclose_sandbox_client()